@@ -162,12 +162,1246 @@ ________________________________________________________________________________
 
 # Import UserActionsBase to extend it.
 from ClyphX_Pro.clyphx_pro.UserActionsBase import UserActionsBase
+import array
+import bisect
+import cmath
+import collections
+import functools
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import zlib
+try:
+    import mmap
+except ImportError: # not every Live build ships it, reading falls back to plain file reads
+    mmap = None
+try:
+    import queue
+except ImportError: # python 2
+    import Queue as queue
+try:
+    from importlib import reload as reload_module
+except ImportError: # python 2
+    reload_module = reload
+try:
+    import numpy
+except ImportError: # Live's python has no numpy, the pure python FFT below is used instead
+    numpy = None
+
+
+# ---------- SLICING PROFILE : everything set_simpler_slice applies to a new Simpler track --------------
+SLICE_PROFILE = {
+    'input_channel': 'Ch. 3', # TO CHANGE IF NEEDED
+    'playback_mode': 2, # 0 classic, 1 one shot, 2 slice (= SIMP PLAYMODE 3)
+    'warping': True,
+    'slicing_style': 1, # slice by beat
+    'slicing_beat_division': 4,
+    'gain': 0.6, # => 8 db ?
+    'parameters': {'Fade In': 40},
+    'clyphx': 'DEV(1) SIMP GATE OFF', # gate is not exposed by the LOM, so it stays a ClyphX action
+}
+SIMPLER_REQUEST_TIMEOUT = 10.0 # seconds a TOSIMP request waits for its Simpler track, then it is dropped
+
+
+# ---------- TINYPAD LAYOUTS : X-Clip names of each controller page, as (track role, slot, action list) --------------
+TINYPAD_TRACKS = {'transport': "TinyTransports", 'notes': "TinyNotes"} # role -> part of the track name. Carefull of not changing name of tracks
+TINYPAD_LAYOUTS = (
+    ( # page 0
+        ('transport', 0, "[] 1/CLIP(1) DEL"),
+        ('transport', 1, '[] "Beats"/SEL'),
+        ('transport', 2, "[] navigate_clips"),
+        ('transport', 3, '[] (PSEQ) "Voix"/ARM ON ; "Voix"/ARM OFF'),
+        ('transport', 4, '[] "piano"/SEL ; "piano"/plugin_preset_change'),
+        ('transport', 5, "[] switch_armed_instru"),
+        ('notes', 0, "[] inc_bpm_from_loop_arg 1"),
+        ('notes', 1, "[] dec_bpm_from_loop_arg 1"),
+        ('notes', 2, "[] inc_bpm_from_loop_arg 2"),
+        ('notes', 3, "[] dec_bpm_from_loop_arg 2"),
+        ('notes', 4, "[] inc_binklooper_beats"),
+        ('notes', 5, "[] dec_binklooper_beats"),
+        ('notes', 6, '[] "piano"/PLAY 7'),
+        ('notes', 7, "[] autoset_binklooper_beats"),
+        ('notes', 8, "[] SEL/send_beat_to_main_scene"),
+        ('notes', 9, "[] (PSEQ) bind_instru ; bind_global ; bind_specific"),
+        ('notes', 10, "[routing0] initial_routing"),
+        ('notes', 11, "[routing1] loopers_to_rec"),
+    ),
+    ( # page 1 : notes slots 8 to 11 keep their page 0 actions
+        ('transport', 0, '[] "INSTRU"/DEV("Looper") "State" "Overdub"'),
+        ('transport', 1, '[] "INSTRU"/DEV("Looper") "Speed" < 21'),
+        ('transport', 2, '[] "INSTRU"/DEV("Looper") "Speed" > 21'),
+        ('transport', 3, '[] "INSTRU"/DEV("Looper") "State" "Record"'),
+        ('transport', 4, '[] "INSTRU"/DEV("Looper") "State" "Stop"'),
+        ('transport', 5, '[] "INSTRU"/DEV("Looper") "State" "Play"'),
+        ('notes', 0, "[] 2/play_or_stop"),
+        ('notes', 1, "[] 2/stop_loop; 2/CLIP(1) DEL"),
+        ('notes', 2, "[] 3/play_or_stop"),
+        ('notes', 3, "[] 3/stop_loop; 3/CLIP(1) DEL"),
+        ('notes', 4, "[] 4/play_or_stop"),
+        ('notes', 5, "[] 4/stop_loop; 4/CLIP(1) DEL"),
+        ('notes', 6, "[] 5/play_or_stop"),
+        ('notes', 7, "[] 5/stop_loop; 5/CLIP(1) DEL"),
+    ),
+)
+
+
+def compile_layouts(layouts):
+    """ page -> ((role, ((slot, name), ...)), ...) so that switching a page has nothing left to build """
+    compiled = []
+    for layout in layouts:
+        by_role = collections.OrderedDict()
+        for role, slot, name in layout:
+            by_role.setdefault(role, []).append((slot, name))
+        compiled.append(tuple((role, tuple(slots)) for role, slots in by_role.items()))
+    return tuple(compiled)
+
+
+TINYPAD_PAGES = compile_layouts(TINYPAD_LAYOUTS)
+
+
+def tinypad_page(word):
+    """ a page number of TINYPAD_PAGES, or next / prev. raises ValueError """
+    if word.lower() in ('next', 'prev'):
+        return word.lower()
+    page = int(word)
+    if not 0 <= page < len(TINYPAD_PAGES):
+        raise ValueError(word)
+    return page
+tinypad_page.usage = 'next|prev|0..%s' % (len(TINYPAD_PAGES) - 1)
+
+
+# ---------- CMDLOOP X-CLIP TEMPLATES : names parsed once, each variant rendered from the parsed form --------------
+PLAY_FREE = "/PLAY"
+PLAY_QTZ = "/PLAYQ 1 BAR"
+REC_BODIES = {'Sync': '/PLAY 2', 'Free': '/DEV("Looper") "State" 1'} # action of the [Rec] clip of a CmdLoop track, per rec mode
+
+
+class CommandTemplate(object):
+    """ a CmdLoop X-Clip name split into its label, target and action list, with two variant slots:
+    quantized or not (label + QTZ and PLAYQ 1 BAR instead of PLAY) and, for the [Rec] clip, Sync or Free rec.
+    OVD clips have no variant and always render as they were parsed """
+
+    def __init__(self, name, rec_slot=False):
+        self.fixed = "OVD" in name or ']' not in name
+        self.original = name
+        label, _, body = name.partition(']')
+        self.quantized = label.endswith("QTZ")
+        self.label = label[:-3] if self.quantized else label
+        self.target, _, body = body.partition('/')
+        self.body = '/' + body.replace(PLAY_QTZ, PLAY_FREE)
+        self.rec_mode = None
+        if rec_slot:
+            self.rec_mode = 'Sync' if self.body.startswith(PLAY_FREE) else 'Free'
+
+    def render(self, quantized, rec_mode=None):
+        if self.fixed:
+            return self.original
+        body = REC_BODIES[rec_mode or self.rec_mode] if self.rec_mode else self.body
+        if quantized and PLAY_FREE in body:
+            return self.label + "QTZ]" + self.target + body.replace(PLAY_FREE, PLAY_QTZ)
+        return self.label + "]" + self.target + body
+
+
+# ---------- DLO BUTTONS : DLo X-Clips of the first two LP tracks, cycling clear -> undo -> x2 / :2 -> clear --------------
+DLO_STATES = { # state : (next state, clip color in this state, (label, LP track, command) of button 1, same for button 2)
+    'clear': ('undo', 2, ('clear', 'LP1', 'clear'), ('clear_all', 'LP1', 'clear_all')),
+    'undo': ('double', 40, ('undo', 'LP1', 'undo'), ('undo_all', 'LP1', 'undo_all')),
+    'double': ('clear', 20, (':2', 'LP2', 'clear'), ('x2', 'LP2', 'undo')),
+}
+
+
+class DLoButton(object):
+    """ a DLo X-Clip name parsed once around its [label], LP track and command, for the state it is in """
+
+    def __init__(self, name, button):
+        label = name.split("[")[1].split("]")[0]
+        self.state = [state for state, row in DLO_STATES.items() if row[2 + button][0] == label][0]
+        self.button = button
+        self.prefix = name.split("[")[0]
+        rest = name.split("]", 1)[1]
+        lp, command = DLO_STATES[self.state][2 + button][1:]
+        lp_pos = rest.find(lp)
+        command_pos = rest.rfind(command)
+        if 0 <= lp_pos and lp_pos + len(lp) <= command_pos:
+            self.parts = (rest[:lp_pos], rest[lp_pos + len(lp):command_pos], rest[command_pos + len(command):])
+        else: # no LP track / command to swap, only the label changes
+            self.parts = (rest,)
+
+    def render(self, state):
+        label, lp, command = DLO_STATES[state][2 + self.button]
+        if len(self.parts) == 1:
+            return self.prefix + "[" + label + "]" + self.parts[0]
+        return self.prefix + "[" + label + "]" + self.parts[0] + lp + self.parts[1] + command + self.parts[2]
+
+
+# ---------- PARAMETER REGISTRY : parameter names -> indexes, introspected once per device class --------------
+PARAM_REGISTRY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'param_registry.json')
+PARAMS = { # parameter used by the actions : (names it can have in the device, index it had before the registry, used if no name matches)
+    'looper_state': (('State',), 1), # 0 stop, 1 rec, 2 play, 3 ovd
+    'looper_qtz': (('Quantization',), 6),
+    'bink_length': (('Loop Length', 'Length'), 5),
+    'pitch': (('Pitch',), 1),
+    'dlo_clear': (('clear',), 1),
+    'dlo_clear_all': (('clear_all',), 2),
+    'dlo_undo': (('undo',), 6),
+    'dlo_undo_all': (('undo_all',), 7),
+}
+
+
+def device_key(device):
+    """ registry key of a device : its class name, or its name for Max devices (they all share a few class names) """
+    return device.name if device.class_name.startswith('Mx') else device.class_name
+
+
+def load_param_registry(path, log=None):
+    """ device key -> {parameter name: index} from a file written by export_param_registry, {} if there is none.
+    an unreadable file is logged and ignored, the devices are introspected again """
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with open(path) as f:
+            return dict((key, dict((name, idx) for idx, name in reversed(list(enumerate(names))))) for key, names in json.load(f).items())
+    except (ValueError, IOError, OSError, AttributeError, TypeError) as e:
+        if log is not None:
+            log('%s ignored : %r' % (path, e))
+        return {}
+
+
+_export_lock = threading.Lock() # one registry export at a time
+_exported_snapshot = [0] # number of the last registry snapshot written
+
+
+def replace_file(src, dst):
+    """ moves src over dst in one step (python 2 has no os.replace, and os.rename does not overwrite on windows) """
+    if hasattr(os, 'replace'):
+        os.replace(src, dst)
+        return
+    if os.name == 'nt' and os.path.exists(dst):
+        os.remove(dst)
+    os.rename(src, dst)
+
+
+def export_param_registry(path, registry, snapshot=0):
+    """ writes device key -> parameter names (in index order). no LOM access, can run in the worker pool.
+    snapshot numbers the registry copies : a copy older than the one already written is skipped, the latest wins.
+    the file is written aside and then moved over path, so a reader never sees half of it """
+    exported = dict((key, [name for name, idx in sorted(names.items(), key=lambda item: item[1])]) for key, names in registry.items())
+    with _export_lock:
+        if snapshot < _exported_snapshot[0]:
+            return
+        _exported_snapshot[0] = snapshot
+        with open(path + '.tmp', 'w') as f:
+            json.dump(exported, f, indent=1, sort_keys=True)
+        replace_file(path + '.tmp', path)
+
+
+# ---------- SET CONFIG : set layout constants read from set_config.json, validated once, reloaded when the file changes --------------
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'set_config.json')
+CONFIG_CHECK_INTERVAL = 1.0 # seconds between two mtime checks of CONFIG_FILE
+DEFAULT_CONFIG = {
+    'live_sample_frames': 44100,
+    'names_beats_midi': ['beatardeche', 'FunkyClyphX', 'beatrebou', 'ThugBeat'], # parts of chain simpler names in beats midi drumracks
+    'instru_names': ['KEYS', 'BASS', 'DRUMS', 'KICKS', 'SNARES', 'HATS', 'PERCS', 'Fills', 'Shakers'],
+    'copyclips': {'a': 8, 'b': 11, 'c': 14}, # idx of the first clip switch_abc copies, per looper
+    'music_clip_tracks': ['test', 'REC', 'Beats', 'Bass'], # tracks navigate_clips moves in
+    'music_tracks': ['REC', 'Beats', 'Slice', 'Bass', 'piano', 'LOOPS_OUT', 'Loop', 'INSTRU'], # tracks navigate_tracks moves through
+    'simpler_tracks': 'Slice', # tracks deleted by del_simplers
+    'cheat_lengths': [4, 8, 16, 24, 32, 48, 64], # beat lengths the beats midi clips are rounded to
+    'looper_qtz': {'1': 8, '2': 6, '4': 5}, # nb of beats -> looper Quantization value
+    'looper_qtz_1bar': 5,
+    'looper_qtz_none': 1,
+    'slots': { # clip positions, used when no scene is named or #tagged with the key (negative : from the last scene)
+        'bpm_cmd': 7, 'bpm': -4, 'info_rec': 18, 'routing': -2, # bpm_cmd on the bpm track, the others on track 1 (bpm : else the 1st BPM clip)
+        'abc': 2, 'rec_paste': 7, 'rec_bank': 21, 'rec_lengths': 5, # looper tracks : switch_abc rows, rec clips pasted / banked / by length
+        'bink': -1, # Bink clip on track 1
+    },
+    'debounce_ms': 120, # window in which repeated triggers of a debounced action are coalesced
+    'macros': { # name -> action list run by 'macro <name>'. actions of this file are called directly, the others batched
+        'reset_session': '1/CLIP(1) DEL ; reset_loopers ; reset_instru ; initial_routing ; bind_instru',
+        'all_inst': '"all_Inst"/SEL ; "all_Inst"/ARM ON ; color_sel_looper 0 ; "bass","druminst","VOIX","RECLOOP"/ARM OFF ; BIND ROLL_1 "all_Inst"/DEV(1) B1 P1 ; "VoxKey"/MON OFF',
+    },
+}
+
+
+class ConfigError(ValueError):
+    pass
+
+
+def _int(value):
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ConfigError('%r is not an integer' % (value,))
+    return value
+
+
+def _name(value):
+    if not isinstance(value, (str, type(u''))):
+        raise ConfigError('%r is not a name' % (value,))
+    return value
+
+
+def _names(value):
+    return tuple(_name(v) for v in value)
+
+
+def _int_map(value):
+    return dict((_name(k), _int(v)) for k, v in value.items())
+
+
+CONFIG_SCHEMA = { # key -> validates and freezes the value
+    'live_sample_frames': _int,
+    'names_beats_midi': _names,
+    'instru_names': lambda v: frozenset(_names(v)),
+    'copyclips': _int_map,
+    'music_clip_tracks': _names,
+    'music_tracks': _names,
+    'simpler_tracks': _name,
+    'cheat_lengths': lambda v: tuple(sorted(_int(x) for x in v)),
+    'looper_qtz': lambda v: dict((int(k), _int(x)) for k, x in v.items()),
+    'looper_qtz_1bar': _int,
+    'looper_qtz_none': _int,
+    'slots': _int_map,
+    'debounce_ms': _int,
+    'macros': lambda v: dict((_name(k).lower(), _name(x)) for k, x in v.items()),
+}
+SetConfig = collections.namedtuple('SetConfig', sorted(CONFIG_SCHEMA))
+
+
+def load_config(path):
+    """ SetConfig of the file (missing keys take DEFAULT_CONFIG values, macros are added to the default ones),
+    or of DEFAULT_CONFIG if path is None. raises ConfigError """
+    values = dict(DEFAULT_CONFIG)
+    if path is not None:
+        with open(path) as f:
+            loaded = json.load(f)
+        if isinstance(loaded, dict) and isinstance(loaded.get('macros'), dict):
+            macros = dict(DEFAULT_CONFIG['macros'])
+            macros.update((name.lower(), plan) for name, plan in loaded['macros'].items()) # json keys are strings
+            loaded['macros'] = macros
+        values.update(loaded)
+    unknown = set(values) - set(CONFIG_SCHEMA)
+    if unknown:
+        raise ConfigError('unknown keys %s' % ', '.join(sorted(unknown)))
+    frozen = {}
+    for key, value in values.items():
+        try:
+            frozen[key] = CONFIG_SCHEMA[key](value)
+        except (TypeError, AttributeError, ValueError) as e:
+            raise ConfigError('%s : %s' % (key, e))
+    return SetConfig(**frozen)
+
+
+def export_config(path):
+    """ writes DEFAULT_CONFIG, as a starting point to edit """
+    with open(path, 'w') as f:
+        json.dump(DEFAULT_CONFIG, f, indent=1, sort_keys=True)
+
+
+# ---------- ARGS GRAMMAR : each action declares its args, parsed once per distinct args string --------------
+ARGS_CACHE_SIZE = 128
+REQUIRED = object()
+
+
+class ArgsError(ValueError):
+    pass
+
+
+class Arg(object):
+    """ one typed argument of an action. kind is int, float, str or a tuple of accepted words.
+    many collects all remaining words into a tuple """
+
+    def __init__(self, name, kind=str, default=REQUIRED, bounds=None, many=False):
+        self.name = name
+        self.kind = kind
+        self.default = () if many and default is REQUIRED else default
+        self.bounds = bounds
+        self.many = many
+
+    def usage(self):
+        text = '|'.join(self.kind) if isinstance(self.kind, tuple) else self.name
+        text = text + '...' if self.many else text
+        return '<%s>' % text if self.default is REQUIRED else '[%s]' % text
+
+    def convert(self, word):
+        if isinstance(self.kind, tuple):
+            for choice in self.kind:
+                if word.lower() == choice.lower():
+                    return choice
+            raise ArgsError('%s must be one of %s, got %r' % (self.name, '|'.join(self.kind), word))
+        try:
+            value = self.kind(word)
+        except ValueError:
+            raise ArgsError('%s must be %s, got %r' % (self.name, getattr(self.kind, 'usage', self.kind.__name__), word))
+        if self.bounds and not self.bounds[0] <= value <= self.bounds[1]:
+            raise ArgsError('%s must be in %s..%s, got %s' % (self.name, self.bounds[0], self.bounds[1], value))
+        return value
+
+
+_args_cache = collections.OrderedDict() # (spec, raw args) -> parsed tuple or ArgsError, least recently used first
+
+
+def parse_args(spec, raw):
+    """ the tuple of values of the args string for spec (a tuple of Arg). raises ArgsError """
+    key = (spec, raw)
+    if key in _args_cache:
+        parsed = _args_cache.pop(key)
+    else:
+        try:
+            parsed = _parse_args(spec, (raw or '').split())
+        except ArgsError as e:
+            parsed = e
+        if len(_args_cache) >= ARGS_CACHE_SIZE:
+            _args_cache.popitem(last=False)
+    _args_cache[key] = parsed
+    if isinstance(parsed, ArgsError):
+        raise parsed
+    return parsed
+
+
+def _parse_args(spec, words):
+    """ an optional arg that does not accept the next word takes its default and leaves the word to the following args """
+    values = []
+    w = 0
+    for i, arg in enumerate(spec):
+        if arg.many:
+            values.append(tuple(arg.convert(word) for word in words[w:]))
+            return tuple(values)
+        if w < len(words):
+            try:
+                values.append(arg.convert(words[w]))
+                w += 1
+                continue
+            except ArgsError:
+                if arg.default is REQUIRED or i == len(spec) - 1:
+                    raise
+        elif arg.default is REQUIRED:
+            raise ArgsError('missing %s' % arg.name)
+        values.append(arg.default)
+    if w < len(words):
+        raise ArgsError('unexpected %r' % ' '.join(words[w:]))
+    return tuple(values)
+
+
+def takes(*spec):
+    """ declares the args of an action : the method is called with the parsed tuple instead of the args string.
+    invalid args show one message with the usage and the action is not run """
+    def decorate(method):
+        @functools.wraps(method)
+        def action(self, action_def, args):
+            try:
+                parsed = parse_args(spec, args)
+            except ArgsError as e:
+                self.canonical_parent.show_message('%s : %s' % (' '.join([method.__name__] + [a.usage() for a in spec]), e))
+                return
+            return method(self, action_def, parsed)
+        action.arg_spec = spec
+        return action
+    return decorate
+
+
+DEBOUNCE_TICK = 0.1 # seconds per schedule_message tick
+DEBOUNCE_MAX_KEYS = 64 # recent calls remembered before the expired ones are pruned
+
+
+def debounced(policy):
+    """ coalesces repeated triggers of an action (footswitch bounce, X-Clips bound twice) within the debounce_ms window.
+    'drop' : a call identical to one run less than a window ago (same args, same track) is ignored.
+    'latest' : calls on the same track are held for a window, only the last one runs.
+    'queue' : identical calls all run, one window apart. goes above @takes, the raw args string is compared """
+    assert policy in ('drop', 'latest', 'queue')
+    def decorate(method):
+        @functools.wraps(method)
+        def action(self, action_def, args):
+            return self._debounce(policy, method, action_def, args)
+        action.debounce = policy
+        return action
+    return decorate
+
+
+class ArmRing(object):
+    """ exclusive arm over a ring of tracks. the armed positions are kept in memory (refresh is called by arm
+    listeners), so a selection only writes the tracks whose arm changes and cycling is one cursor step """
+
+    def __init__(self):
+        self.tracks = []
+        self.positions = {} # lowercase track name -> position
+        self.armed = set()
+        self.cursor = -1
+
+    def add(self, track):
+        position = len(self.tracks)
+        self.tracks.append(track)
+        self.positions.setdefault(track.name.lower(), position)
+        self.refresh(position)
+        return position
+
+    def refresh(self, position):
+        """ a track armed from elsewhere (by hand, another ring) becomes the cursor """
+        if self.tracks[position].arm:
+            self.armed.add(position)
+            self.cursor = position
+        else:
+            self.armed.discard(position)
+
+    def select(self, position):
+        """ arms the track at position, disarms the other armed tracks of the ring. returns the number of tracks written """
+        changes = [(self.tracks[p], False) for p in self.armed if p != position]
+        if position not in self.armed:
+            changes.append((self.tracks[position], True))
+        for track, arm in changes:
+            track.arm = arm
+        self.armed = set([position])
+        self.cursor = position
+        return len(changes)
+
+    def next_position(self):
+        if len(self.armed) == 1:
+            self.cursor = next(iter(self.armed))
+        return (self.cursor + 1) % len(self.tracks)
+
+
+class BeatScheduler(object):
+    """ operations waiting for a song beat, in a heap keyed by target beat. due() pops the ones whose target is
+    nearer to this tick than to the next one (tick interval measured in beats), so each fires in the tick closest
+    to its boundary. lateness is song beats after the target (negative = fired just before it).
+    an operation scheduled on a grid (bar length) stays on that grid when the playhead jumps """
+
+    def __init__(self):
+        self._heap = []
+        self._seq = 0 # keeps operations of the same beat in scheduling order
+        self.interval = 0.0 # song beats between two ticks
+        self._last_tick = None
+        self._last_time = None
+        self.metrics = {'scheduled': 0, 'fired': 0, 'late_max': 0.0, 'late_total': 0.0}
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, beat, callback, grid=None):
+        heapq.heappush(self._heap, (beat, self._seq, callback, grid))
+        self._seq += 1
+        self.metrics['scheduled'] += 1
+
+    def observe(self, song_time):
+        """ song time notification. after a jump back (loop brace, relocation) pending targets move by the same
+        amount, so they keep their distance to the playhead. targets on a grid go to its next line instead """
+        if self._last_time is not None and song_time < self._last_time:
+            delta = song_time - self._last_time
+            self._heap = [(math.ceil(song_time / grid) * grid if grid else beat + delta, seq, callback, grid) for beat, seq, callback, grid in self._heap]
+            heapq.heapify(self._heap)
+            self._last_tick = None
+        self._last_time = song_time
+
+    def due(self, song_time):
+        """ pops the callbacks to run in this tick """
+        if self._last_tick is not None and song_time > self._last_tick:
+            step = song_time - self._last_tick
+            self.interval = step if not self.interval else 0.75 * self.interval + 0.25 * step
+        self._last_tick = song_time
+        callbacks = []
+        while self._heap and self._heap[0][0] - song_time <= self.interval / 2:
+            beat, seq, callback, grid = heapq.heappop(self._heap)
+            late = song_time - beat
+            self.metrics['fired'] += 1
+            self.metrics['late_total'] += abs(late)
+            self.metrics['late_max'] = max(self.metrics['late_max'], late)
+            callbacks.append(callback)
+        return callbacks
+
+    def flush(self):
+        """ pops every pending callback (transport stopped) """
+        callbacks = [callback for beat, seq, callback, grid in sorted(self._heap)]
+        self._heap = []
+        return callbacks
+
+
+TRANSPOSE_INTERVALS = tuple(range(1, 12)) # default bank : chromatic, one semitone per slot below the source clip
+
+
+def transposed_notes(notes, interval):
+    """ (pitch, time, duration, velocity, mute) note tuples shifted by interval semitones, sorted. notes leaving 0-127 are dropped """
+    return tuple(sorted((pitch + interval,) + tuple(rest) for pitch, rest in ((n[0], n[1:]) for n in notes) if 0 <= pitch + interval <= 127))
+
+
+def clip_notes(clip):
+    """ all the notes of a MIDI clip, markers and loop included """
+    start = min(clip.start_marker, clip.loop_start)
+    return clip.get_notes(start, 0, max(clip.end_marker, clip.loop_end) - start, 128)
+
+
+class SlotIndex(object):
+    """ filled slots of one track : sorted array of filled slot indexes, and the words of the clip names -> slots.
+    the owner calls update(idx) from the has_clip / name listeners, lookups never touch the slots """
+
+    def __init__(self, clip_slots):
+        self.filled = array.array('i')
+        self.names = {} # slot idx -> clip name
+        self.words = {} # word of a clip name -> set of slot idx
+        self.positions = {} # slot ptr -> slot idx
+        self._slots = clip_slots
+        for idx in range(len(clip_slots)):
+            self.update(idx)
+
+    def update(self, idx):
+        """ re-reads slot idx """
+        slot = self._slots[idx]
+        self.positions[getattr(slot, '_live_ptr', id(slot))] = idx
+        for word in self.names.pop(idx, '').split(' '):
+            self.words.get(word, set()).discard(idx)
+        at = bisect.bisect_left(self.filled, idx)
+        is_filled = at < len(self.filled) and self.filled[at] == idx
+        if slot.has_clip:
+            self.names[idx] = slot.clip.name
+            for word in slot.clip.name.split(' '):
+                self.words.setdefault(word, set()).add(idx)
+            if not is_filled:
+                self.filled.insert(at, idx)
+        elif is_filled:
+            self.filled.pop(at)
+
+    def last(self):
+        """ index of the last filled slot, None if the track is empty """
+        return self.filled[-1] if self.filled else None
+
+    def next_filled(self, idx):
+        """ first filled slot after idx, None after the last one """
+        at = bisect.bisect_right(self.filled, idx)
+        return self.filled[at] if at < len(self.filled) else None
+
+    def find(self, word):
+        """ first slot whose clip name contains word (as a word, or else as a part of the name), None if none """
+        if self.words.get(word):
+            return min(self.words[word])
+        matches = [idx for idx, name in self.names.items() if word in name]
+        return min(matches) if matches else None
+
+
+LOOPER_STOP, LOOPER_REC, LOOPER_PLAY, LOOPER_OVD = range(4) # looper State parameter values
+
+
+class LooperStates(object):
+    """ state table of the looper tracks : one state code per looper (chain) in a packed array, and bitmasks per
+    state code, plus filled / mute / arm bitmasks per track. the owner updates it from listeners, queries are bit operations """
+
+    def __init__(self, chains_per_track):
+        self.offsets = array.array('i', [0]) # looper k of track t is at offsets[t] + k
+        for nb_chains in chains_per_track:
+            self.offsets.append(self.offsets[-1] + nb_chains)
+        self.codes = array.array('b', [LOOPER_STOP] * self.offsets[-1])
+        self.state_masks = [(1 << self.offsets[-1]) - 1, 0, 0, 0] # state code -> bits of the loopers in that state
+        self.flags = {'filled': 0, 'mute': 0, 'arm': 0} # -> bits of the tracks
+
+    def set_state(self, track, chain, code):
+        if not 0 <= code < len(self.state_masks): # not a looper state, the last one is kept
+              return
+        k = self.offsets[track] + chain
+        bit = 1 << k
+        self.state_masks[self.codes[k]] &= ~bit
+        self.state_masks[code] |= bit
+        self.codes[k] = code
+
+    def set_flag(self, flag, track, value):
+        if value:
+            self.flags[flag] |= 1 << track
+        else:
+            self.flags[flag] &= ~(1 << track)
+
+    def _track_mask(self, track):
+        return ((1 << self.offsets[track + 1]) - 1) & ~((1 << self.offsets[track]) - 1)
+
+    def states(self, track):
+        return tuple(self.codes[self.offsets[track]:self.offsets[track + 1]])
+
+    def any_in(self, code, track=None):
+        """ is any looper (of track) in state code """
+        mask = self.state_masks[code]
+        return bool(mask if track is None else mask & self._track_mask(track))
+
+    def active_chain(self, track):
+        """ first chain of track whose looper is not stopped, None if all are stopped """
+        running = ~self.state_masks[LOOPER_STOP] & self._track_mask(track)
+        return (running & -running).bit_length() - 1 - self.offsets[track] if running else None
+
+    def tracks_with(self, flag):
+        """ positions of the tracks whose flag is set (filled, mute, arm) """
+        mask = self.flags[flag]
+        return [t for t in range(len(self.offsets) - 1) if mask >> t & 1]
+
+
+LOOPER_STATE_NAMES = ('stop', 'rec', 'play', 'ovd')
+
+
+def section(word):
+    """ 'beat:state' (e.g. '8:play') -> (beat, state code). raises ValueError """
+    beat, state = word.split(':')
+    if state.lower() not in LOOPER_STATE_NAMES:
+        raise ValueError(word)
+    return float(beat), LOOPER_STATE_NAMES.index(state.lower())
+section.usage = 'beat:%s' % '|'.join(LOOPER_STATE_NAMES)
+
+
+def section_steps(sections, length):
+    """ (beat, value) section starts -> envelope steps (time, duration, value), each held until the next section or the clip end """
+    starts = sorted(s for s in sections if 0 <= s[0] < length)
+    return tuple((beat, end - beat, value) for (beat, value), end in zip(starts, [s[0] for s in starts[1:]] + [length]) if end > beat)
+
+
+def source_mtime(module_name):
+    """ (source path, mtime) of an imported module, (None, None) if it has no source file """
+    module = sys.modules.get(module_name)
+    path = getattr(module, '__file__', None)
+    if path is None:
+        return None, None
+    path = os.path.splitext(path)[0] + '.py'
+    try:
+        return path, os.path.getmtime(path)
+    except OSError:
+        return None, None
+
+
+# ---------- MACROS : action lists of the set config compiled once into call plans --------------
+MACRO_STEP = re.compile(r'^(?:(?P<target>"[^"]*"|\d+|sel)/)?(?P<name>[^\s/]+)(?:\s+(?P<args>.*))?$', re.IGNORECASE)
+
+
+def _add_step(plan, step):
+    """ appends a step, merging consecutive built in actions into one action list """
+    if step[0] == 'builtin' and plan and plan[-1][0] == 'builtin':
+        plan[-1] = ('builtin', plan[-1][1] + ' ; ' + step[1])
+    else:
+        plan.append(step)
+
+
+def compile_macro(name, macros, user_actions, stack=()):
+    """ plan of a macro : ('builtin', action list) for built in actions, ('user', action name, track spec, args) for
+    the actions of user_actions (name -> (kind, method)). 'macro x' steps are inlined. raises ValueError """
+    if name not in macros:
+        raise ValueError('unknown macro %r' % name)
+    if name in stack:
+        raise ValueError('cycle %s' % ' > '.join(stack + (name,)))
+    plan = []
+    for step in (s.strip() for s in macros[name].split(';')):
+        match = MACRO_STEP.match(step)
+        action = match.group('name').lower() if match else None
+        args = (match.group('args') or '').strip() if match else ''
+        args = args if '"' in args else args.lower() # as ClyphX passes them
+        if action == 'macro' and match.group('target') is None:
+            for sub_step in compile_macro(args, macros, user_actions, stack + (name,)):
+                _add_step(plan, sub_step)
+        elif action in user_actions and (user_actions[action][0] == 'track' or match.group('target') is None):
+            _add_step(plan, ('user', action, match.group('target'), args))
+        elif step:
+            _add_step(plan, ('builtin', step))
+    return tuple(plan)
+
+
+# ---------- UNDO JOURNAL : what the bulk operations overwrite, packed, for a one tick restore --------------
+JOURNAL_ARENA_SIZE = 1 << 20 # bytes of packed records kept, the oldest operations are dropped first
+
+
+def clip_snapshot(clip):
+    """ what it takes to re-create a clip : name, color, loop and markers, and the notes of a MIDI clip
+    (an audio clip only keeps a reference to its file, the LOM cannot create one) """
+    snapshot = {'name': clip.name, 'color': clip.color_index, 'midi': clip.is_midi_clip, 'looping': clip.looping,
+                'loop': [clip.loop_start, clip.loop_end], 'markers': [clip.start_marker, clip.end_marker]}
+    if clip.is_midi_clip:
+        snapshot['notes'] = [list(note) for note in clip_notes(clip)]
+    else:
+        snapshot['file'] = clip.file_path
+    return snapshot
+
+
+def restorable(record):
+    """ False for a record undo_bulk can only report : a slot that held an audio clip """
+    return not (record[0] == 'slot' and record[3] is not None and not record[3]['midi'])
+
+
+class UndoJournal(object):
+    """ per bulk operation, the records of what it was about to overwrite, json + zlib packed. the arena is bounded :
+    recording drops the oldest operations until the packed size fits, the latest one is always kept.
+    an operation with nothing restorable is not recorded, so that it does not use an undo_bulk step """
+
+    def __init__(self, arena_size=JOURNAL_ARENA_SIZE):
+        self.arena_size = arena_size
+        self.entries = collections.deque() # (operation name, packed records), oldest first
+        self.size = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def record(self, operation, records):
+        """ returns False if the operation was not recorded """
+        if not any(restorable(r) for r in records):
+            return False
+        packed = zlib.compress(json.dumps(records, separators=(',', ':')).encode('utf-8'))
+        self.entries.append((operation, packed))
+        self.size += len(packed)
+        while self.size > self.arena_size and len(self.entries) > 1:
+            self.size -= len(self.entries.popleft()[1])
+        return True
+
+    def pop(self):
+        """ (operation name, records) of the latest operation, removed from the journal """
+        operation, packed = self.entries.pop()
+        self.size -= len(packed)
+        return operation, json.loads(zlib.decompress(packed).decode('utf-8'))
+
+
+def scene_keys(name):
+    """ keys a scene is found by : its lowercase name and each of its #tags (e.g. 'rec row A #rec_a') """
+    name = name.strip().lower()
+    return [name] + [word[1:] for word in name.split() if word.startswith('#') and len(word) > 1]
+
+
+RACK_CACHE_SIZE = 8 # drum racks whose chain samples are kept in memory (least recently used ones are dropped)
+
+
+# ---------- AUDIO ANALYSIS : reading sample files and detecting onsets, outside of the LOM --------------
+def file_fingerprint(path):
+    """ md5 of the file size + first and last 64 KB. up to 128 KB of file reads : computed in the worker task """
+    size = os.path.getsize(path)
+    digest = hashlib.md5(str(size).encode('ascii'))
+    with open(path, 'rb') as f:
+        digest.update(f.read(65536))
+        if size > 65536:
+            f.seek(max(65536, size - 65536))
+            digest.update(f.read(65536))
+    return digest.hexdigest()
+
+
+class AudioFileReader(object):
+    """ memory-mapped reader for PCM WAV / AIFF files. only the requested block is decoded, as mono floats.
+    other formats (mp3, flac, ogg...) and files without format or audio chunk raise ValueError """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if mmap else self._file.read()
+            self._parse(path)
+        except Exception:
+            self._file.close()
+            raise
+
+    def _parse(self, path):
+        self.big_endian = self._data[0:4] == b'FORM'
+        self.is_float = False
+        self.channels = self.sample_width = 0
+        try:
+            if self._data[0:4] == b'RIFF' and self._data[8:12] == b'WAVE':
+                self._parse_chunks(12, '<', self._wav_chunk)
+            elif self.big_endian and self._data[8:12] in (b'AIFF', b'AIFC'):
+                self._parse_chunks(12, '>', self._aiff_chunk)
+            else:
+                raise ValueError('not a WAV or AIFF file : %s' % path)
+        except (struct.error, ZeroDivisionError):
+            raise ValueError('damaged audio file : %s' % path)
+        if not self.channels or self.sample_width not in (1, 2, 3, 4) or not hasattr(self, 'data_offset') or not hasattr(self, 'nb_frames'):
+            raise ValueError('no PCM audio data in %s' % path)
+        self.block_align = self.channels * self.sample_width
+
+    def _parse_chunks(self, pos, endian, handler):
+        while pos + 8 <= len(self._data):
+            chunk_id = self._data[pos:pos+4]
+            chunk_size = struct.unpack(endian + 'I', self._data[pos+4:pos+8])[0]
+            handler(chunk_id, pos + 8, chunk_size)
+            pos += 8 + chunk_size + (chunk_size & 1)
+
+    def _wav_chunk(self, chunk_id, pos, size):
+        if chunk_id == b'fmt ':
+            fmt, self.channels, self.sample_rate = struct.unpack('<HHI', self._data[pos:pos+8])
+            self.sample_width = struct.unpack('<H', self._data[pos+14:pos+16])[0] // 8
+            if fmt == 0xFFFE: # extensible format, real format is the start of the sub format GUID
+                fmt = struct.unpack('<H', self._data[pos+24:pos+26])[0]
+            self.is_float = fmt == 3
+        elif chunk_id == b'data':
+            self.data_offset = pos
+            self.nb_frames = min(size, len(self._data) - pos) // (self.channels * self.sample_width)
+
+    def _aiff_chunk(self, chunk_id, pos, size):
+        if chunk_id == b'COMM':
+            self.channels, self.nb_frames, bits = struct.unpack('>hIh', self._data[pos:pos+8])
+            self.sample_width = bits // 8
+            exponent, mantissa = struct.unpack('>HQ', self._data[pos+8:pos+18])
+            self.sample_rate = int(mantissa * 2.0 ** ((exponent & 0x7FFF) - 16383 - 63))
+            if size >= 22 and self._data[pos+18:pos+22] == b'sowt': # AIFC little endian PCM
+                self.big_endian = False
+        elif chunk_id == b'SSND':
+            self.data_offset = pos + 8 + struct.unpack('>I', self._data[pos:pos+4])[0]
+
+    def _decode(self, raw):
+        width = self.sample_width
+        swap = self.big_endian != (sys.byteorder == 'big')
+        if width == 3:
+            raw = bytearray(raw)
+            hi, lo = (0, 2) if self.big_endian else (2, 0)
+            values = [raw[i+lo] | raw[i+1] << 8 | raw[i+hi] << 16 for i in range(0, len(raw), 3)]
+            return [(v - 16777216 if v & 0x800000 else v) / 8388608.0 for v in values]
+        if width == 1:
+            offset = 128 if not self.big_endian else 0 # WAV 8 bit is unsigned, AIFF 8 bit is signed
+            return [((v - offset + 128) % 256 - 128) / 128.0 for v in bytearray(raw)]
+        samples = array.array({2: 'h', 4: 'f' if self.is_float else 'i'}[width], raw)
+        if swap:
+            samples.byteswap()
+        if self.is_float:
+            return samples
+        scale = 1.0 / (1 << (8 * width - 1))
+        return [v * scale for v in samples]
+
+    def read_mono(self, start_frame, nb_frames, step=1):
+        """ frames start_frame, start_frame+step, ... (nb_frames/step of them), channels averaged """
+        nb_frames = max(0, min(nb_frames, self.nb_frames - start_frame))
+        begin = self.data_offset + start_frame * self.block_align
+        samples = self._decode(self._data[begin:begin + nb_frames * self.block_align])
+        channels = self.channels
+        if channels == 1:
+            return list(samples[::step])
+        picked = [samples[c::channels * step] for c in range(channels)]
+        return [sum(frame) / channels for frame in zip(*picked)]
+
+    def close(self):
+        if mmap:
+            self._data.close()
+        self._file.close()
+
+
+_FFT_TABLES = {} # frame size -> (bit reversed order, (half, twiddles) of each stage)
+
+
+def _fft_tables(size):
+    """ bit reversal and twiddles of the radix-2 FFT, computed once per frame size """
+    tables = _FFT_TABLES.get(size)
+    if tables is None:
+        order = [0]
+        while len(order) < size:
+            order = [2 * i for i in order] + [2 * i + 1 for i in order]
+        stages = []
+        half = 1
+        while half < size:
+            stages.append((half, [cmath.exp(-1j * math.pi * k / half) for k in range(half)]))
+            half *= 2
+        tables = _FFT_TABLES[size] = (order, stages)
+    return tables
+
+
+def _fft_magnitudes(frame):
+    """ magnitudes of the positive frequencies of a power of 2 sized frame (numpy if available, radix-2 otherwise) """
+    if numpy is not None:
+        return numpy.abs(numpy.fft.rfft(frame))
+    size = len(frame)
+    order, stages = _fft_tables(size)
+    values = [complex(frame[i]) for i in order]
+    for half, twiddles in stages:
+        for start in range(0, size, 2 * half):
+            for k in range(half):
+                even, odd = values[start+k], values[start+k+half] * twiddles[k]
+                values[start+k], values[start+k+half] = even + odd, even - odd
+    return [abs(v) for v in values[:size // 2 + 1]]
+
+
+ONSET_MAX_SECONDS = 120.0 # analysis budget per file without numpy (Live's python) : the audio past it is not analysed
+
+
+class OnsetDetector(object):
+    """ spectral flux onset detection, fed chunk by chunk so that a long loop is never decoded at once.
+    the file is decimated to ~11 kHz, analysed with 256 frames windows and a 128 frames hop.
+    without numpy only the first ONSET_MAX_SECONDS are analysed, the pure python FFT being CPU bound """
+    FRAME = 256
+    HOP = 128
+    ANALYSIS_RATE = 11025
+    MIN_GAP = 0.05 # seconds between two onsets
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.step = max(1, int(reader.sample_rate // self.ANALYSIS_RATE))
+        self.rate = reader.sample_rate / float(self.step)
+        self.nb_hops = max(0, (reader.nb_frames // self.step - self.FRAME) // self.HOP + 1)
+        if numpy is None:
+            self.nb_hops = min(self.nb_hops, int(ONSET_MAX_SECONDS * self.rate / self.HOP))
+        self.window = [0.5 - 0.5 * math.cos(2 * math.pi * i / self.FRAME) for i in range(self.FRAME)]
+        self.flux = [] # onset envelope, one value per hop
+        self._previous = None
+
+    @property
+    def done(self):
+        return len(self.flux) >= self.nb_hops
+
+    def process(self, max_hops):
+        """ analyses the next max_hops hops, returns True once the whole file is done """
+        first = len(self.flux)
+        last = min(self.nb_hops, first + max_hops)
+        if last > first:
+            block = self.reader.read_mono(first * self.HOP * self.step, ((last - first - 1) * self.HOP + self.FRAME) * self.step, self.step)
+            for hop in range(last - first):
+                frame = block[hop * self.HOP:hop * self.HOP + self.FRAME]
+                frame = frame + [0.0] * (self.FRAME - len(frame))
+                magnitudes = _fft_magnitudes([s * w for s, w in zip(frame, self.window)])
+                if self._previous is None:
+                    self.flux.append(0.0)
+                else:
+                    self.flux.append(sum(max(0.0, m - p) for m, p in zip(magnitudes, self._previous)))
+                self._previous = magnitudes
+        return self.done
+
+    def onsets(self):
+        """ onset positions in sample frames of the original file : local flux maxima above an adaptive threshold """
+        flux = self.flux
+        peak = max(flux) if flux else 0.0
+        min_gap = int(self.MIN_GAP * self.rate / self.HOP) + 1
+        found = []
+        for i in range(1, len(flux) - 1):
+            local = flux[max(0, i - 8):i + 9]
+            threshold = 1.5 * sum(local) / len(local) + 0.05 * peak
+            if flux[i] > threshold and flux[i] > flux[i-1] and flux[i] >= flux[i+1]:
+                if not found or i - found[-1] >= min_gap:
+                    found.append(i)
+        return tuple(i * self.HOP * self.step for i in found)
+
+
+TEMPO_RANGE = (60.0, 200.0) # bpm range searched by estimate_tempo
+TEMPO_MIN_CONFIDENCE = 0.3 # below this, the length based tempo is kept as is
+TEMPO_MAX_CORRECTION = 0.08 # a detected tempo further than 8 % from the length based one is ignored
+
+
+def _autocorrelation(values, max_lag):
+    if numpy is not None:
+        values = numpy.asarray(values)
+        return numpy.correlate(values, values, 'full')[len(values) - 1:len(values) + max_lag]
+    return [sum(a * b for a, b in zip(values, values[lag:])) for lag in range(min(max_lag + 1, len(values)))]
+
+
+def tempo_from_envelope(envelope, frame_rate):
+    """ (bpm, confidence) from the autocorrelation of an onset envelope sampled at frame_rate.
+    the period is refined on the peaks at 1, 2 and 4 times the best lag. confidence is in [0, 1] """
+    if len(envelope) < 4:
+        return 0.0, 0.0
+    mean = sum(envelope) / float(len(envelope))
+    centered = [v - mean for v in envelope]
+    min_lag = max(1, int(frame_rate * 60 / TEMPO_RANGE[1]))
+    max_lag = int(frame_rate * 60 / TEMPO_RANGE[0]) + 1
+    ac = _autocorrelation(centered, 4 * max_lag + 4)
+    if len(ac) <= min_lag + 1 or ac[0] <= 0:
+        return 0.0, 0.0
+    best = max(range(min_lag, min(max_lag, len(ac) - 1) + 1), key=lambda lag: ac[lag])
+    periods = []
+    for k in (1, 2, 4):
+        window = range(max(1, best * k - k), min(len(ac) - 1, best * k + k + 1))
+        if best * k + 1 >= len(ac) or not window:
+            break
+        peak = max(window, key=lambda lag: ac[lag])
+        left, center, right = ac[peak - 1], ac[peak], ac[peak + 1]
+        curvature = left - 2 * center + right
+        periods.append((peak + (0.5 * (left - right) / curvature if curvature else 0.0)) / k)
+    period = sum(periods) / len(periods)
+    return 60.0 * frame_rate / period, max(0.0, min(1.0, float(ac[best]) / ac[0]))
+
+
+def analyse_file(path):
+    """ OnsetDetector run over a whole file, 256 hops at a time. meant to run in a WorkerPool thread :
+    the GIL is released between blocks so that the control surface thread is not starved """
+    reader = AudioFileReader(path)
+    try:
+        detector = OnsetDetector(reader)
+        while not detector.process(256):
+            time.sleep(0)
+    finally:
+        reader.close()
+    return detector
+
+
+def detect_onsets(path):
+    """ onsets of an audio file, in sample frames """
+    return analyse_file(path).onsets()
+
+
+def estimate_tempo(path):
+    """ (bpm, confidence) of an audio file """
+    detector = analyse_file(path)
+    return tempo_from_envelope(detector.flux, detector.rate / detector.HOP)
+
+
+def cached_analysis(analysis, path, cache):
+    """ (fingerprint, analysis(path)), the result taken from cache (fingerprint -> result, written by the main thread
+    only) when the file was already analysed. meant to run in a WorkerPool thread """
+    fingerprint = file_fingerprint(path)
+    result = cache.get(fingerprint)
+    return fingerprint, result if result is not None else analysis(path)
+
+
+def refine_tempo(length_bpm, detected_bpm, confidence):
+    """ detected tempo brought to the octave of the length based one, used only when confident and close enough """
+    if detected_bpm <= 0:
+        return length_bpm
+    while detected_bpm < length_bpm / math.sqrt(2):
+        detected_bpm *= 2
+    while detected_bpm > length_bpm * math.sqrt(2):
+        detected_bpm /= 2
+    if confidence >= TEMPO_MIN_CONFIDENCE and abs(detected_bpm - length_bpm) <= TEMPO_MAX_CORRECTION * length_bpm:
+        return detected_bpm
+    return length_bpm
+
+
+# ---------- WORKER POOL : heavy pure python work off Live's thread. NEVER touch the LOM from a task --------------
+class WorkerTask(object):
+    """ handle returned by WorkerPool.submit. cancel() drops the task if it is still queued, or its result if it is running """
+
+    def __init__(self, func, args, on_done, on_error):
+        self.func = func
+        self.args = args
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class WorkerPool(object):
+    """ a few daemon threads fed by a bounded task queue. results wait in a second queue until drain() hands them to
+    their callbacks on Live's main thread. metrics are only written by the main thread (submit / drain) """
+
+    def __init__(self, nb_workers=2, max_pending=16, log=None):
+        self._tasks = queue.Queue(max_pending)
+        self._log = log # where a raising callback is reported, drain() goes on with the other results
+        self._results = queue.Queue()
+        self.outstanding = 0 # submitted and not handed back yet
+        self.metrics = {'submitted': 0, 'rejected': 0, 'completed': 0, 'failed': 0, 'cancelled': 0, 'max_pending': 0}
+        self._threads = [threading.Thread(target=self._work) for i in range(nb_workers)]
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def submit(self, func, args=(), on_done=None, on_error=None):
+        """ queues func(*args). returns the WorkerTask, or None when the queue is full (backpressure) """
+        task = WorkerTask(func, args, on_done, on_error)
+        try:
+            self._tasks.put_nowait(task)
+        except queue.Full:
+            self.metrics['rejected'] += 1
+            return None
+        self.outstanding += 1
+        self.metrics['submitted'] += 1
+        self.metrics['max_pending'] = max(self.metrics['max_pending'], self._tasks.qsize())
+        return task
+
+    def _work(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            if task.cancelled:
+                self._results.put((task, False, None))
+                continue
+            try:
+                self._results.put((task, True, task.func(*task.args)))
+            except Exception as e: # handed to on_error, the worker must survive anything
+                self._results.put((task, False, e))
+
+    def drain(self):
+        """ calls on_done / on_error of the finished tasks. main thread only. a callback that raises is logged,
+        the next results are still handed back """
+        while True:
+            try:
+                task, ok, value = self._results.get_nowait()
+            except queue.Empty:
+                return
+            self.outstanding -= 1
+            if task.cancelled:
+                self.metrics['cancelled'] += 1
+                continue
+            self.metrics['completed' if ok else 'failed'] += 1
+            callback = task.on_done if ok else task.on_error
+            if callback:
+                try:
+                    callback(value)
+                except Exception as e: # e.g. the Simpler's track was deleted during the analysis
+                    if self._log:
+                        self._log('worker callback failed : %r' % e)
+
+    def shutdown(self, timeout=0.5):
+        """ cancels what is still queued, stops the threads and waits for them (a running task can delay it up to timeout) """
+        while True:
+            try:
+                task = self._tasks.get_nowait()
+            except queue.Empty:
+                break
+            if task is not None:
+                task.cancel()
+                self.outstanding -= 1
+                self.metrics['cancelled'] += 1
+        for thread in self._threads:
+            self._tasks.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
 
 
 # Your class must extend UserActionsBase.
 class ExampleActions(UserActionsBase):
     """ ExampleActions provides some example actions for demonstration purposes. """
 
+    def __init__(self, *a, **k):
+        super(ExampleActions, self).__init__(*a, **k)
+        self._init_state()
+        self._module_mtime = source_mtime(self.__class__.__module__) # (source path, mtime) of this file when its code was loaded
+        self._reload_watch = False # True while reload_actions polls the file
+
+    def _init_state(self):
+        """ state of a new instance. on reload_actions, attributes added by the new code are taken from here """
+        self._listeners = {} # (subject ptr, property, callback) -> subject, added by _add_listener, removed in disconnect
+        self._pending_simplers = [] # TOSIMP requests (known tracks, profile, reselect, deadline) waiting for their new Simpler track
+        self._simpler_watch = {} # track ptr -> new track listened to until its Simpler shows up
+        self._onset_cache = {} # file fingerprint -> onsets (sample frames)
+        self._onset_jobs = {} # simpler ptr -> WorkerTask of the running analysis
+        self._worker_pool = None # WorkerPool, started by the first run_in_background
+        self._pump_scheduled = False # a _pump_worker_results call is waiting for its tick
+        self._rack_cache = collections.OrderedDict() # rack ptr -> {chain idx: (path, frames, rate, bank)}, LRU order
+        self._rack_listeners = {} # rack ptr -> listeners to remove when the rack leaves the cache
+        self._rack_watched = {} # rack ptr -> chain idxs whose devices / sample are already listened to
+        self._tinypad_page = 0
+        self._cmd_templates = None # [clip, CommandTemplate, name last written, name listener] of CmdLoop clips 1-4, None = to be parsed
+        self._cmd_qtz = None # quantize mode of the CmdLoop clips, read from the clips when None
+        self._cmd_rec_mode = None # 'Sync' or 'Free', read from the clips when None
+        self._dlo_buttons = None # ((track idx, slot idx, clip, DLoButton), ...) of the LP1 and LP2 DLo clips
+        self._dlo_state = None # current DLO_STATES state
+        self._param_registry = load_param_registry(PARAM_REGISTRY_FILE, self.canonical_parent.log_message) # device key -> {parameter name: index}
+        self._param_indexes = {} # (device key, PARAMS key) -> index, resolved once
+        self._param_snapshots = 0 # registry copies handed to export_param_registry
+        self._param_checked = set() # device keys whose registry entry was checked against a live device
+        self._arm_rings = {} # 'instru' (INSTRU group) / 'select' (instru_names tracks) -> ArmRing
+        self._arm_listeners = [] # (track, listener) keeping the rings in sync
+        self._voxkey = None # VoxKey track, monitored when inputMidi is selected
+        self._scheduler = BeatScheduler() # operations waiting for a bar, run from the update_display tick
+        self._scheduler_running = False
+        self._loop_length = None # (measures, beats per measure) from the BPM clip of track 1, None = not read yet
+        self._loop_length_clip = None # BPM clip whose name listener keeps _loop_length up to date
+        self._loop_length_slot = None # slot of the BPM clip, its has_clip listener drops _loop_length on delete or re-record
+        self._slot_indexes = {} # track ptr -> SlotIndex, built on first lookup
+        self._slot_listeners = {} # (track ptr, slot idx, property) -> (subject, property, listener) keeping the slot indexes up to date
+        self._looper_states = None # LooperStates of the Looper tracks, built on first query
+        self._looper_tracks = () # tracks of the table, in table order
+        self._looper_params = () # per track, the State parameters of its loopers
+        self._looper_listeners = [] # (subject, property, listener) keeping the table up to date
+        self._clip_colors = {} # clip ptr -> current color_index, kept by color listeners
+        self._color_listeners = [] # (clip, listener) keeping _clip_colors up to date
+        self._written_envelopes = {} # (clip ptr, parameter ptr) -> steps last written
+        self._config = None # SetConfig, loaded by the first config()
+        self._config_mtime = None # mtime of CONFIG_FILE when loaded, None if there was no file
+        self._config_checked = 0 # time of the last mtime check
+        self._tempo_cache = {} # file fingerprint -> (bpm, confidence)
+        self._debounce_last = {} # debounce key -> time of the last call run
+        self._debounce_pending = {} # 'latest' debounce key -> (action_def, args) of the call to run when the window ends
+        self._debounce_queues = {} # 'queue' debounce key -> deque of (action_def, args) waiting for their turn
+        self._debounce_stats = collections.Counter() # (method name, 'dropped' / 'replaced' / 'queued') -> nb of calls
+        self._macro_plans = {} # macro name -> plan compiled from _macro_config
+        self._macro_config = None # SetConfig the plans were compiled from
+        self._journal = UndoJournal() # bulk operations that undo_bulk can revert
+        self._scene_index = None # scene name / #tag -> first scene idx, None = to be built
+        self._scene_listeners = [] # (scene, listener) of the scene names
+
     # Your class must implement this method.
     def create_actions(self):
         """
@@ -239,8 +1473,1003 @@ class ExampleActions(UserActionsBase):
         self.add_track_action('rec_abc_loopers', self.rec_abc_loopers)
         self.add_global_action('select_instru', self.select_instrument)
         self.add_track_action('switch_abc', self.switch_abc)
+        self.add_track_action('slice_onsets', self.slice_simpler_at_onsets)
+        self.add_global_action('worker_stats', self.show_worker_stats)
+        self.add_global_action('scheduler_stats', self.show_scheduler_stats)
+        self.add_track_action('looper_auto', self.write_looper_automation)
+        self.add_global_action('reload_actions', self.reload_actions)
+        self.add_global_action('debounce_stats', self.show_debounce_stats)
+        self.add_global_action('macro', self.macro)
+        self.add_global_action('undo_bulk', self.undo_bulk)
+        self.add_global_action('export_config', self.export_set_config)
+
+    def add_global_action(self, name, method):
+        self._add_user_action(name, 'global', method)
+        super(ExampleActions, self).add_global_action(name, method)
+
+    def add_track_action(self, name, method):
+        self._add_user_action(name, 'track', method)
+        super(ExampleActions, self).add_track_action(name, method)
+
+    def _add_user_action(self, name, kind, method):
+        """ keeps name -> (kind, method) so macros call the actions of this file directly.
+        create_actions can run before _init_state, hence the setdefault """
+        self.__dict__.setdefault('_user_actions', {})[name.lower()] = (kind, method)
+
+
+# ---------- LISTENERS : everything added here is removed in disconnect --------------
+    def _ptr(self, lom_object):
+        """ stable identity of a Live object (python wrappers can change, the pointer does not) """
+        return getattr(lom_object, '_live_ptr', id(lom_object))
+
+    def _add_listener(self, subject, prop, callback):
+        """ adds a listener on subject.prop and remembers it for disconnect """
+        getattr(subject, 'add_%s_listener' % prop)(callback)
+        self._listeners[(self._ptr(subject), prop, callback)] = subject
+
+    def _remove_listener(self, subject, prop, callback):
+        """ removes a listener added with _add_listener. the subject may already be deleted in Live """
+        try:
+              if getattr(subject, '%s_has_listener' % prop)(callback):
+                    getattr(subject, 'remove_%s_listener' % prop)(callback)
+        except RuntimeError:
+              pass
+        self._listeners.pop((self._ptr(subject), prop, callback), None)
+
+    def disconnect(self):
+        for (_, prop, callback), subject in list(self._listeners.items()):
+              self._remove_listener(subject, prop, callback)
+        self._pending_simplers = []
+        self._simpler_watch = {}
+        self._onset_jobs = {}
+        self._rack_cache.clear()
+        self._rack_listeners = {}
+        self._rack_watched = {}
+        if self._worker_pool is not None:
+              self._worker_pool.shutdown()
+              self._worker_pool = None
+        self._pump_scheduled = False
+        self._scheduler = None
+        self._reload_watch = False
+        super(ExampleActions, self).disconnect()
+
+    def run_in_background(self, func, args, on_done, on_error=None):
+        """ runs func(*args) in the worker pool. on_done(result) / on_error(exception) are called on Live's thread,
+        at the next update_display tick after the task is done. returns the WorkerTask, None if the pool is full """
+        if self._worker_pool is None:
+              self._worker_pool = WorkerPool(log=self.canonical_parent.log_message)
+        if on_error is None:
+              on_error = lambda e: self.canonical_parent.log_message('background task failed : %r' % e)
+        task = self._worker_pool.submit(func, args, on_done, on_error)
+        if task is None:
+              self.canonical_parent.show_message('analysis queue full, try again later')
+        elif not self._pump_scheduled:
+              self._pump_scheduled = True
+              self.canonical_parent.schedule_message(1, self._pump_worker_results)
+        return task
+
+    def _pump_worker_results(self):
+        self._pump_scheduled = False
+        if self._worker_pool is None: # disconnected
+              return
+        try:
+              self._worker_pool.drain()
+        finally:
+              if self._worker_pool is not None and self._worker_pool.outstanding > 0 and not self._pump_scheduled:
+                    self._pump_scheduled = True
+                    self.canonical_parent.schedule_message(1, self._pump_worker_results)
+
+    def show_worker_stats(self, action_def, _):
+        """ shows the worker pool metrics in the status bar """
+        if self._worker_pool is None:
+              self.canonical_parent.show_message('worker pool not started')
+        else:
+              self.canonical_parent.show_message('workers : %s, outstanding %s' % (self._worker_pool.metrics, self._worker_pool.outstanding))
+
+    def on_track_list_changed(self):
+        self._drop_cmd_templates()
+        self._drop_arm_rings()
+        self._drop_loop_length()
+        self._drop_slot_indexes()
+        self._drop_looper_states()
+        self._drop_clip_colors()
+        self._dlo_buttons = None
+        if self._pending_simplers:
+              self._watch_new_simpler_tracks()
+
+
+# ---------- HOT RELOAD : new code of this file swapped in place, without restarting Live --------------
+    def reload_actions(self, action_def, args):
+        """ re-imports this file if it changed since it was loaded ('force' : even if not) and swaps the new class in.
+        'watch' toggles a check every second. actions are registered again, data caches are kept """
+        args = args.strip().lower()
+        if args == 'watch':
+              self._reload_watch = not self._reload_watch
+              self.canonical_parent.show_message('reload watch %s' % ('on' if self._reload_watch else 'off'))
+              if self._reload_watch:
+                    self.canonical_parent.schedule_message(10, self._poll_source)
+              return
+        module_name = self.__class__.__module__
+        path, mtime = source_mtime(module_name)
+        if path is None:
+              self.canonical_parent.show_message('reload : no source file for %s' % module_name)
+        elif mtime == self._module_mtime[1] and args != 'force':
+              self.canonical_parent.show_message('reload : %s unchanged' % os.path.basename(path))
+        else:
+              self._reload_module(module_name, path, mtime)
+
+    def _poll_source(self):
+        if not self._reload_watch:
+              return
+        path, mtime = source_mtime(self.__class__.__module__)
+        if path is not None and mtime != self._module_mtime[1]:
+              self._reload_module(self.__class__.__module__, path, mtime)
+        self.canonical_parent.schedule_message(10, self._poll_source)
+
+    def _reload_module(self, module_name, path, mtime):
+        start = time.time()
+        module = sys.modules[module_name]
+        try:
+              with open(path, 'rb') as f:
+                    compile(f.read(), path, 'exec') # a syntax error leaves the running code untouched
+              reload_module(module)
+              new_class = getattr(module, self.__class__.__name__)
+        except Exception as e:
+              self._module_mtime = (path, mtime) # don't retry the same broken file on every poll
+              self.canonical_parent.log_message('reload of %s failed : %r' % (path, e))
+              self.canonical_parent.show_message('reload failed : %s' % e)
+              return
+        # stores kept up to date by listeners are rebuilt by the new code on first use, plain data caches are kept
+        self._drop_cmd_templates()
+        self._drop_arm_rings()
+        self._drop_loop_length()
+        self._drop_slot_indexes()
+        self._drop_looper_states()
+        self._drop_clip_colors()
+        self._drop_scene_index()
+        self._dlo_buttons = None
+        self._param_indexes = {} # PARAMS may have changed
+        self._config = None # so may DEFAULT_CONFIG
+        self.__class__ = new_class
+        fresh = new_class.__new__(new_class)
+        fresh._init_state()
+        for key, value in fresh.__dict__.items():
+              if key not in self.__dict__:
+                    setattr(self, key, value)
+        self._module_mtime = (path, mtime)
+        self.create_actions() # the registry now points to the new methods
+        self.canonical_parent.show_message('reloaded %s in %d ms' % (os.path.basename(path), (time.time() - start) * 1000))
+
+
+# ---------- DEBOUNCE : repeated triggers of an action coalesced before they reach the LOM --------------
+    def _debounce(self, policy, method, action_def, args):
+        """ runs, holds or drops a call of a @debounced action """
+        name = method.__name__
+        track = action_def.get('track') if action_def else None
+        target = self._ptr(track) if track is not None else None
+        key = (name, target) if policy == 'latest' else (name, ' '.join(args.split()).lower(), target)
+        window = self.config().debounce_ms / 1000.0
+        now = time.time()
+        if len(self._debounce_last) > DEBOUNCE_MAX_KEYS:
+              self._debounce_last = dict((k, t) for k, t in self._debounce_last.items() if now - t < window)
+        if policy == 'latest':
+              if key in self._debounce_pending:
+                    self._debounce_stats[(name, 'replaced')] += 1
+              else:
+                    self.canonical_parent.schedule_message(self._debounce_ticks(window), lambda: self._run_latest(method, key))
+              self._debounce_pending[key] = (action_def, args)
+        elif now - self._debounce_last.get(key, 0) >= window and not self._debounce_queues.get(key):
+              self._debounce_last[key] = now
+              return method(self, action_def, args)
+        elif policy == 'drop':
+              self._debounce_stats[(name, 'dropped')] += 1
+        else:
+              if not self._debounce_queues.get(key):
+                    self._debounce_queues[key] = collections.deque()
+                    self.canonical_parent.schedule_message(self._debounce_ticks(window), lambda: self._run_queued(method, key))
+              self._debounce_queues[key].append((action_def, args))
+              self._debounce_stats[(name, 'queued')] += 1
+
+    def _debounce_ticks(self, window):
+        return max(1, int(math.ceil(window / DEBOUNCE_TICK)))
+
+    def _run_latest(self, method, key):
+        call = self._debounce_pending.pop(key, None)
+        if call is not None:
+              self._debounce_last[key] = time.time()
+              method(self, *call)
+
+    def _run_queued(self, method, key):
+        calls = self._debounce_queues.get(key)
+        if not calls:
+              return
+        self._debounce_last[key] = time.time()
+        method(self, *calls.popleft())
+        if calls:
+              self.canonical_parent.schedule_message(self._debounce_ticks(self.config().debounce_ms / 1000.0), lambda: self._run_queued(method, key))
+        else:
+              del self._debounce_queues[key]
 
-
+    def show_debounce_stats(self, action_def, _):
+        """ shows how many calls the debounce layer dropped, replaced or queued, per action """
+        if not self._debounce_stats:
+              self.canonical_parent.show_message('debounce : nothing coalesced')
+        else:
+              self.canonical_parent.show_message('debounce : ' + ', '.join('%s %s %d' % (name, kind, n) for (name, kind), n in sorted(self._debounce_stats.items())))
+
+
+# ---------- MACROS : multi-step action lists run without going through the text dispatch again --------------
+    def macro_plan(self, name):
+        """ compiled plan of a macro of the set config, recompiled when the config changes. raises ValueError """
+        config = self.config()
+        if self._macro_config is not config:
+              self._macro_plans = {}
+              self._macro_config = config
+        if name not in self._macro_plans:
+              self._macro_plans[name] = compile_macro(name, config.macros, self._user_actions)
+        return self._macro_plans[name]
+
+    def _macro_track(self, spec):
+        """ track of a step target : none or SEL (selected track), a track number or a quoted track name """
+        if spec is None or spec.lower() == 'sel':
+              return self.song().view.selected_track
+        tracks = self.song().tracks
+        if spec.isdigit():
+              return tracks[int(spec) - 1] if 0 < int(spec) <= len(tracks) else None
+        name = spec.strip('"').lower()
+        return next((track for track in tracks if track.name.lower() == name), None)
+
+    def run_macro(self, name, action_def=None):
+        """ runs a macro : built in action lists are triggered, actions of this file are called in place """
+        try:
+              plan = self.macro_plan(name.lower())
+        except ValueError as e:
+              self.canonical_parent.show_message('macro %s : %s' % (name, e))
+              return
+        for step in plan:
+              if step[0] == 'builtin':
+                    self.canonical_parent.clyphx_pro_component.trigger_action_list(step[1])
+                    continue
+              _, action, target, args = step
+              kind, method = self._user_actions[action]
+              call_def = dict(action_def or {})
+              if kind == 'track':
+                    call_def['track'] = self._macro_track(target)
+                    if call_def['track'] is None:
+                          self.canonical_parent.show_message('macro %s : no track %s for %s' % (name, target, action))
+                          continue
+              method(call_def, args)
+
+    @takes(Arg('name'))
+    def macro(self, action_def, args):
+        """ macro <name> : runs the macro name of set_config.json """
+        self.run_macro(args[0], action_def)
+
+
+# ---------- UNDO JOURNAL : bulk operations reverted in one go --------------
+    def _track_ref(self, idx):
+        track = self.song().tracks[idx]
+        return [idx, track.name]
+
+    def _find_track(self, ref):
+        """ the track recorded as [idx, name] : at idx if the name still matches, else the first one with that name """
+        idx, name = ref
+        tracks = self.song().tracks
+        if idx < len(tracks) and tracks[idx].name == name:
+              return tracks[idx]
+        return next((track for track in tracks if track.name == name), None)
+
+    def journal_slots(self, track_idx, slot_idxs):
+        """ records of the content of slots about to be overwritten (None for an empty slot) """
+        slots = self.song().tracks[track_idx].clip_slots
+        return [['slot', self._track_ref(track_idx), s, clip_snapshot(slots[s].clip) if slots[s].has_clip else None] for s in slot_idxs if s < len(slots)]
+
+    def journal_tracks(self, track_idxs):
+        """ records of tracks about to be deleted : mixer, arm, clips, and the devices that cannot be re-created """
+        records = []
+        for idx in sorted(track_idxs):
+              track = self.song().tracks[idx]
+              records.append(['track', idx, {
+                    'name': track.name, 'color': track.color_index, 'midi': track.has_midi_input, 'mute': track.mute,
+                    'arm': track.can_be_armed and track.arm, 'volume': track.mixer_device.volume.value, 'pan': track.mixer_device.panning.value,
+                    'devices': [device.class_name for device in track.devices],
+                    'clips': [[s, clip_snapshot(slot.clip)] for s, slot in enumerate(track.clip_slots) if slot.has_clip]}])
+        return records
+
+    def journal_arms(self, names):
+        """ records of the arm of the tracks with these names """
+        tracks = self.song().tracks
+        return [['arm', self._track_ref(i), tracks[i].arm] for i in range(len(tracks)) if tracks[i].name in names and tracks[i].can_be_armed]
+
+    def _restore_clip(self, slot, snapshot):
+        """ puts a clip snapshot back in slot (None empties it). returns False for an audio clip, which the LOM cannot create """
+        if snapshot is not None and not snapshot['midi']:
+              return False
+        if slot.has_clip:
+              slot.delete_clip()
+        if snapshot is None:
+              return True
+        slot.create_clip(max(snapshot['loop'][1], snapshot['markers'][1]))
+        clip = slot.clip
+        clip.name, clip.color_index, clip.looping = snapshot['name'], snapshot['color'], snapshot['looping']
+        clip.loop_start, clip.loop_end = snapshot['loop']
+        clip.start_marker, clip.end_marker = snapshot['markers']
+        if snapshot['notes']:
+              clip.set_notes(tuple(tuple(note) for note in snapshot['notes']))
+        return True
+
+    def undo_bulk(self, action_def, _):
+        """ reverts the last journaled bulk operation at once : tracks re-created, clips, names and arms put back.
+        audio clips and devices are reported, Live's undo is needed for them """
+        if not self._journal:
+              self.canonical_parent.show_message('undo_bulk : nothing to revert')
+              return
+        operation, records = self._journal.pop()
+        song = self.song()
+        restored, lost = 0, []
+        for _, where, what in (r for r in records if r[0] == 'track'): # ascending idx, so each lands where it was
+              idx = min(where, len(song.tracks))
+              (song.create_midi_track if what['midi'] else song.create_audio_track)(idx) # returns None, the track is read back
+              track = song.tracks[idx]
+              track.name, track.color_index, track.mute = what['name'], what['color'], what['mute']
+              track.mixer_device.volume.value, track.mixer_device.panning.value = what['volume'], what['pan']
+              if what['arm'] and track.can_be_armed:
+                    track.arm = True
+              for s, snapshot in what['clips']:
+                    if s < len(track.clip_slots) and not self._restore_clip(track.clip_slots[s], snapshot):
+                          lost.append('%s clip %d' % (what['name'], s + 1))
+              lost.extend('%s %s' % (what['name'], device) for device in what['devices'])
+              restored += 1
+        for record in records:
+              if record[0] == 'track':
+                    continue
+              track = self._find_track(record[1])
+              if track is None:
+                    lost.append('track %s' % record[1][1])
+              elif record[0] == 'slot':
+                    if self._restore_clip(track.clip_slots[record[2]], record[3]):
+                          restored += 1
+                    else:
+                          lost.append('%s clip %d' % (track.name, record[2] + 1))
+              elif record[0] == 'name':
+                    if track.clip_slots[record[2]].has_clip:
+                          track.clip_slots[record[2]].clip.name = record[3]
+                          restored += 1
+              elif record[0] == 'arm':
+                    track.arm = record[2]
+                    restored += 1
+        self.canonical_parent.show_message('%s reverted : %d restored%s' % (operation, restored, ', not restorable : %s' % ', '.join(lost) if lost else ''))
+        if lost:
+              self.canonical_parent.log_message('undo_bulk %s, not restorable : %s' % (operation, ', '.join(lost)))
+
+
+# ---------- SIMPLER PROVISIONING : new Simpler track configured in one step, when its device shows up --------------
+    def _slice_profile(self, division=None):
+        """ SLICE_PROFILE with the given beat division (if any) """
+        profile = dict(SLICE_PROFILE)
+        if division is not None:
+              profile['slicing_beat_division'] = division
+        return profile
+
+    def provision_simpler_track(self, track, profile, reselect=None):
+        """ names the track, sets its input and applies all Simpler and sample settings of the profile directly.
+        returns False if there is no Simpler on the track yet """
+        simplers = [dev for dev in track.devices if dev.class_name == 'OriginalSimpler']
+        if not simplers:
+              return False
+        simpler = simplers[0]
+        tracks = list(self.song().tracks)
+        track_idx = tracks.index(track)
+        track.name = "Slice " + str(len([t for t in tracks if "Slice" in t.name and t != track]))
+        for channel in track.available_input_routing_channels:
+              if channel.display_name == profile['input_channel']:
+                    track.input_routing_channel = channel
+        simpler.playback_mode = profile['playback_mode']
+        sample = simpler.sample
+        sample.warping = profile['warping']
+        sample.slicing_style = profile['slicing_style']
+        sample.slicing_beat_division = profile['slicing_beat_division']
+        sample.gain = profile['gain']
+        for param in simpler.parameters:
+              if param.name in profile['parameters']:
+                    param.value = max(param.min, min(param.max, profile['parameters'][param.name]))
+        if profile['clyphx']:
+              self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/%s' % (int(track_idx+1), profile['clyphx']))
+        if reselect is not None:
+              self.song().view.selected_track = reselect
+        return True
+
+    def _watch_new_simpler_tracks(self):
+        """ matches pending TOSIMP requests with a track that appeared since and holds a Simpler. new tracks without
+        Simpler yet are listened to until their devices change. requests past their deadline are dropped.
+        listeners cannot change the set, so provisioning is scheduled for the next tick """
+        now = time.time()
+        for request in [r for r in self._pending_simplers if r[3] < now]:
+              self._pending_simplers.remove(request)
+              self.canonical_parent.log_message('TOSIMP : no Simpler track appeared within %s s, request dropped' % SIMPLER_REQUEST_TIMEOUT)
+        tracks = list(self.song().tracks)
+        claimed = set()
+        for request in list(self._pending_simplers):
+              known_tracks, profile, reselect, _ = request
+              new_tracks = [t for t in tracks if self._ptr(t) not in known_tracks and self._ptr(t) not in claimed]
+              simpler_tracks = [t for t in new_tracks if any(dev.class_name == 'OriginalSimpler' for dev in t.devices)]
+              if simpler_tracks:
+                    track = simpler_tracks[0]
+                    claimed.add(self._ptr(track))
+                    self._pending_simplers.remove(request)
+                    self.canonical_parent.schedule_message(1, lambda track=track, profile=profile, reselect=reselect: self.provision_simpler_track(track, profile, reselect))
+              else:
+                    for track in new_tracks:
+                          if self._ptr(track) not in self._simpler_watch:
+                                self._simpler_watch[self._ptr(track)] = track
+                                self._add_listener(track, 'devices', self._watch_new_simpler_tracks)
+        if not self._pending_simplers:
+              for track in self._simpler_watch.values():
+                    self._remove_listener(track, 'devices', self._watch_new_simpler_tracks)
+              self._simpler_watch = {}
+
+
+# ---------- ONSET SLICING : Simpler sliced at the transients of its sample, analysed in the worker pool --------------
+    def slice_simpler_at_onsets(self, action_def, _):
+        """slices the Simpler of the track (manual slicing) at the onsets found in its sample file. results are cached per file.
+        without numpy (Live's python) only the first ONSET_MAX_SECONDS of the sample are sliced, the FFT costing a few seconds of worker time per minute of audio"""
+        track = action_def['track']
+        simplers = [dev for dev in track.devices if dev.class_name == 'OriginalSimpler']
+        if not simplers or simplers[0].sample is None or not os.path.isfile(simplers[0].sample.file_path):
+              self.canonical_parent.show_message('error : no Simpler sample on %s' % track.name)
+              return
+        simpler = simplers[0]
+        path = simpler.sample.file_path
+        if self._ptr(simpler) not in self._onset_jobs:
+              key = self._ptr(simpler)
+              def done(result):
+                    del self._onset_jobs[key]
+                    fingerprint, onsets = result
+                    self._onset_cache[fingerprint] = onsets
+                    self._write_slices(simpler, onsets)
+              def failed(error):
+                    del self._onset_jobs[key]
+                    self._slice_by_beats(simpler)
+                    self.canonical_parent.show_message('onset detection failed (%s), sliced by beats' % error)
+              task = self.run_in_background(cached_analysis, (detect_onsets, path, self._onset_cache), done, failed)
+              if task is not None:
+                    self._onset_jobs[key] = task
+
+    def _slice_by_beats(self, simpler):
+        """ the beat division slicing of SLICE_PROFILE, for samples the onset detection cannot read """
+        sample = simpler.sample
+        sample.slicing_style = SLICE_PROFILE['slicing_style']
+        sample.slicing_beat_division = SLICE_PROFILE['slicing_beat_division']
+        simpler.playback_mode = SLICE_PROFILE['playback_mode']
+
+    def _write_slices(self, simpler, onsets):
+        sample = simpler.sample
+        sample.slicing_style = 3 # manual
+        sample.clear_slices()
+        for frame in onsets:
+              sample.insert_slice(frame)
+        simpler.playback_mode = 2 # slice
+        self.canonical_parent.show_message('%s slices from onsets' % len(onsets))
+
+
+# ---------- CMDLOOP TEMPLATES : quantize / rec mode of all loopers flipped with one pass of cached names --------------
+    def _cmd_clip_templates(self):
+        """ parses clips 1-4 of the CmdLoop tracks once. a name changed by hand drops the templates """
+        if self._cmd_templates is None:
+              self._cmd_templates = []
+              for track in self.song().tracks:
+                    if "CmdLoop" in track.name:
+                          for slot in range(4):
+                                clip = track.clip_slots[slot].clip
+                                if clip is None:
+                                      continue
+                                entry = [clip, CommandTemplate(clip.name, rec_slot=slot == 0), clip.name, None]
+                                entry[3] = self._make_cmd_name_listener(entry)
+                                self._add_listener(clip, 'name', entry[3])
+                                self._cmd_templates.append(entry)
+              if self._cmd_qtz is None:
+                    self._cmd_qtz = any(entry[1].quantized for entry in self._cmd_templates if not entry[1].fixed)
+        return self._cmd_templates
+
+    def _make_cmd_name_listener(self, entry):
+        def on_name_changed():
+              if entry[0].name != entry[2]:
+                    self._drop_cmd_templates()
+        return on_name_changed
+
+    def _drop_cmd_templates(self):
+        for clip, template, name, listener in self._cmd_templates or []:
+              self._remove_listener(clip, 'name', listener)
+        self._cmd_templates = None
+
+    def render_cmd_clips(self):
+        """ writes the CmdLoop clip names of the current quantize / rec modes, only where the last written name differs """
+        for entry in self._cmd_clip_templates():
+              name = entry[1].render(self._cmd_qtz, self._cmd_rec_mode)
+              if name != entry[2]:
+                    entry[2] = name
+                    entry[0].name = name
+
+
+# ---------- SLOT INDEX : filled slots and clip names of a track, kept by listeners instead of scanned --------------
+    def slot_index(self, track):
+        """ SlotIndex of the track, built (and listened to) the first time """
+        key = self._ptr(track)
+        if key not in self._slot_indexes:
+              slots = list(track.clip_slots)
+              index = SlotIndex(slots)
+              self._slot_indexes[key] = index
+              for idx, slot in enumerate(slots):
+                    self._watch_slot(index, key, slots, idx)
+        return self._slot_indexes[key]
+
+    def _watch_slot(self, index, key, slots, idx):
+        """ listens to the slot, and to the name of its clip. the clip listener is replaced when the slot's clip changes """
+        def on_name_changed():
+              index.update(idx)
+        def watch_clip():
+              former = self._slot_listeners.pop((key, idx, 'name'), None)
+              if former is not None:
+                    self._remove_listener(*former)
+              if slots[idx].has_clip:
+                    clip = slots[idx].clip
+                    self._add_listener(clip, 'name', on_name_changed)
+                    self._slot_listeners[(key, idx, 'name')] = (clip, 'name', on_name_changed)
+        def on_has_clip_changed():
+              watch_clip()
+              index.update(idx)
+        self._add_listener(slots[idx], 'has_clip', on_has_clip_changed)
+        self._slot_listeners[(key, idx, 'has_clip')] = (slots[idx], 'has_clip', on_has_clip_changed)
+        watch_clip()
+
+    def _drop_slot_indexes(self):
+        for subject, prop, listener in self._slot_listeners.values():
+              self._remove_listener(subject, prop, listener)
+        self._slot_listeners = {}
+        self._slot_indexes = {}
+
+    def on_scene_list_changed(self):
+        self._drop_slot_indexes()
+        self._drop_scene_index()
+
+
+# ---------- SCENE INDEX : rows addressed by scene name or #tag, the set config positions as fallback --------------
+    def scene_index(self):
+        """ scene name / #tag -> index of the first scene with it. rebuilt after a scene is renamed, added or removed """
+        if self._scene_index is None:
+              index = {}
+              for idx, scene in enumerate(self.song().scenes):
+                    for key in scene_keys(scene.name):
+                          index.setdefault(key, idx)
+                    if idx >= len(self._scene_listeners): # renames keep the listeners, scene list changes drop them
+                          self._add_listener(scene, 'name', self._on_scene_name)
+                          self._scene_listeners.append((scene, self._on_scene_name))
+              self._scene_index = index
+        return self._scene_index
+
+    def _on_scene_name(self):
+        self._scene_index = None
+
+    def _drop_scene_index(self):
+        for scene, listener in self._scene_listeners:
+              self._remove_listener(scene, 'name', listener)
+        self._scene_listeners = []
+        self._scene_index = None
+
+    def scene_slot(self, tag, default=None):
+        """ slot index of the scene named or #tagged tag. else default, or else the position of tag in the slots of
+        set_config.json (negative : counted from the last scene) """
+        idx = self.scene_index().get(tag)
+        if idx is None:
+              idx = default if default is not None else self.config().slots.get(tag, DEFAULT_CONFIG['slots'][tag])
+              if idx < 0:
+                    idx += len(self.song().scenes)
+        return idx
+
+
+# ---------- LOOPER STATES : state / filled / mute / arm of all loopers, kept by listeners --------------
+    def looper_states(self):
+        """ LooperStates of the Looper tracks (chains of their 1st device, or the device itself), built the first time.
+        every Looper track has its flags, a track without a valid looper device just has no looper states """
+        if self._looper_states is None:
+              self._looper_tracks = tuple(t for t in self.song().tracks if "Looper" in t.name)
+              self._looper_params = tuple(self._looper_state_params(track) for track in self._looper_tracks)
+              params = self._looper_params
+              table = LooperStates([len(p) for p in params])
+              self._looper_states = table
+              for t, track in enumerate(self._looper_tracks):
+                    for k, param in enumerate(self._looper_params[t]):
+                          self._watch_looper(param, 'value', lambda t=t, k=k, p=param: table.set_state(t, k, int(p.value)))
+                    self._watch_looper(track.clip_slots[0], 'has_clip', lambda t=t, s=track.clip_slots[0]: table.set_flag('filled', t, s.has_clip))
+                    self._watch_looper(track, 'mute', lambda t=t, tr=track: table.set_flag('mute', t, tr.mute))
+                    if track.can_be_armed:
+                          self._watch_looper(track, 'arm', lambda t=t, tr=track: table.set_flag('arm', t, tr.arm))
+        return self._looper_states
+
+    def _looper_state_params(self, track, key='looper_state'):
+        """ State (or PARAMS[key]) parameters of the loopers of a Looper track, () when it has no device,
+        a chain without device or a device whose resolved parameter is not the expected one """
+        devices = list(track.devices)
+        if not devices:
+              self.canonical_parent.log_message('looper states : %s has no looper device' % track.name)
+              return ()
+        device = devices[0]
+        loopers = [(list(chain.devices) or [None])[0] for chain in device.chains] if device.can_have_chains else [device]
+        if None in loopers:
+              self.canonical_parent.log_message('looper states : a chain of %s has no looper device' % track.name)
+              return ()
+        try:
+              params = tuple(self.param(looper, key) for looper in loopers)
+        except IndexError:
+              params = ()
+        names = PARAMS[key][0]
+        if not params or any(p.name not in names for p in params):
+              self.canonical_parent.log_message('looper states : %s holds a device without %s parameter' % (track.name, names[0]))
+              return ()
+        return params
+
+    def _watch_looper(self, subject, prop, update):
+        update()
+        self._add_listener(subject, prop, update)
+        self._looper_listeners.append((subject, prop, update))
+
+    def _drop_looper_states(self):
+        for subject, prop, listener in self._looper_listeners:
+              self._remove_listener(subject, prop, listener)
+        self._looper_listeners = []
+        self._looper_states = None
+        self._looper_tracks = ()
+        self._looper_params = ()
+
+
+# ---------- COLOR PAINTER : clip colors written only where they differ from the cached ones --------------
+    def paint_clips(self, clip_colors):
+        """ (clip, ClyphX color number 1-70) pairs. writes color_index only on clips whose current color differs, returns the number of writes """
+        writes = 0
+        for clip, color in clip_colors:
+              key = self._ptr(clip)
+              if key not in self._clip_colors:
+                    self._watch_clip_color(clip, key)
+              if self._clip_colors[key] != color - 1:
+                    clip.color_index = color - 1
+                    self._clip_colors[key] = color - 1
+                    writes += 1
+        return writes
+
+    def paint(self, targets):
+        """ (track, slot indexes, ClyphX color number) : colors the clips of these slots, like 'x/CLIP(1-4) COLOR y' """
+        return self.paint_clips((track.clip_slots[i].clip, color) for track, slot_indexes, color in targets for i in slot_indexes if track.clip_slots[i].has_clip)
+
+    def _watch_clip_color(self, clip, key):
+        def on_color_changed():
+              self._clip_colors[key] = clip.color_index
+        self._clip_colors[key] = clip.color_index
+        self._add_listener(clip, 'color_index', on_color_changed)
+        self._color_listeners.append((clip, on_color_changed))
+
+    def _drop_clip_colors(self):
+        for clip, listener in self._color_listeners:
+              self._remove_listener(clip, 'color_index', listener)
+        self._color_listeners = []
+        self._clip_colors = {}
+
+
+# ---------- ENVELOPE WRITER : automation built offline and written into clip envelopes, no record pass --------------
+    def write_envelopes(self, clip, envelopes):
+        """ {parameter: steps (time, duration, value)} written into the clip envelopes in one batch. envelopes already
+        holding the same steps are skipped. returns the number of envelopes written """
+        writes = 0
+        for param, steps in envelopes.items():
+              steps = tuple((t, d, max(param.min, min(param.max, v))) for t, d, v in steps)
+              key = (self._ptr(clip), self._ptr(param))
+              envelope = clip.automation_envelope(param)
+              if envelope is not None and self._written_envelopes.get(key) == steps:
+                    continue
+              if envelope is not None:
+                    clip.clear_envelope(param)
+              envelope = clip.create_automation_envelope(param)
+              for step in steps:
+                    envelope.insert_step(*step)
+              self._written_envelopes[key] = steps
+              writes += 1
+        return writes
+
+    @takes(Arg('chain', ('a','b','c'), 'a'), Arg('sections', section, many=True))
+    def write_looper_automation(self, action_def, args):
+        """writes looper State automation into the 1st clip of the track, e.g. 'looper_auto a 0:rec 8:play 16:ovd'. replaces the ovd_allinst record pass for prepared sections"""
+        chain, sections = args
+        track = action_def['track']
+        slot = track.clip_slots[0]
+        if not slot.has_clip or not sections:
+              self.canonical_parent.show_message('looper_auto : no clip in slot 1 or no section given')
+              return
+        states = self._looper_state_params(track)
+        idx = 'abc'.index(chain) if states and list(track.devices)[0].can_have_chains else 0
+        if idx >= len(states):
+              self.canonical_parent.show_message('looper_auto : no looper State for %s on %s' % (chain, track.name))
+              return
+        clip = slot.clip
+        written = self.write_envelopes(clip, {states[idx]: section_steps(sections, clip.loop_end)})
+        self.canonical_parent.show_message('looper_auto : %s envelope(s) written' % written)
+
+
+# ---------- CLIP PROVISIONING : clips created, sized and named directly, loop length kept in memory --------------
+    def bpm_slot(self):
+        """ slot of the BPM clip of track 1 : the bpm row if it holds a clip named BPM..., else the first BPM clip. None if there is none """
+        index = self.slot_index(self.song().tracks[0])
+        idx = self.scene_slot('bpm')
+        if index.names.get(idx, '').split(' ')[0] == 'BPM':
+              return idx
+        return index.find("BPM")
+
+    def loop_length(self):
+        """ (measures, beats per measure) of the BPM clip of track 1 ("BPM 2 4"), parsed when its name changes only """
+        if self._loop_length_slot is None:
+              track = self.song().tracks[0]
+              idx = self.bpm_slot()
+              if idx is not None:
+                    self._loop_length_slot = track.clip_slots[idx]
+                    self._add_listener(self._loop_length_slot, 'has_clip', self._drop_loop_length)
+                    self._loop_length_clip = self._loop_length_slot.clip
+                    if self._loop_length_clip is not None:
+                          self._add_listener(self._loop_length_clip, 'name', self._on_loop_length_name)
+                          self._on_loop_length_name()
+        return self._loop_length
+
+    def _on_loop_length_name(self):
+        """ a name that does not parse keeps the last loop length """
+        name_split = self._loop_length_clip.name.split(' ')
+        try:
+              self._loop_length = (int(name_split[1]), int(name_split[2]))
+        except (IndexError, ValueError):
+              self.canonical_parent.log_message('loop length : cannot read "%s"' % self._loop_length_clip.name)
+
+    def bpm_cmd_clip(self):
+        """ (clip, measures, beats) of the bpm_from_loop_new command clip of the bpm track ("[] SEL/bpm_from_loop_new 2 4").
+        None, with a message, when the clip is missing or its name does not end with two numbers """
+        tracks, idx_bpm_ctrl_track = [self.initialize_variables()[i] for i in (0,13)]
+        clip = tracks[idx_bpm_ctrl_track].clip_slots[self.scene_slot('bpm_cmd')].clip
+        name_split = clip.name.split(' ') if clip is not None else []
+        try:
+              return clip, int(name_split[-2]), int(name_split[-1])
+        except (IndexError, ValueError):
+              self.canonical_parent.show_message('no "bpm_from_loop_new <measures> <beats>" clip on the bpm track')
+              return None
+
+    def _drop_loop_length(self):
+        """ also the has_clip listener of the BPM slot : a deleted or re-recorded BPM clip is read again on next use """
+        if self._loop_length_clip is not None:
+              self._remove_listener(self._loop_length_clip, 'name', self._on_loop_length_name)
+        if self._loop_length_slot is not None:
+              self._remove_listener(self._loop_length_slot, 'has_clip', self._drop_loop_length)
+        self._loop_length = None
+        self._loop_length_clip = None
+        self._loop_length_slot = None
+
+    def provision_clips(self, tracks, slot_indexes, length, name=None):
+        """ empty MIDI clips of length beats in slot_indexes of every MIDI track of tracks, replacing what was there.
+        one pass of create_clip, no dispatch. returns the new clips """
+        clips = []
+        for track in tracks:
+              if not track.has_midi_input:
+                    continue
+              for slot_idx in slot_indexes:
+                    slot = track.clip_slots[slot_idx]
+                    if slot.has_clip:
+                          slot.delete_clip()
+                    slot.create_clip(length)
+                    if name is not None:
+                          slot.clip.name = name
+                    clips.append(slot.clip)
+        return clips
+
+
+# ---------- BEAT SCHEDULER : operations landing on a song beat (next bar...) without touching global quantization --------------
+    def at_beat(self, beat, callback, grid=None):
+        """ runs callback() in the tick closest to song beat. runs it now if the transport is stopped.
+        with a grid (in beats), a jump of the playhead moves it to the next line of the grid """
+        if self._scheduler is None: # disconnected
+              return
+        if not self.song().is_playing:
+              callback()
+              return
+        self._scheduler.schedule(beat, callback, grid)
+        if not self._scheduler_running:
+              self._scheduler_running = True
+              self._add_listener(self.song(), 'current_song_time', self._on_song_time)
+              self._scheduler.observe(self.song().current_song_time)
+              self.canonical_parent.schedule_message(1, self._pump_scheduler)
+
+    def at_next_bar(self, callback):
+        """ runs callback() on the next bar line """
+        song = self.song()
+        bar = song.signature_numerator * 4.0 / song.signature_denominator
+        self.at_beat((math.floor(song.current_song_time / bar) + 1) * bar, callback, bar)
+
+    def _on_song_time(self):
+        # notification : no LOM change here, the operations run in _pump_scheduler
+        self._scheduler.observe(self.song().current_song_time)
+
+    def _pump_scheduler(self):
+        if self._scheduler is None: # disconnected
+              return
+        song = self.song()
+        callbacks = self._scheduler.due(song.current_song_time) if song.is_playing else self._scheduler.flush()
+        for callback in callbacks:
+              try:
+                    callback()
+              except Exception as e:
+                    self.canonical_parent.log_message('scheduled operation failed : %r' % e)
+        if len(self._scheduler):
+              self.canonical_parent.schedule_message(1, self._pump_scheduler)
+        else:
+              self._scheduler_running = False
+              self._remove_listener(song, 'current_song_time', self._on_song_time)
+
+    def show_scheduler_stats(self, action_def, _):
+        """ shows how late (ms) scheduled operations fired """
+        m = self._scheduler.metrics
+        ms_per_beat = 60000.0 / self.song().tempo
+        mean = m['late_total'] / m['fired'] if m['fired'] else 0.0
+        self.canonical_parent.show_message('scheduler : %s fired / %s scheduled, mean offset %.1f ms, max late %.1f ms, tick %.1f ms' % (m['fired'], m['scheduled'], mean * ms_per_beat, m['late_max'] * ms_per_beat, self._scheduler.interval * ms_per_beat))
+
+
+# ---------- ARM RINGS : instrument tracks armed exclusively, only the tracks that change are written --------------
+    def _arm_ring(self, key, tracks=()):
+        """ the ArmRing named key, built from tracks the first time. rebuilt after a track list change """
+        if key not in self._arm_rings:
+              self._arm_rings[key] = ArmRing()
+              for track in tracks:
+                    self._add_to_ring(self._arm_rings[key], track)
+        return self._arm_rings[key]
+
+    def _add_to_ring(self, ring, track):
+        position = ring.add(track)
+        listener = lambda: ring.refresh(position)
+        self._add_listener(track, 'arm', listener)
+        self._arm_listeners.append((track, listener))
+        return position
+
+    def _drop_arm_rings(self):
+        for track, listener in self._arm_listeners:
+              self._remove_listener(track, 'arm', listener)
+        self._arm_listeners = []
+        self._arm_rings = {}
+        self._voxkey = None
+
+
+# ---------- SET CONFIG --------------
+    def config(self):
+        """ SetConfig of CONFIG_FILE, reloaded when the file changes. an invalid file keeps the previous config """
+        now = time.time()
+        if self._config is None or now - self._config_checked > CONFIG_CHECK_INTERVAL:
+              self._config_checked = now
+              mtime = os.path.getmtime(CONFIG_FILE) if os.path.isfile(CONFIG_FILE) else None
+              if self._config is None or mtime != self._config_mtime:
+                    self._config_mtime = mtime
+                    try:
+                          self._config = load_config(CONFIG_FILE if mtime is not None else None)
+                    except (ValueError, IOError, OSError) as e:
+                          self.canonical_parent.show_message('set_config.json not loaded : %s' % e)
+                          if self._config is None:
+                                self._config = load_config(None)
+        return self._config
+
+    def export_set_config(self, action_def, _):
+        """ writes DEFAULT_CONFIG to set_config.json, as a starting point to edit. an existing file is left as it is.
+        without the file, the defaults are used from memory """
+        if os.path.isfile(CONFIG_FILE):
+              self.canonical_parent.show_message('export_config : %s already exists' % CONFIG_FILE)
+              return
+        self.run_in_background(export_config, (CONFIG_FILE,), lambda _: self.canonical_parent.show_message('export_config : %s written' % CONFIG_FILE))
+
+
+# ---------- PARAMETER REGISTRY : parameters resolved by name instead of hardcoded indexes --------------
+    def register_device(self, device, refresh=False):
+        """ {parameter name: index} of the device class, introspected the first time (or on refresh) and exported to PARAM_REGISTRY_FILE.
+        an entry loaded from the file is checked against the first live device of its class, and introspected again
+        if the parameters moved (e.g. after a plugin update) """
+        key = device_key(device)
+        if not refresh and key in self._param_registry and key not in self._param_checked:
+              params = device.parameters
+              refresh = any(idx >= len(params) or params[idx].name != name for name, idx in self._param_registry[key].items())
+              if refresh:
+                    self.canonical_parent.log_message('parameters of %s changed, registered again' % key)
+        self._param_checked.add(key)
+        if refresh or key not in self._param_registry:
+              names = {}
+              for idx, param in enumerate(device.parameters):
+                    names.setdefault(param.name, idx)
+              self._param_registry[key] = names
+              self._param_indexes = dict((k, v) for k, v in self._param_indexes.items() if k[0] != key)
+              self._param_snapshots += 1
+              self.run_in_background(export_param_registry, (PARAM_REGISTRY_FILE, dict(self._param_registry), self._param_snapshots), None)
+        return self._param_registry[key]
+
+    def param(self, device, name):
+        """ the parameter PARAMS[name] of the device, by name. the index is resolved once per device class """
+        cache_key = (device_key(device), name)
+        if cache_key not in self._param_indexes:
+              names, fallback_idx = PARAMS[name]
+              registered = self.register_device(device)
+              found = [registered[n] for n in names if n in registered] or sorted(idx for n, idx in registered.items() if any(c in n for c in names))
+              self._param_indexes[cache_key] = found[0] if found else fallback_idx
+        return device.parameters[self._param_indexes[cache_key]]
+
+
+# ---------- DRUM RACK CACHE : samples of drum rack chains read once, refreshed by listeners --------------
+    def _rack_entries(self, rack):
+        """ cached chain infos of a rack, most recently used rack last. a new rack gets listeners on its chains """
+        key = self._ptr(rack)
+        entries = self._rack_cache.pop(key, None)
+        if entries is None:
+              entries = {}
+              self._rack_listeners[key] = []
+              self._rack_watched[key] = set()
+              self._watch_rack(rack, key, 'chains', lambda: self._evict_rack(key))
+        self._rack_cache[key] = entries
+        while len(self._rack_cache) > RACK_CACHE_SIZE:
+              self._evict_rack(next(iter(self._rack_cache)))
+        return entries
+
+    def _watch_rack(self, subject, key, prop, callback):
+        self._add_listener(subject, prop, callback)
+        self._rack_listeners[key].append((subject, prop, callback))
+
+    def _evict_rack(self, key):
+        """ drops a rack from the cache, e.g. when its chains changed or it was unloaded """
+        self._rack_cache.pop(key, None)
+        self._rack_watched.pop(key, None)
+        for subject, prop, callback in self._rack_listeners.pop(key, []):
+              self._remove_listener(subject, prop, callback)
+
+    def chain_sample_info(self, rack, chain_idx, names_beats_midi, live_sample_frames=44100):
+        """ (sample path, frames, sample rate, length in beats at the current tempo, beat bank name) of a drum rack chain.
+        the LOM is only read the first time and after the chain's sample changed. an empty chain or Simpler has no path and 0 frames """
+        entries = self._rack_entries(rack)
+        if chain_idx not in entries:
+              key = self._ptr(rack)
+              chain = rack.chains[chain_idx]
+              simpler = (list(chain.devices) or [None])[0]
+              sample = simpler.sample if simpler is not None else None
+              banks = [name for name in names_beats_midi if name in simpler.name] if simpler is not None else []
+              if sample is None:
+                    entries[chain_idx] = (None, 0, live_sample_frames, banks[0] if banks else '')
+              else:
+                    entries[chain_idx] = (sample.file_path, sample.length, getattr(sample, 'sample_rate', live_sample_frames), banks[0] if banks else '')
+              if chain_idx not in self._rack_watched[key]: # the sample listener only drops the entry, its listeners stay
+                    self._rack_watched[key].add(chain_idx)
+                    self._watch_rack(chain, key, 'devices', lambda: self._evict_rack(key))
+                    if simpler is not None:
+                          self._watch_rack(simpler, key, 'sample', lambda: entries.pop(chain_idx, None))
+        path, frames, rate, bank = entries[chain_idx]
+        return path, frames, rate, frames / float(rate) * float(self.song().tempo) / 60, bank
+
+
+# ---------- TEMPO DETECTION : length based tempo corrected by the tempo found in the recorded audio --------------
+    def _audio_path(self, clip):
+        """ file of an audio clip, None for midi clips or missing files """
+        if clip is not None and clip.is_audio_clip and os.path.isfile(clip.file_path):
+              return clip.file_path
+        return None
+
+    def correct_tempo_from_audio(self, path, length_bpm):
+        """ analyses the audio file in a worker thread. the result is applied on a later tick, if the tempo is still length_bpm.
+        only bpm_from_loop_new calls it, on the REC audio clip : bpm_1bar_clip measures an empty midi clip """
+        if path is None:
+              return
+        def done(result):
+              fingerprint, analysis = result
+              self._tempo_cache[fingerprint] = analysis
+              self._apply_tempo_correction(length_bpm, analysis)
+        self.run_in_background(cached_analysis, (estimate_tempo, path, self._tempo_cache), done)
+
+    def _apply_tempo_correction(self, length_bpm, analysis):
+        detected_bpm, confidence = analysis
+        new_bpm = refine_tempo(length_bpm, detected_bpm, confidence)
+        if abs(self.song().tempo - length_bpm) < 0.01 and new_bpm != length_bpm: # not touched in between
+              self.song().tempo = new_bpm
+              self.canonical_parent.show_message('BPM %.2f corrected to %.2f (audio, confidence %.2f)' % (length_bpm, new_bpm, confidence))
 
 
 # ---------- INITIALIZING FUNCTION : DEF ALL USEFULL VARIABLES --------------
@@ -270,35 +2499,36 @@ class ExampleActions(UserActionsBase):
         """
         tracks=list(self.song().tracks)
         idx_loop_tracks = [i for i in range(len(tracks)) if "Looper" in tracks[i].name]
-        idx_loop_full = [i+1 for i in range(len(idx_loop_tracks)) if list(tracks[idx_loop_tracks[i]].clip_slots)[0].has_clip]
+        idx_loop_full = [i+1 for i in self.looper_states().tracks_with('filled')]
         nb_loop_tracks = len(idx_loop_tracks)
       #   ----- NO MEASURE TRACKS ANYMORE  --------- 
         idx_measure_tracks = []
         idx_measure_tracks_full = []
       #   idx_measure_tracks = [i+nb_loop_tracks for i in idx_loop_tracks] # Assumption of measure tracks after loop tracks !! IT USED TO BE FOR ONLY FULL LOOPS; MIGHT HAVE PROBLEMS ONE DAY
       #   idx_measure_tracks_full = [i+nb_loop_tracks for i in idx_loop_full]
-        routing_clip_name = [slot for slot in list(tracks[0].clip_slots) if slot.has_clip and "routing" in slot.clip.name][0].clip.name
+        track0_index = self.slot_index(tracks[0])
+        routing_clip_name = track0_index.names.get(track0_index.find("routing"), '') # '' when track 1 has no routing clip
       #   routing_clip_name = list(tracks[0].clip_slots)[-4].clip.name # !!!! ATTENTION l'indice de routing clip name peut changer !!!!
         idx_instru_group = [i for i in range(len(tracks)) if "INSTRU" in tracks[i].name][0] # ATTENTION le nom peut changer
         idx_beats_group = [i for i in range(len(tracks)) if "GrpBeet" in tracks[i].name] # ATTENTION le nom peut changer
         if len(idx_beats_group) > 0:
                 idx_beats_group = idx_beats_group[0]
-        if len(idx_beats_group) > 0:
-             idx_instru_tracks = [i for i in range(len(tracks)) if i > idx_instru_group and i < idx_beats_group and tracks[i].is_grouped is True] # ATTENTION la def peut changer
+                idx_instru_tracks = [i for i in range(len(tracks)) if i > idx_instru_group and i < idx_beats_group and tracks[i].is_grouped is True] # ATTENTION la def peut changer
         else:
              idx_instru_tracks = [i for i in range(len(tracks)) if i > idx_instru_group and tracks[i].is_grouped is True] # ATTENTION la def peut changer
         sel_track = self.song().view.selected_track
-        idx_sel_track = tracks.index(sel_track)
+        idx_sel_track = tracks.index(sel_track) if sel_track in tracks else None # None for the master and return tracks
         idx_loops_out_track = [i for i in range(len(tracks)) if "LOOPS_OUT" in tracks[i].name][0]
         idx_bpm_ctrl_track = [i for i in range(len(tracks)) if "bpm" in tracks[i].name][0]
-        live_sample_frames = 44100 # CAN BE CHANGED
-        names_beats_midi = ['beatardeche',"FunkyClyphX","beatrebou","ThugBeat"] # parts of chain simpler names in beats midi drumracks !! NO CAPITAL LETTER IN NAMESBEATS
+        config = self.config()
+        live_sample_frames = config.live_sample_frames # CAN BE CHANGED in set_config.json
+        names_beats_midi = config.names_beats_midi # parts of chain simpler names in beats midi drumracks !! NO CAPITAL LETTER IN NAMESBEATS
         idx_cmdloop_tracks = [i for i in range(len(tracks)) if "CmdLoop" in tracks[i].name]
         idx_recloop_track=[i for i in range(len(tracks)) if "RECLOOP" in tracks[i].name][0]
         idx_dump_group=[i for i in range(len(tracks)) if "DUMP" in tracks[i].name]
         if len(idx_dump_group) > 0:
               idx_dump_group = idx_dump_group[0]
-        instru_names = ["KEYS","BASS","DRUMS","KICKS","SNARES","HATS","PERCS","Fills","Shakers"]
+        instru_names = config.instru_names
 
         return tracks, idx_loop_tracks, idx_loop_full, nb_loop_tracks, idx_measure_tracks, idx_measure_tracks_full, routing_clip_name, idx_instru_group, idx_instru_tracks, sel_track, idx_sel_track, idx_loops_out_track, idx_beats_group, idx_bpm_ctrl_track, live_sample_frames, names_beats_midi, idx_cmdloop_tracks, idx_recloop_track, idx_dump_group, instru_names
 # ----------- END OF INITIALIZING FUNCTION ---------------------
@@ -307,15 +2537,17 @@ class ExampleActions(UserActionsBase):
 # [] "all_Inst"/SEL ; "all_Inst"/ARM ON; color_sel_looper 0 ; "bass","druminst","VOIX","RECLOOP"/ARM OFF ; BIND ROLL_1 "all_Inst"/DEV(1) B1 P1 ; "VoxKey"/MON OFF ; BIND ROLL_1 "all_Inst"/DEV(1) B1 P1
 
 
+    @debounced('drop') # leading edge : a press just before a bar line must not be held past it
+    @takes(Arg('looper', ('a','b','c')))
     def switch_abc(self, action_def, args): 
         self.canonical_parent.show_message('coucou' ) 
         tracks, idx_loop_tracks = [self.initialize_variables()[i] for i in (0,1)] 
         track = action_def['track']
         actiontrack_idx = tracks.index(track) 
         self.canonical_parent.show_message('track : %s' % actiontrack_idx ) 
-        args_list = ['a','b','c']
-        copyclips_list = [8,11,14] # idx of the possible first clip to be copied, depending on arg --- !!!! CAN BE CHANGED !!!! ---
-        idx_copyclip = copyclips_list[args_list.index(args)] # effective idx of the first clip to be copied
+        looper, = args
+        idx_copyclip = self.scene_slot('rec_' + looper, self.config().copyclips[looper] - 1) + 1 # effective idx of the first clip to be copied : scene #rec_a/b/c, else copyclips of set_config.json
+        abc = self.scene_slot('abc') # the 3 rows switched, the first one holds the rec clip
       #   self.canonical_parent.show_message('idx copyclip : %s' % type(idx_copyclip) ) 
       #   for i in range(len(idx_loop_tracks)):
       #       self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/COPYCLIP %s ; %s/PASTECLIP 3' % (int(idx_loop_tracks[i]+1),int(idx_copyclip),int(idx_loop_tracks[i]+1)))
@@ -323,7 +2555,10 @@ class ExampleActions(UserActionsBase):
       #       self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/COPYCLIP %s ; %s/PASTECLIP 5' % (int(idx_loop_tracks[i]+1),int(idx_copyclip+2),int(idx_loop_tracks[i]+1)))
        
         # check what the current active looper is   -------------------------- !!!!! CLIP NAMES MIGHT CHANGE !!!!! -----------
-        former_rec_clip_name = list(track.clip_slots)[2].clip.name # ---------- !!!! Might Change !!!!
+        if not track.clip_slots[abc].has_clip:
+              self.canonical_parent.show_message('switch_abc : no rec clip in slot %s of %s' % (abc+1, track.name))
+              return
+        former_rec_clip_name = track.clip_slots[abc].clip.name
         self.canonical_parent.show_message('rec clip: %s' % former_rec_clip_name ) 
         former_active_looper = ''
         if 'recABC' in former_rec_clip_name:
@@ -334,80 +2569,59 @@ class ExampleActions(UserActionsBase):
               former_active_looper = 'C'
         self.canonical_parent.show_message('former active looper: %s' % former_active_looper ) 
         # Look for the clips to copy paste and copy paste them 
-        self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/COPYCLIP %s ; %s/PASTECLIP 3' % (int(actiontrack_idx+1),int(idx_copyclip),int(actiontrack_idx+1)))
-        self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/COPYCLIP %s ; %s/PASTECLIP 4' % (int(actiontrack_idx+1),int(idx_copyclip+1),int(actiontrack_idx+1)))
-        self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/COPYCLIP %s ; %s/PASTECLIP 5' % (int(actiontrack_idx+1),int(idx_copyclip+2),int(actiontrack_idx+1)))
+        for i in range(3):
+              self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/COPYCLIP %s ; %s/PASTECLIP %s' % (int(actiontrack_idx+1),int(idx_copyclip+i),int(actiontrack_idx+1),int(abc+1+i)))
         # According to current state of looper, switch to new ABC looper with automation ==> Check if all loopers ABC are stopped, and if not, an action will be made. 
         # state parameter values : 0 stop, 1 rec, 2 play, 3 ovd
-        ABC_loopers = list(list(track.devices)[0].chains)
-        self.canonical_parent.show_message('ABClooper: %s' % ABC_loopers ) 
-      #   A_looper_state = []
-      #   for i in range(len(list(list(ABC_loopers[0].devices)[0].parameters))):
-      #         A_looper_state.append(list(list(ABC_loopers[0].devices)[0].parameters)[i].name)
-        A_looper_state = list(list(ABC_loopers[0].devices)[0].parameters)[1].value # 0 stop, 1 rec, 2 play, 3 ovd
-        self.canonical_parent.show_message('A state : %s' % A_looper_state ) 
-        ABC_loopers_states = []
-        for i in range(len(ABC_loopers)):
-              ABC_loopers_states.append(list(list(ABC_loopers[i].devices)[0].parameters)[1].value)
-        self.canonical_parent.show_message('ABC states : %s' % ABC_loopers_states) 
-        if any(ABC_loopers_states) != 0: # we check that the looper is not stopped, so that at least one ABC value is different than 0
+        # the looper table holds the ABC states of the Looper tracks, read without LOM access
+        loopers = self.looper_states()
+        if track not in self._looper_tracks:
+              self.canonical_parent.show_message('switch_abc : %s is not a Looper track' % track.name)
+              return
+        t = self._looper_tracks.index(track)
+        states = self._looper_params[t]
+        if not states:
+              self.canonical_parent.show_message('switch_abc : %s has no looper device' % track.name)
+              return
+        ABC_loopers_states = loopers.states(t)
+        self.canonical_parent.show_message('ABC states : %s' % (ABC_loopers_states,)) 
+        if loopers.active_chain(t) is not None: # we check that the looper is not stopped, so that at least one ABC value is different than 0
               self.canonical_parent.show_message('looper not fully stopped') 
-              # Lots of conditions for each case
-              if former_active_looper == 'A' and args == 'b':
-                    list(list(ABC_loopers[0].devices)[0].parameters)[1].value = 0
-                    list(list(ABC_loopers[1].devices)[0].parameters)[1].value = 2
-                    list(list(ABC_loopers[2].devices)[0].parameters)[1].value = 0
-              elif former_active_looper == 'A' and args == 'c':
-                    list(list(ABC_loopers[0].devices)[0].parameters)[1].value = 0
-                    list(list(ABC_loopers[1].devices)[0].parameters)[1].value = 0
-                    list(list(ABC_loopers[2].devices)[0].parameters)[1].value = 2
-              elif former_active_looper == 'B' and args == 'a':
-                    list(list(ABC_loopers[0].devices)[0].parameters)[1].value = 2
-                    list(list(ABC_loopers[1].devices)[0].parameters)[1].value = 0
-                    list(list(ABC_loopers[2].devices)[0].parameters)[1].value = 0
-              elif former_active_looper == 'B' and args == 'c':
-                    list(list(ABC_loopers[0].devices)[0].parameters)[1].value = 0
-                    list(list(ABC_loopers[1].devices)[0].parameters)[1].value = 0
-                    list(list(ABC_loopers[2].devices)[0].parameters)[1].value = 2
-              elif former_active_looper == 'C' and args == 'a':
-                    list(list(ABC_loopers[0].devices)[0].parameters)[1].value = 2
-                    list(list(ABC_loopers[1].devices)[0].parameters)[1].value = 0
-                    list(list(ABC_loopers[2].devices)[0].parameters)[1].value = 0
-              elif former_active_looper == 'C' and args == 'b':
-                    list(list(ABC_loopers[0].devices)[0].parameters)[1].value = 0
-                    list(list(ABC_loopers[1].devices)[0].parameters)[1].value = 2
-                    list(list(ABC_loopers[2].devices)[0].parameters)[1].value = 0
+              # the new looper plays, the others stop. all three states are written together on the next bar
+              if former_active_looper and former_active_looper != looper.upper():
+                    new_states = [2 if 'abc'[i] == looper else 0 for i in range(3)]
+                    def write_states():
+                          for state, value in zip(states, new_states):
+                                state.value = value
+                    self.at_next_bar(write_states)
         
 
 
 
+    @takes(Arg('instrument'))
     def select_instrument(self, action_def, args): # should add the bind ROLL_1 function ??
-        """ sets the routing for a newly selected instrument track """
-        tracks, instru_names = [self.initialize_variables()[i] for i in (0,19)]
-        self.canonical_parent.show_message('coucou2') 
-        self.canonical_parent.show_message('track names 0 : %s' % type(tracks[0].name)) 
-        idx_instru_tracks=[]
-        for j in range(len(instru_names)):
-              idx = [i for i in range(len(tracks)) if instru_names[j] in tracks[i].name]
-              idx_instru_tracks.append(idx)
-        self.canonical_parent.show_message('idx instru : %s' % idx_instru_tracks ) 
-        sel_inst = args
-        idx_sel_inst = [i for i in range(len(tracks)) if sel_inst.lower() == tracks[i].name.lower()][0]
-        idx_sel_inst_txt = str(idx_sel_inst+1)
-        self.canonical_parent.show_message('%s' % idx_sel_inst_txt) 
-        idx_other_inst = [i for i in range(len(tracks)) if sel_inst.lower() != tracks[i].name.lower() and tracks[i].name in instru_names ]
-        self.canonical_parent.show_message('other inst %s' % idx_other_inst) 
-        idx_other_inst_txt = ''
-        for i in range(len(idx_other_inst)):
-              idx_other_inst_txt += str(idx_other_inst[i]+1) + ','
-        idx_other_inst_txt = idx_other_inst_txt[:-1]
-        self.canonical_parent.show_message('other inst txt %s' % idx_other_inst_txt) 
-        self.canonical_parent.clyphx_pro_component.trigger_action_list(idx_sel_inst_txt+'/SEL;'+idx_sel_inst_txt+'/ARM ON; color_sel_looper 0;'+idx_other_inst_txt+'/ARM OFF')
-        if args.lower() == "inputMidi".lower():
-              self.canonical_parent.clyphx_pro_component.trigger_action_list('"VoxKey"/MON IN')
-        else:
-              self.canonical_parent.clyphx_pro_component.trigger_action_list('"VoxKey"/MON OFF')
-        self.canonical_parent.show_message('yheeee') 
+        """ selects and arms the instrument track named in args, disarms the other instruments. only the tracks whose arm / monitoring changes are written """
+        name, = args
+        if 'select' not in self._arm_rings:
+              tracks, instru_names = [self.initialize_variables()[i] for i in (0,19)]
+              self._arm_ring('select', [t for t in tracks if t.name in instru_names and t.can_be_armed])
+              self._voxkey = ([t for t in tracks if t.name == "VoxKey"] or [None])[0]
+        ring = self._arm_rings['select']
+        position = ring.positions.get(name.lower())
+        if position is None:
+              matches = [t for t in self.song().tracks if t.name.lower() == name.lower() and t.can_be_armed]
+              if not matches:
+                    self.canonical_parent.show_message('no instrument track named %s' % name)
+                    return
+              position = self._add_to_ring(ring, matches[0])
+        track = ring.tracks[position]
+        ring.select(position)
+        if self.song().view.selected_track != track:
+              self.song().view.selected_track = track
+        self.color_looper_cmd_track({'track': track}, '0')
+        monitoring = 0 if name.lower() == "inputMidi".lower() else 2 # 0 In, 2 Off
+        if self._voxkey is not None and self._voxkey.current_monitoring_state != monitoring:
+              self._voxkey.current_monitoring_state = monitoring
 
 
 
@@ -419,30 +2633,26 @@ class ExampleActions(UserActionsBase):
       #   chains = list(list(action_track.devices)[0].chains)
       #   self.canonical_parent.show_message('chains : %s' % chains) 
 
+    @takes(Arg('looper', ('A','B','C'), None), Arg('mix', ('vol','pan'), many=True))
     def rec_abc_loopers(self, action_def, args):
         """ changes the looper rack chain for A, B or C """
         self.canonical_parent.show_message('coucou2') 
+        looper, mix = args
         track = action_def['track']
         master = self.song().master_track
-        if not args or 'vol' in args:
+        if not (looper or mix) or 'vol' in mix:
             track.mixer_device.volume.value = master.mixer_device.volume.value
-        if not args or 'pan' in args:
+        if not (looper or mix) or 'pan' in mix:
             track.mixer_device.panning.value = master.mixer_device.panning.value
         all_tracks = self.initialize_variables()[0]
         action_track = action_def['track']   
         actiontrack_idx = list(self.song().tracks).index(action_def['track']) 
-        if 'A' in args or not args:
-                    chains = list(list(action_track.devices)[0].chains)
-        elif 'B' in args:
-                    chains = list(list(action_track.devices)[0].chains)[1:] #marche pas
-        elif 'C' in args:
-                    chains = list(list(action_track.devices)[0].chains)[2:] #marche pas
-      #   chains = list(list(action_track.devices)[0].chains)
-        self.canonical_parent.show_message('chains : %s' % chains)  
-        for i in range(len(chains)):
-              params = list(list(chains[i].devices)[0].parameters)
-              params_names=[param.name for param in params]
-              state = [param for param in params if "State" in param.name][0]
+        states = self._looper_state_params(action_track)[{'B': 1, 'C': 2}.get(looper, 0):]
+        if not states:
+              self.canonical_parent.show_message('no looper State for %s on %s' % (looper or 'A', action_track.name))
+              return
+        self.canonical_parent.show_message('chains : %s' % len(states))  
+        for state in states:
               if state.value == 1:
                    state.value = 2 #play if already recording
               else:
@@ -452,58 +2662,56 @@ class ExampleActions(UserActionsBase):
       
       
 
+    @takes(Arg('qtz', int, bounds=(0,13)))
     def set_global_quantization(self, action_def, args): # A TESTER
-      self.song().clip_trigger_quantization = int(args)
+      self.song().clip_trigger_quantization, = args
       self.canonical_parent.show_message('global qtz : %s' % self.song().clip_trigger_quantization)  
 
+    @takes(Arg('beats', int), Arg('state', ('on','off'), None))
     def quantize_or_not_loopers(self, action_def, args): # A TESTER
-        """quantizes or unquantizes looper devices in all chains of all looper tracks Note : qtz is loopers 7th parameter (so 6th index here)"""
+        """quantizes or unquantizes looper devices in all chains of all looper tracks"""
         tracks, idx_loop_tracks = [self.initialize_variables()[i] for i in (0,1)]
-        args_split = args.split(' ')
-        nb_beats_qtz = int(args_split[0])
-        possible_args = [1,2,4]
-        possible_looper_qtz_idx = [8,6,5]
+        nb_beats_qtz, state = args
+        config = self.config()
         for idx in idx_loop_tracks:
-              chains = list(list(tracks[idx].devices)[0].chains)
-              parameters = list(list(chains[0].devices)[0].parameters)
-              value_1bar = 5
-              value_none = 1
-              self.canonical_parent.show_message('chains : %s' % chains) 
+              params = self._looper_state_params(tracks[idx], 'looper_qtz')
+              if not params:
+                    continue
+              qtz = params[0]
+              value_1bar = config.looper_qtz_1bar
+              value_none = config.looper_qtz_none
               param_names = []
-              if len(args_split) == 1:
-                    if parameters[6].value == value_none:
-                          if args in possible_args:
-                                looper_qtz_idx = [i for i in possible_args if possible_args[i] == args] # DOESN WORK FOR NOW
-                                parameters[6].value = possible_looper_qtz_idx[looper_qtz_idx]
+              if state is None:
+                    if qtz.value == value_none:
+                          if nb_beats_qtz in config.looper_qtz:
+                                qtz.value = config.looper_qtz[nb_beats_qtz]
                           else:
-                                parameters[6].value = value_1bar
-                    elif parameters[6].value != value_none:
-                          parameters[6].value = value_none
-              elif len(args_split) == 2:
-                    if args_split[1] == 'on':
-                          parameters[6].value = value_1bar
-                    elif args_split[1] == 'off':
-                          parameters[6].value = value_none
-                    else:
-                          self.canonical_parent.show_message('error, only on or off accepted as second arg') 
-              qtz_state = parameters[6].value
+                                qtz.value = value_1bar
+                    elif qtz.value != value_none:
+                          qtz.value = value_none
+              elif state == 'on':
+                    qtz.value = value_1bar
+              else:
+                    qtz.value = value_none
+              qtz_state = qtz.value
               self.canonical_parent.show_message('params : %s' % param_names) 
               self.canonical_parent.show_message('qtz : %s' % qtz_state) 
-            #   self.canonical_parent.show_message('len args split : %s' % len(args_split)) 
 
+    @takes(Arg('looper', ('A','B','C')))
     def adjust_loopersrec_ABC(self, action_def, args): # A TESTER
         """pastes right rec clip for rec scenes 8-15 in looper tracks"""
-        self.canonical_parent.show_message('pouet00') 
-        tracks, idx_loop_tracks, idx_bpm_ctrl_track = [self.initialize_variables()[i] for i in (0,1,13)]
-        self.canonical_parent.show_message('pouet0') 
         action_track = action_def['track']   
         actiontrack_idx = list(self.song().tracks).index(action_def['track']) 
-        self.canonical_parent.show_message('beats + args : %s' % str("beats "+args)) 
-        goodslots_idx = [idx for idx in range(len(list(action_track.clip_slots))) if list(action_track.clip_slots)[idx].has_clip and args.upper() == list(action_track.clip_slots)[idx].clip.name.split(' ')[-1] and idx > 20] # condition idx > 20 to be sure we dont count the active rec buttons
-        self.canonical_parent.show_message('args : .%s. goodslots %s' % (args,goodslots_idx))
+        looper, = args
+        self.canonical_parent.show_message('beats + args : %s' % str("beats "+looper)) 
+        slot_index = self.slot_index(action_track)
+        rec_bank = self.scene_slot('rec_bank') # rec clips are banked from there, so that the active rec buttons are not counted
+        goodslots_idx = sorted(idx for idx in slot_index.words.get(looper, ()) if idx >= rec_bank and slot_index.names[idx].split(' ')[-1] == looper)
+        self.canonical_parent.show_message('args : .%s. goodslots %s' % (looper,goodslots_idx))
       #   self.canonical_parent.show_message('sc 25 last word %s' % list(action_track.clip_slots)[25].clip.name.split(' ')) 
-        for i in range(len(goodslots_idx)):
-              self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/COPYCLIP %s ; %s/PASTECLIP %s' % (int(actiontrack_idx+1), int(goodslots_idx[i]+1), int(actiontrack_idx+1), int(i+8))) # rec clips start at scene 8
+        rec_paste = self.scene_slot('rec_paste')
+        if goodslots_idx:
+              self.canonical_parent.clyphx_pro_component.trigger_action_list(' ; '.join('%s/COPYCLIP %s ; %s/PASTECLIP %s' % (int(actiontrack_idx+1), int(idx+1), int(actiontrack_idx+1), int(rec_paste+1+i)) for i, idx in enumerate(goodslots_idx)))
 
 
     def stop_all_loopers(self, action_def, _): 
@@ -536,29 +2744,33 @@ class ExampleActions(UserActionsBase):
               self.canonical_parent.clyphx_pro_component.trigger_action_list('"REC","OUTPUTMASTER"/ARM OFF')
               self.song().session_record = True
         elif self.song().session_record == True:
-              self.canonical_parent.clyphx_pro_component.trigger_action_list('reset_routing_new')
+              self.reset_routing_new(action_def, '')
               self.song().session_record = False
         self.canonical_parent.show_message('ovd_status new : %s' % self.song().session_record) 
       
 
 
-    def create_clip_from_bpm_arg(self, action_def, _): 
-        """launches first clip (rec) of the selected track if it is a looper track"""
-        all_tracks = self.initialize_variables()[0]
+    @takes(Arg('slots', int, bounds=(1,999), many=True))
+    def create_clip_from_bpm_arg(self, action_def, args): 
+        """replaces the clip(s) of the track (1st slot, or the slots given in args) by an empty clip as long as the loop measures of the BPM clip"""
         action_track = action_def['track']   
-        actiontrack_idx = list(self.song().tracks).index(action_def['track']) 
-        self.canonical_parent.show_message('action track idx : %s' % actiontrack_idx) 
-        bpm_clip = list(all_tracks[0].clip_slots)[-4].clip
-        bpmclip_name_split = bpm_clip.name.split(' ')
-        meas_arg = bpmclip_name_split[1]
-      #   beat_arg = int(bpmclip_name_split[2])
-        self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/CLIP(1) DEL' % (int(actiontrack_idx+1)))
-        self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/ADDCLIP 1 %s' % (int(actiontrack_idx+1),meas_arg))
-        list(action_track.clip_slots)[0].clip.name = meas_arg + ' bars clip'
+        song = self.song()
+        loop_length = self.loop_length()
+        if loop_length is None:
+              self.canonical_parent.show_message('create_clip_from_bpm_arg : no "BPM <measures> <beats>" clip on track 1')
+              return
+        meas_arg = loop_length[0]
+        bar = song.signature_numerator * 4.0 / song.signature_denominator
+        slot_indexes = [i-1 for i in args[0] or (1,) if i <= len(action_track.clip_slots)]
+        if not slot_indexes:
+              self.canonical_parent.show_message('create_clip_from_bpm_arg : %s has %s slots' % (action_track.name, len(action_track.clip_slots)))
+              return
+        self.provision_clips([action_track], slot_indexes, meas_arg * bar, '%s bars clip' % meas_arg)
         self.canonical_parent.show_message('meas : %s ' % meas_arg) 
 
 
 
+    @debounced('drop')
     def rec_sel_looper(self, action_def, _): 
         """launches first clip (rec) of the selected track if it is a looper track""" 
         sel_track, idx_sel_track = [self.initialize_variables()[i] for i in (9,10)]
@@ -568,131 +2780,113 @@ class ExampleActions(UserActionsBase):
               self.canonical_parent.show_message('wrong track selected')
 
 
+    @takes(Arg('dim', default=None))
     def color_looper_cmd_track(self, action_def, args): 
         """colorizes in bright the command track corresponding to the selected looper""" 
         self.canonical_parent.show_message('coucou3')
       #   tracks, idx_cmdloop_tracks = [self.initialize_variables()[i] for i in (0,16)]
-        tracks=list(self.song().tracks)
         action_track = action_def['track']
-        actiontrack_idx = list(self.song().tracks).index(action_def['track']) 
-        idx_LP_tracks=[i for i in range(len(tracks)) if "LP" in tracks[i].name]
-        for i in range(len(idx_LP_tracks)):
-              self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/CLIP(1-4) COLOR 2' % int(idx_LP_tracks[i]+1))
-        if "LP" in action_track.name and len(args) == 0:
-              self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/CLIP(1-4) COLOR 32' % int(actiontrack_idx+1))
-              self.canonical_parent.show_message('coucoucoucou')
+        dim, = args
+        highlighted = action_track if "LP" in action_track.name and dim is None else None
+        self.paint([(track, range(4), 32 if track == highlighted else 2) for track in self.song().tracks if "LP" in track.name])
 
 
     def switch_DLobuttons_clear_undo(self, action_def, _): 
         """activates clear, clear_all, undo, or undo_all buttons from DLo Max Device. plus 3d mode to use x2 and :2 functions of looper""" # MARCHE SI DLO CLIPS IN LP1 AND LP2 TRACKS
-        self.canonical_parent.show_message('coucou3')
-        tracks=list(self.song().tracks)
-        idx_LP_tracks=[i for i in range(len(tracks)) if "LP" in tracks[i].name]
-        for i in (0,1):
-              LPtrack = tracks[idx_LP_tracks[i]]
-              LPslots = list(LPtrack.clip_slots)
-              self.canonical_parent.show_message('len LPslots %s' % len(LPslots))
-              idx_dloclips = [j for j in range(len(LPslots)) if LPslots[j].has_clip and bool("[clear" in LPslots[j].clip.name or "[undo" in LPslots[j].clip.name or "[x2" in LPslots[j].clip.name or "[:2" in LPslots[j].clip.name)][0]
-              self.canonical_parent.show_message('iddx dlos %s' % idx_dloclips)
-              string_inbrackets = (LPslots[idx_dloclips].clip.name.split("[")[1]).split("]")[0]
-              self.canonical_parent.show_message('string brackets %s' % string_inbrackets)
-              if "[clear" in LPslots[idx_dloclips].clip.name:
-                    LPslots[idx_dloclips].clip.name = LPslots[idx_dloclips].clip.name.replace("clear","undo")
-                    self.canonical_parent.clyphx_pro_component.trigger_action_list('"LP1","LP2"/CLIP(%s) COLOR 40' % int(idx_dloclips+1))
-              elif "[undo" in LPslots[idx_dloclips].clip.name:
-                    LPslots[idx_dloclips].clip.name = LPslots[idx_dloclips].clip.name.replace("LP1","LP2")
-                    if i == 0:
-                          LPslots[idx_dloclips].clip.name = LPslots[idx_dloclips].clip.name.replace(string_inbrackets,":2",1)
-                          LPslots[idx_dloclips].clip.name = LPslots[idx_dloclips].clip.name.replace(string_inbrackets,"clear")
-                    elif i == 1:
-                          LPslots[idx_dloclips].clip.name = LPslots[idx_dloclips].clip.name.replace(string_inbrackets,"x2",1)
-                          LPslots[idx_dloclips].clip.name = LPslots[idx_dloclips].clip.name.replace(string_inbrackets,"undo")
-                    self.canonical_parent.clyphx_pro_component.trigger_action_list('"LP1","LP2"/CLIP(%s) COLOR 20' % int(idx_dloclips+1))
-              elif "[x2" in LPslots[idx_dloclips].clip.name or "[:2" in LPslots[idx_dloclips].clip.name:
-                    if i == 0:
-                          LPslots[idx_dloclips].clip.name = LPslots[idx_dloclips].clip.name.replace(string_inbrackets,"clear")
-                          LPslots[idx_dloclips].clip.name = LPslots[idx_dloclips].clip.name.replace("undo","clear")
-                    elif i == 1:
-                          LPslots[idx_dloclips].clip.name = LPslots[idx_dloclips].clip.name.replace(string_inbrackets,"clear_all")
-                          LPslots[idx_dloclips].clip.name = LPslots[idx_dloclips].clip.name.replace("undo","clear_all")
-                    LPslots[idx_dloclips].clip.name = LPslots[idx_dloclips].clip.name.replace("LP2","LP1")
-                    self.canonical_parent.clyphx_pro_component.trigger_action_list('"LP1","LP2"/CLIP(%s) COLOR 2' % int(idx_dloclips+1))
-
+        if self._dlo_buttons is None:
+              tracks=list(self.song().tracks)
+              idx_LP_tracks=[i for i in range(len(tracks)) if "LP" in tracks[i].name]
+              buttons = []
+              for i in range(min(2, len(idx_LP_tracks))):
+                    LPslots = list(tracks[idx_LP_tracks[i]].clip_slots)
+                    idx_dloclips = [j for j in range(len(LPslots)) if LPslots[j].has_clip and bool("[clear" in LPslots[j].clip.name or "[undo" in LPslots[j].clip.name or "[x2" in LPslots[j].clip.name or "[:2" in LPslots[j].clip.name)]
+                    if idx_dloclips:
+                          clip = LPslots[idx_dloclips[0]].clip
+                          buttons.append((idx_LP_tracks[i], idx_dloclips[0], clip, DLoButton(clip.name, i)))
+              if len(buttons) < 2:
+                    self.canonical_parent.show_message('switch_DLobuttons_clear_undo : needs a DLo clip in LP1 and LP2 tracks')
+                    return
+              self._dlo_buttons = tuple(buttons)
+              self._dlo_state = buttons[0][3].state
+        # ------- one transition of the table : one name write and at most one color write per clip --------
+        next_state = DLO_STATES[self._dlo_state][0]
+        color = DLO_STATES[next_state][1]
+        for idx_track, idx_slot, clip, button in self._dlo_buttons:
+              clip.name = button.render(next_state)
+        self.paint_clips((clip, color) for idx_track, idx_slot, clip, button in self._dlo_buttons)
+        self._dlo_state = next_state
+
+    @takes(Arg('button', ('clear','clear_all','undo','undo_all')))
     def activate_DLo_buttons(self, action_def, args): 
         """activates clear, clear_all, undo, or undo_all buttons from DLo Max Device"""
         action_track = action_def['track']
-        actiontrack_idx = list(self.song().tracks).index(action_def['track']) 
+        button, = args
         devices = list(action_track.devices)
-        param_nb = 0
-        if len(args) == 0:
-              self.canonical_parent.show_message('args problem')
-        if args == 'clear':
-              param_nb = 1
-        elif args == 'clear_all':
-              param_nb = 2
-        elif args == 'undo':
-              param_nb = 6
-        elif args == 'undo_all':
-              param_nb = 7
-        else:
-              self.canonical_parent.show_message('args problem')
-        self.canonical_parent.show_message('coucou3')
-        dlo_dev = devices[0]
-      #   dlo_dev.parameters[param_nb].name
-        self.canonical_parent.show_message('type args : %s' % type(args))
-        self.canonical_parent.show_message(dlo_dev.parameters[param_nb].name)
-        self.canonical_parent.show_message('param value : %s' % dlo_dev.parameters[param_nb].value)
-        dlo_dev.parameters[param_nb].value = True
+        try:
+              param = self.param(devices[0], 'dlo_' + button) if devices else None
+        except IndexError:
+              param = None
+        if param is None or param.name != button:
+              self.canonical_parent.show_message('activate_DLo_buttons : no DLo %s button on %s' % (button, action_track.name))
+              return
+        param.value = True
 
 
 
+    @takes(Arg('device', int, bounds=(0,127)))
     def tell_param_names(self, action_def, args): 
         """bla"""
         action_track = action_def['track']
         actiontrack_idx = list(self.song().tracks).index(action_def['track']) 
         devices = list(action_track.devices)
-        idx_device = int(args)
+        idx_device, = args
+        if idx_device >= len(devices):
+              self.canonical_parent.show_message('tell_param_names : %s has %s device(s)' % (action_track.name, len(devices)))
+              return
         interest_device = devices[idx_device]
-        text_names = ''
-        for i in range(len(interest_device.parameters)):
-              text_names += ('P%s : %s / ' % (int(i+1), interest_device.parameters[i].name))
+        names = self.register_device(interest_device, refresh=True) # re-introspects and exports the device to the registry file
+        text_names = ' / '.join('P%s : %s' % (idx+1, name) for name, idx in sorted(names.items(), key=lambda item: item[1]))
         self.canonical_parent.show_message(text_names)
       #   self.canonical_parent.show_message('%s' % interest_device.parameters[1].is_quantized)
 
 
     def qtzornot_loopers2(self, action_def, _): 
         """switches between quantized or not quantized clips"""
-        tracks, idx_cmdloop_tracks = [self.initialize_variables()[i] for i in (0,16)]
-        clip_name = "" 
-        for i in range(len(idx_cmdloop_tracks)):
-            for j in range(4):
-                    idx_track = int(idx_cmdloop_tracks[i]) 
-                    clip_name = str(list(tracks[idx_track].clip_slots)[j].clip.name)
-                    self.canonical_parent.show_message('track %s, clip %s, name %s' % (int(idx_track+1),int(j+1),clip_name))
-
-                    if "QTZ" in clip_name and "OVD" not in clip_name:
-                        #  and "OVD" not in clip_name
-                          clip_name = clip_name.replace("/PLAYQ 1 BAR","/PLAY")
-                          clip_name = clip_name.replace("QTZ","")
-                          self.canonical_parent.show_message('%s' % clip_name)
-                          self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/CLIP(%s) NAME "%s"' % (int(idx_track+1),int(j+1),clip_name))
-                    elif "QTZ" not in clip_name and "OVD" not in clip_name:
-                          clip_name = clip_name.replace("/PLAY","/PLAYQ 1 BAR")
-                          clip_name = clip_name.replace("]","QTZ]")
-                          self.canonical_parent.show_message('%s' % clip_name)
-                          self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/CLIP(%s) NAME "%s"' % (int(idx_track+1),int(j+1),clip_name))
-                        #   self.canonical_parent.clyphx_pro_component.trigger_action_list('')
-            #   self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/CLIP(%s) NAME "%s"' % (int(idx_track+1),int(j+1),clip_name))
-            #   self.canonical_parent.show_message('%s' % clip_name)
+        self._cmd_clip_templates()
+        self._cmd_qtz = not self._cmd_qtz
+        self.render_cmd_clips()
+        self.canonical_parent.show_message('CmdLoop clips quantized : %s' % self._cmd_qtz)
    
 
-    def duplicate_and_transpose(self, action_def, _): 
+    @takes(Arg('intervals', int, bounds=(-48,48), many=True))
+    def duplicate_and_transpose(self, action_def, args): 
+        """copies the 1st RECLOOP clip below itself, one slot per interval (semitones, 1 to 11 by default). MIDI notes are read once and written shifted, audio clips get pitch_coarse. slots already holding the right transposition are left as they are"""
         tracks, idx_recloop_track = [self.initialize_variables()[i] for i in (0,17)] 
-        self.canonical_parent.show_message('8 new beats pasted' )
-        for i in range(11):
-            self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/COPYCLIP 1' % int(idx_recloop_track+1))
-            self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/PASTECLIP %s' % (int(idx_recloop_track+1),int(i+2)))
-            self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/CLIP(%s) SEMI %s' % (int(idx_recloop_track+1),int(i+2),int(i+1)))
+        intervals = args[0] or TRANSPOSE_INTERVALS
+        slots = tracks[idx_recloop_track].clip_slots
+        if not slots[0].has_clip or len(intervals) >= len(slots):
+              self.canonical_parent.show_message('RECLOOP : no clip to transpose or not enough slots')
+              return
+        source = slots[0].clip
+        notes = clip_notes(source) if source.is_midi_clip else None
+        written = 0
+        for slot_idx, interval in enumerate(intervals, 1):
+              slot = slots[slot_idx]
+              target = slot.clip if slot.has_clip else None
+              if notes is not None:
+                    shifted = transposed_notes(notes, interval)
+                    if target is not None and target.is_midi_clip and target.length == source.length and tuple(sorted(clip_notes(target))) == shifted:
+                          continue
+                    slots[0].duplicate_clip_to(slot)
+                    slot.clip.select_all_notes()
+                    slot.clip.replace_selected_notes(shifted)
+              else:
+                    if target is not None and target.is_audio_clip and target.file_path == source.file_path and target.length == source.length and target.pitch_coarse == source.pitch_coarse + interval:
+                          continue
+                    slots[0].duplicate_clip_to(slot)
+                    slot.clip.pitch_coarse = max(-48, min(48, source.pitch_coarse + interval))
+              written += 1
+        self.canonical_parent.show_message('%s transposed clips written, %s already in place' % (written, len(intervals) - written))
 
 
     def new_beats_from_dump(self, action_def, _): 
@@ -702,9 +2896,13 @@ class ExampleActions(UserActionsBase):
         # ---------- CAREFULL: DUMP INFO CLIP MUST BE IN SAME TRACK AS THE CURRENT USER ACTION CLIP -----------
         track = action_def['track']   
         track_idx = list(self.song().tracks).index(action_def['track']) 
-        track_clipslots = list(track.clip_slots)
-        idx_dmpinfo = [i for i in range(len(track_clipslots)) if track_clipslots[i].has_clip and "DMPINFO" in track_clipslots[i].clip.name][0]
-        dmpinfo_name = track_clipslots[idx_dmpinfo].clip.name
+        track_clipslots = track.clip_slots
+        track_index = self.slot_index(track)
+        idx_dmpinfo = track_index.find("DMPINFO")
+        if idx_dmpinfo is None:
+              self.canonical_parent.show_message('new_beats_from_dump : no DMPINFO clip on %s' % track.name)
+              return
+        dmpinfo_name = track_index.names[idx_dmpinfo]
         dmpinfo_split = dmpinfo_name.split(' ')
         dmpinfo_split_last = int(dmpinfo_split[-1])
         idx_scenes_dump = [i+(dmpinfo_split_last-1)*8 for i in range(8)]
@@ -712,6 +2910,8 @@ class ExampleActions(UserActionsBase):
         # --------- copy and paste clips from dump to effective beatgroup ---------
         idx_copy = [idx_dumpgroup+1, idx_dumpgroup+2, idx_dumpgroup+3, idx_dumpgroup+4, idx_dumpgroup+5]
         idx_paste = [idx_beats_group+1, idx_beats_group+2, idx_beats_group+3, idx_beats_group+4, idx_beats_group+5]
+        records = [record for idx in idx_paste for record in self.journal_slots(idx, range(len(idx_scenes_dump)))]
+        self._journal.record('new_beats_fromdump', records + [['name', self._track_ref(track_idx), idx_dmpinfo, dmpinfo_name]])
         for i in range(len(idx_copy)):
               for j in range(len(idx_scenes_dump)):
                     self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/COPYCLIP %s' % (int(idx_copy[i]+1),int(idx_scenes_dump[j]+1)))
@@ -743,28 +2943,28 @@ class ExampleActions(UserActionsBase):
               self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/COPYCLIP 10 ; %s/PASTECLIP 9 ; %s/COPYCLIP 1 ; %s/PASTECLIP 10 ; %s/COPYCLIP 9 ; %s/PASTECLIP 1' % (idx,idx,idx,idx,idx,idx))
    
 
+    @debounced('drop')
     def play_recloop(self, action_def, _): # A TESTER. NEED TO SET IT AS A CLIP ACTION
         """plays first recloop clip and stops loopers if it is the second time this function is used"""
       #   clip = action_def['clip']
-        tracks, idx_loop_tracks, idx_recloop_track, idx_bpm_ctrl_track = [self.initialize_variables()[i] for i in (0,1,17,13)]
+        tracks, idx_loop_tracks, idx_recloop_track = [self.initialize_variables()[i] for i in (0,1,17)]
         str_loopertracks_idx=str([i+1 for i in idx_loop_tracks])[1:-1]
         recloop_track = tracks[idx_recloop_track]
-        recloop_slots=list(recloop_track.clip_slots)
         idx_mpd_track = [i for i in range(len(tracks)) if "MPD" == tracks[i].name][0]
         mpd_track = tracks[idx_mpd_track]
         self.canonical_parent.show_message('mpd track %s' % mpd_track)
-        mpd_slots= list(mpd_track.clip_slots)
-        self.canonical_parent.show_message(' len mpd_slots %s' % len(mpd_slots))
-        idx_action_clip = [i for i in range(len(mpd_slots)) if mpd_slots[i].has_clip and "recloop_playSync" in mpd_slots[i].clip.name][0]
+        idx_action_clip = self.slot_index(mpd_track).find("recloop_playSync")
         self.canonical_parent.show_message('idx_action_clip %s' % idx_action_clip)
-        init_clip_name = list(tracks[idx_bpm_ctrl_track].clip_slots)[7].clip.name
-        list_bpm_arg=init_clip_name.split(' ')
-        beat_arg=int(list_bpm_arg[-1])
-        meas_arg=int(list_bpm_arg[-2])
+        bpm_cmd = self.bpm_cmd_clip()
+        if bpm_cmd is None:
+              return
+        meas_arg, beat_arg = bpm_cmd[1:]
         self.canonical_parent.show_message('beat arg %s' % beat_arg)
-        if recloop_slots[0].has_clip:
+        if recloop_track.clip_slots[0].has_clip:
                self.canonical_parent.clyphx_pro_component.trigger_action_list('[] %s/PLAY 1 ; %s/PLAY 5' % (int(idx_recloop_track+1),str_loopertracks_idx))
                self.canonical_parent.clyphx_pro_component.trigger_action_list('[] %s/ARM OFF' % (int(idx_recloop_track+1)))     
+        elif idx_action_clip is None:
+              self.canonical_parent.show_message('play_recloop : no recloop_playSync clip on %s' % mpd_track.name)
         else:
               self.canonical_parent.clyphx_pro_component.trigger_action_list('[] %s/CLIP(%s) LOOP END %s.1.1' % (int(idx_mpd_track+1),int(idx_action_clip+1),int(meas_arg+1)))
               self.canonical_parent.show_message('idx recloop track %s' % idx_recloop_track)
@@ -773,40 +2973,33 @@ class ExampleActions(UserActionsBase):
     
     def switch_rec_free_sync(self, action_def, _): # A TESTER
         """switches cmd clyphx command from free looper rec to sync rec"""
-        tracks, idx_cmdloop_tracks = [self.initialize_variables()[i] for i in (0,16)]
-        info_rec_clip = list(tracks[0].clip_slots)[18].clip
+        tracks = list(self.song().tracks)
+        info_rec_clip = tracks[0].clip_slots[self.scene_slot('info_rec')].clip
+        if info_rec_clip is None:
+              self.canonical_parent.show_message('switch_rec_free_sync : no info rec clip on track 1')
+              return
         info_rec = info_rec_clip.name.split(" ")[-1]
         self.canonical_parent.show_message('info rec : %s' % info_rec)
-        if info_rec == "Sync" :
-              for i in range(len(idx_cmdloop_tracks)):
-                    new_recclip_name = '[Rec] ' + str(int(idx_cmdloop_tracks[i]+1-5)) + '/DEV("Looper") "State" 1'
-                    self.canonical_parent.show_message('new name : %s' % new_recclip_name)
-                    cmdtrack = tracks[idx_cmdloop_tracks[i]]
-                    self.canonical_parent.show_message('old name : %s' % list(cmdtrack.clip_slots)[1].clip.name)
-                    list(cmdtrack.clip_slots)[0].clip.name = new_recclip_name
-              info_rec_clip.name = ' '.join(info_rec_clip.name.split(" ")[:-1]) + " Free"
-        elif info_rec == "Free" :
-              self.canonical_parent.show_message('kikou')
-              for i in range(len(idx_cmdloop_tracks)):
-                    new_recclip_name = '[Rec] ' + str(int(idx_cmdloop_tracks[i]+1-5)) + '/PLAY 2'
-                    cmdtrack = tracks[idx_cmdloop_tracks[i]]
-                    list(cmdtrack.clip_slots)[0].clip.name = new_recclip_name
-              info_rec_clip.name = ' '.join(info_rec_clip.name.split(" ")[:-1]) + " Sync" 
-
-
+        if info_rec not in ("Sync", "Free"):
+              self.canonical_parent.show_message('switch_rec_free_sync : info rec clip must end with Sync or Free, not %s' % info_rec)
+              return
+        self._cmd_rec_mode = "Free" if info_rec == "Sync" else "Sync"
+        self.render_cmd_clips()
+        info_rec_clip.name = ' '.join(info_rec_clip.name.split(" ")[:-1]) + " " + self._cmd_rec_mode
 
 
        
         
 
+    @takes(Arg('mode', int, bounds=(1,2)))
     def adjust_length_loopclips_new(self, action_def, args): # A TESTER
         """chooses the right rec clip with the right automation looper enveloppe"""
-        tracks, idx_loop_tracks, idx_bpm_ctrl_track = [self.initialize_variables()[i] for i in (0,1,13)]
+        tracks, idx_loop_tracks = [self.initialize_variables()[i] for i in (0,1)]
       #   idx_loop_tracks = [1,2,3,4] # EN DUR ATTENTION
-        init_clip_name = list(tracks[idx_bpm_ctrl_track].clip_slots)[7].clip.name
-        list_bpm_arg=init_clip_name.split(' ')
-        beat_arg=list_bpm_arg[-1]
-        meas_arg=list_bpm_arg[-2]
+        bpm_cmd = self.bpm_cmd_clip()
+        if bpm_cmd is None:
+              return
+        meas_arg, beat_arg = [str(n) for n in bpm_cmd[1:]]
         total_beats_asked = str(int(beat_arg)*int(meas_arg))
         all_clip_names = []
         all_names_dico={}
@@ -815,28 +3008,29 @@ class ExampleActions(UserActionsBase):
         good_track_idx = 0
         good_slot_idx = 0
         str_loopertracks_idx=str([i+1 for i in idx_loop_tracks])[1:-1]
+        rec_lengths = self.scene_slot('rec_lengths')
         for i in range(len(idx_loop_tracks)):
             # --- read and find got rec name ---
               idx = idx_loop_tracks[i]
               track_loop = tracks[idx]
-              clipslots = list(track_loop.clip_slots)
             #   self.canonical_parent.show_message('coucou')
             #   self.canonical_parent.show_message('goodname2 %s' % good_name_2)
             #   idx_goodslot = [i for i in range(len(clipslots)) if clipslots[i].has_clip and bool(clipslots[i].clip.name == good_name_1 or clipslots[i].clip.name == good_name_2)][0]
             #   self.canonical_parent.show_message('idx goodslot %s' % idx_goodslot)
               # --- paste clip in right place ---
             #   self.canonical_parent.clyphx_pro_component.trigger_action_list('[] %s/COPYCLIP %s ; %s/PASTECLIP 2' % (int(idx+1),int(idx_goodslot+1),int(idx+1)))
-              for slot_idx in list(range(len(clipslots)))[5:]: #we use only clipslots below the 6th row
-                    if clipslots[slot_idx].has_clip:
-                          all_clip_names.append(clipslots[slot_idx].clip.name)
-                          all_names_dico.update({(idx,slot_idx):clipslots[slot_idx].clip.name})
+              for slot_idx, name in sorted(self.slot_index(track_loop).names.items()):
+                    if slot_idx >= rec_lengths: # we use only the clips below the rec_lengths row
+                          all_clip_names.append(name)
+                          all_names_dico.update({(idx,slot_idx):name})
       #   idx_goodslotagain = [i for i in range(len(all_clip_names)) if all_clip_names[i] == good_name_1 or all_clip_names[i] == good_name_2][0]
         for position, name in all_names_dico.items():  # for name, age in dictionary.iteritems():  (for Python 2.x)
               if good_name_2 in name:
                     good_track_idx,good_slot_idx=position
-        if args == '1':
+        mode, = args
+        if mode == 1:
               self.canonical_parent.clyphx_pro_component.trigger_action_list('[] %s/COPYCLIP %s ; %s/PASTECLIP 2' % (int(good_track_idx+1),int(good_slot_idx+1),str_loopertracks_idx))
-        elif args == '2':
+        elif mode == 2:
               self.canonical_parent.show_message('args 2, goodtrack %s,goodslot %s ' % (good_track_idx,good_slot_idx))
               for idx in idx_loop_tracks:
                     self.canonical_parent.clyphx_pro_component.trigger_action_list('[] %s/COPYCLIP %s ; %s/PASTECLIP 2' % (int(idx+1),int(good_slot_idx+1),int(idx+1))) 
@@ -863,18 +3057,19 @@ class ExampleActions(UserActionsBase):
 
 
              
+    @takes()
     def adjust_length_loopclips(self, action_def, args):
         """like auto adjust binklooper but with multilooper config"""
-        tracks, idx_bpm_ctrl_track, idx_cmdloop_tracks = [self.initialize_variables()[i] for i in (0,13,16)]
-        init_clip_name = list(tracks[idx_bpm_ctrl_track].clip_slots)[7].clip.name
-        list_bpm_arg=init_clip_name.split(' ')
-        beat_arg=int(list_bpm_arg[-1])
-        meas_arg=int(list_bpm_arg[-2])
+        tracks, idx_cmdloop_tracks = [self.initialize_variables()[i] for i in (0,16)]
+        bpm_cmd = self.bpm_cmd_clip()
+        if bpm_cmd is None:
+              return
+        meas_arg, beat_arg = bpm_cmd[1:]
         self.canonical_parent.show_message('idx cmdlooptracks %s' % idx_cmdloop_tracks)
         for i in range(len(idx_cmdloop_tracks)):
               idx = idx_cmdloop_tracks[i]
               track_cmd = tracks[idx]
-              clip_cmd = list(track_cmd.clip_slots)[0].clip
+              clip_cmd = track_cmd.clip_slots[0].clip
               new_length = beat_arg*meas_arg
               #   new_length = 32
               #   clip_cmd.start_marker = 0
@@ -889,6 +3084,7 @@ class ExampleActions(UserActionsBase):
 
 
 
+    @takes(Arg('beat', default=''))
     def switch_beatmidi(self, action_def, args):
         """all beats / fills / SC are loaded in big drmrcks. this function transposes midi notes to trigger new beat groups in the drum racks. beat base name can be specified in args"""
         tracks, names_beats_midi = [self.initialize_variables()[i] for i in (0,15)]
@@ -900,16 +3096,19 @@ class ExampleActions(UserActionsBase):
         track_SCmidi = tracks[idx_track_SCsmidi]
         all_tracks_midi = [track_beatsmidi,track_fillsmidi,track_SCmidi]
         all_idx_midi=[idx_track_beatsmidi,idx_track_fillsmidi,idx_track_SCsmidi]
-        self.canonical_parent.show_message('names beatsmidi : %s' % names_beats_midi)
+        self.canonical_parent.show_message('names beatsmidi : %s' % (names_beats_midi,))
          # --------------- find current beat base name ----------- AJOUTER TESTS ARGS
-        beatsmidi_slots=list(track_beatsmidi.clip_slots)
-        self.canonical_parent.show_message('beatsmidislot : %s ' % (beatsmidi_slots))
-        currentbeat_slot = [beatsmidi_slots[i] for i in range(len(beatsmidi_slots)) if beatsmidi_slots[i].has_clip and "CurrentBeat" in beatsmidi_slots[i].clip.name][0] # "CurrentBeat" in beatsmidi_slots[i].clip.name]
+        currentbeat_slot = track_beatsmidi.clip_slots[self.slot_index(track_beatsmidi).find("CurrentBeat")]
         self.canonical_parent.show_message('currentbeatslot : %s ' % (currentbeat_slot))
         current_beat_name=currentbeat_slot.clip.name.split(' : ')[1]
         self.canonical_parent.show_message('current_beat_name : %s ' % (current_beat_name))
         idx_currentbeat = [i for i in range(len(names_beats_midi)) if current_beat_name in names_beats_midi[i]][0]
-        idx_argsbeat = [i for i in range(len(names_beats_midi)) if args in names_beats_midi[i]][0]
+        beat, = args
+        matches = [i for i in range(len(names_beats_midi)) if beat in names_beats_midi[i]]
+        if not matches:
+              self.canonical_parent.show_message('switch_beatmidi : no beat named %s in %s' % (beat, names_beats_midi))
+              return
+        idx_argsbeat = matches[0]
         # ---------------- get samples names --------------
         for j in range(len(all_tracks_midi)):
               # --------------- find first occurence of base name in samples names -----------
@@ -918,8 +3117,6 @@ class ExampleActions(UserActionsBase):
               idx_drumrack = [z for z in range(len(devices)) if devices[z].can_have_drum_pads][0]
               idx_pitchdev = [z for z in range(len(devices)) if "Pitch" in devices[z].name][0]
               drmrck=devices[idx_drumrack]
-              chains=list(drmrck.chains)
-              self.canonical_parent.show_message(' drmrck chain device : %s ' % (list(chains[0].devices)[0]))
               # ----------- For Later : instead of increasing pitch by 4 all the time, might adapt to number of samples in each beat ---------
             #   chains_with_currentbeat=[]
             #   for i in range(len(chains)):
@@ -931,20 +3128,18 @@ class ExampleActions(UserActionsBase):
             #               chains_with_currentbeat.append(chains[i]) # If no device on chain, still count it to increase the pitch of midi note
             #   self.canonical_parent.show_message('len chainswithcurrentbeat : %s ' % len(chains_with_currentbeat))
               # --------------- transpose midi notes according to first occurence position -------------
-              param_pitch = devices[idx_pitchdev].parameters
-              param_pitch_names=[param_pitch[z].name for z in range(len(param_pitch))]
-              idx_param_pitch_pitch = [z for z in range(len(param_pitch)) if "Pitch" in param_pitch[z].name][0]
-              if args and args in names_beats_midi:
-                    param_pitch[idx_param_pitch_pitch].value += (idx_argsbeat-idx_currentbeat)*4
+              pitch_param = self.param(devices[idx_pitchdev], 'pitch')
+              if beat and beat in names_beats_midi:
+                    pitch_param.value += (idx_argsbeat-idx_currentbeat)*4
               else:
                     if idx_currentbeat < len(names_beats_midi)-1:
-                        #   param_pitch[idx_param_pitch_pitch].value += len(chains_with_currentbeat) # Complex version
-                          param_pitch[idx_param_pitch_pitch].value += 4
+                        #   pitch_param.value += len(chains_with_currentbeat) # Complex version
+                          pitch_param.value += 4
                     else:
-                          param_pitch[idx_param_pitch_pitch].value = 0
-              self.canonical_parent.show_message('param pitch %s' % param_pitch[idx_param_pitch_pitch].value)
+                          pitch_param.value = 0
+              self.canonical_parent.show_message('param pitch %s' % pitch_param.value)
         # --------------- Over write CurrentBeat name --------------
-        if args and args in names_beats_midi:
+        if beat and beat in names_beats_midi:
                     currentbeat_slot.clip.name=currentbeat_slot.clip.name.split(' : ')[0] + ' : ' + names_beats_midi[idx_argsbeat]
         else:
               if idx_currentbeat < len(names_beats_midi)-1:
@@ -954,12 +3149,12 @@ class ExampleActions(UserActionsBase):
         # --------- NEED ADJUST CLIP MIDI ACCORDING TO THE NOTE + PITCH ADDED
 
         # ------------- Tests -----------
-        if not args :
+        if not beat :
               self.canonical_parent.show_message('no args' )
-        elif args and args not in names_beats_midi:
-              self.canonical_parent.show_message('args : %s not in names beats midi' % args )
+        elif beat and beat not in names_beats_midi:
+              self.canonical_parent.show_message('args : %s not in names beats midi' % beat )
         else:
-              self.canonical_parent.show_message('args : %s' % args )
+              self.canonical_parent.show_message('args : %s' % beat )
       #   self.canonical_parent.show_message('idx args : %s idx current : %s' % (idx_argsbeat,idx_currentbeat) )
       #   self.canonical_parent.show_message('idx current beat : %s ' % idx_currentbeat)
       #   self.canonical_parent.show_message('idxdrumrack : %s idxpitch : %s ' % (idx_drumrack, idx_pitchdev))
@@ -970,7 +3165,7 @@ class ExampleActions(UserActionsBase):
       
     def adjust_length_beatmidi(self, action_def, _):
         """sets length of midi clip according to length of corresponding sample in the beat drum rack and in the fill drum rack"""
-        tracks, idx_beats_group, live_sample_frames = [self.initialize_variables()[i] for i in (0,12, 14)]
+        tracks, idx_beats_group, live_sample_frames, names_beats_midi = [self.initialize_variables()[i] for i in (0,12,14,15)]
         idx_track_beatsmidi = [i for i in range(len(tracks)) if "beatsMidi" in tracks[i].name][0]
         track_beatsmidi = tracks[idx_track_beatsmidi]
         idx_track_fillsmidi = [i for i in range(len(tracks)) if "fillsMidi" in tracks[i].name][0]
@@ -986,19 +3181,17 @@ class ExampleActions(UserActionsBase):
               devices = list(all_tracks_midi[j].devices)
             #   self.canonical_parent.show_message('midi beat devices : %s ' % (devices))
               drmrck=devices[1] # first device is pitch, then comes rack
-              chains=list(drmrck.chains)
-              pitch=list(devices[0].parameters)[1].value
+              pitch=self.param(devices[0], 'pitch').value
             #   self.canonical_parent.show_message('pitch param type %s' % (pitch) )
             #   self.canonical_parent.show_message(' drmrck chains : %s ' % (len(chains)))
               len_samples=[]
-              cheat_lengths = [4,8,16,24,32,48,64] # CHEAT TO BE CHANGED
+              cheat_lengths = self.config().cheat_lengths # CHEAT TO BE CHANGED
               namestest=[]
               iter_list = [z+int(pitch) for z in range(0,4)]# simple version : we work on 4 by 4 drum pads
             #   for i in range(len(chains)):
               for i in iter_list: # simple version : we work on 4 by 4 drum pads
-                    raw_len = list(chains[i].devices)[0].sample.length # unit Frames
-                    namestest.append(list(chains[i].devices)[0].name)
-                    converted_len = raw_len / float(live_sample_frames)*float(self.song().tempo)/60 
+                    path, raw_len, rate, converted_len, bank = self.chain_sample_info(drmrck, i, names_beats_midi, live_sample_frames) # from memory unless the chain changed
+                    namestest.append(bank)
                     # ======= BIG BIG CHEAT HERE ==========
                     converted_len = min(cheat_lengths, key=lambda x: abs(x-converted_len))
                   # ===================================
@@ -1024,7 +3217,8 @@ class ExampleActions(UserActionsBase):
                     self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/CLIP(%s) LOOP RESET' % (int(all_idx_midi[j]+1), int(i+1)))
                     self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/CLIP(%s) LOOP END %s' % (int(all_idx_midi[j]+1), int(i+1),len_samples[i]))
                     # ---------- assumption : drum rack pads start at C1 = number 36 -----------
-                    clipslots[i].clip.set_notes(((int(36+i),0,clipslots[i].clip.length,100,False),))
+                    if clipslots[i].has_clip:
+                          clipslots[i].clip.set_notes(((int(36+i),0,clipslots[i].clip.length,100,False),))
               self.canonical_parent.show_message('finito. len_samples %s ' % (len_samples))
 
                
@@ -1032,13 +3226,17 @@ class ExampleActions(UserActionsBase):
                   
 
        
+    @debounced('drop')
     def set_bpm_from_1bar_clip(self, action_def, _):
         """1 click : rec empty midi clip. 2nd click : stops rec, set bpm from midi clip length (1 bar)"""
         tracks, idx_bpm_ctrl_track = [self.initialize_variables()[i] for i in (0,13)]
         track_bpm = tracks[idx_bpm_ctrl_track]
-        bpm_slots = list(track_bpm.clip_slots)
+        bpm_slots = track_bpm.clip_slots
        # --------- find dummy slot and test if clip already existing or not ----------
-        idx_cmd_1bar_slot=[i for i in range(len(bpm_slots)) if bpm_slots[i].has_clip and "bpm_1bar_clip" in bpm_slots[i].clip.name][0]
+        idx_cmd_1bar_slot = self.slot_index(track_bpm).find("bpm_1bar_clip")
+        if idx_cmd_1bar_slot is None or idx_cmd_1bar_slot+1 >= len(bpm_slots):
+              self.canonical_parent.show_message('set_bpm_from_1bar_clip : no bpm_1bar_clip clip with a free slot below on %s' % track_bpm.name)
+              return
         idx_dummy_slot = idx_cmd_1bar_slot+1
         dummy_slot = bpm_slots[idx_dummy_slot] # the dummy slot to be created, measured and deleted is just under the command slot
         if dummy_slot.has_clip :
@@ -1061,89 +3259,48 @@ class ExampleActions(UserActionsBase):
 
         
 
-    def set_tinypad_configuration(self, action_def, arg):
-        """as transport buttons are not supported for button binding in clyphx, this function changes the name of xclips with transport button functions depending on argument"""
-        tracks=list(self.song().tracks)
-        idx_tiny_transport_track = [i for i in range(len(tracks)) if "TinyTransports" in tracks[i].name ][0] # Carefull of not changing name of track
-        tiny_transport_track=tracks[idx_tiny_transport_track]
-        idx_tiny_notes_track=[i for i in range(len(tracks)) if "TinyNotes" in tracks[i].name ][0] # Carefull of not changing name of track
-        tiny_notes_track=tracks[idx_tiny_notes_track]
-        if arg == "0" :
-            tiny_transport_track.clip_slots[0].clip.name="[] 1/CLIP(1) DEL"
-            tiny_transport_track.clip_slots[1].clip.name='[] "Beats"/SEL'
-            tiny_transport_track.clip_slots[2].clip.name="[] navigate_clips"
-            tiny_transport_track.clip_slots[3].clip.name='[] (PSEQ) "Voix"/ARM ON ; "Voix"/ARM OFF'
-            tiny_transport_track.clip_slots[4].clip.name='[] "piano"/SEL ; "piano"/plugin_preset_change'
-            tiny_transport_track.clip_slots[5].clip.name="[] switch_armed_instru"
-            # ----
-            tiny_notes_track.clip_slots[0].clip.name="[] inc_bpm_from_loop_arg 1"
-            tiny_notes_track.clip_slots[1].clip.name="[] dec_bpm_from_loop_arg 1"
-            tiny_notes_track.clip_slots[2].clip.name="[] inc_bpm_from_loop_arg 2"
-            tiny_notes_track.clip_slots[3].clip.name="[] dec_bpm_from_loop_arg 2"
-            tiny_notes_track.clip_slots[4].clip.name="[] inc_binklooper_beats"
-            tiny_notes_track.clip_slots[5].clip.name="[] dec_binklooper_beats"
-            tiny_notes_track.clip_slots[6].clip.name='[] "piano"/PLAY 7'
-            tiny_notes_track.clip_slots[7].clip.name="[] autoset_binklooper_beats"
-            tiny_notes_track.clip_slots[8].clip.name="[] SEL/send_beat_to_main_scene"
-            tiny_notes_track.clip_slots[9].clip.name="[] (PSEQ) bind_instru ; bind_global ; bind_specific"
-            tiny_notes_track.clip_slots[10].clip.name="[routing0] initial_routing"
-            tiny_notes_track.clip_slots[11].clip.name="[routing1] loopers_to_rec"
-           
-
-        elif arg == "1":
-            tiny_transport_track.clip_slots[0].clip.name='[] "INSTRU"/DEV("Looper") "State" "Overdub"'
-            tiny_transport_track.clip_slots[1].clip.name='[] "INSTRU"/DEV("Looper") "Speed" < 21'
-            tiny_transport_track.clip_slots[2].clip.name='[] "INSTRU"/DEV("Looper") "Speed" > 21'
-            tiny_transport_track.clip_slots[3].clip.name='[] "INSTRU"/DEV("Looper") "State" "Record"'
-            tiny_transport_track.clip_slots[4].clip.name='[] "INSTRU"/DEV("Looper") "State" "Stop"'
-            tiny_transport_track.clip_slots[5].clip.name='[] "INSTRU"/DEV("Looper") "State" "Play"'
-            # ----
-            tiny_notes_track.clip_slots[0].clip.name="[] 2/play_or_stop"
-            tiny_notes_track.clip_slots[1].clip.name="[] 2/stop_loop; 2/CLIP(1) DEL"
-            tiny_notes_track.clip_slots[2].clip.name="[] 3/play_or_stop"
-            tiny_notes_track.clip_slots[3].clip.name="[] 3/stop_loop; 3/CLIP(1) DEL"
-            tiny_notes_track.clip_slots[4].clip.name="[] 4/play_or_stop"
-            tiny_notes_track.clip_slots[5].clip.name="[] 4/stop_loop; 4/CLIP(1) DEL"
-            tiny_notes_track.clip_slots[6].clip.name="[] 5/play_or_stop"
-            tiny_notes_track.clip_slots[7].clip.name="[] 5/stop_loop; 5/CLIP(1) DEL"
-
-            # tiny_notes_track.clip_slots[4].clip.name="[] inc_binklooper_beats"
-            # tiny_notes_track.clip_slots[5].clip.name="[] dec_binklooper_beats"
-            # tiny_notes_track.clip_slots[6].clip.name='[] "REC"/tosimp'
-            # tiny_notes_track.clip_slots[7].clip.name="[] autoset_binklooper_beats"
-            # tiny_notes_track.clip_slots[8].clip.name="[] SEL/send_beat_to_main_scene"
-            # tiny_notes_track.clip_slots[9].clip.name="[] (PSEQ) bind_instru ; bind_global ; bind_specific"
-            # tiny_notes_track.clip_slots[10].clip.name="[routing0] initial_routing"
-            # tiny_notes_track.clip_slots[11].clip.name="[routing1] loopers_to_rec"
-           
-
-      #   elif arg == "2":
-      #       tiny_transport_track.clip_slots[0].clip.name='[] "INSTRU"/DEV("Looper") "State" "Overdub"'
-      #       tiny_transport_track.clip_slots[0].clip.name="[] 1/CLIP(1) DEL"
-      #       tiny_transport_track.clip_slots[1].clip.name="[] navigate_tracks"
-      #       tiny_transport_track.clip_slots[2].clip.name="[] navigate_clips"
-      #       tiny_transport_track.clip_slots[3].clip.name='[] "INSTRU"/DEV("Looper") "State" "Record"'
-      #       tiny_transport_track.clip_slots[4].clip.name='[] "INSTRU"/DEV("Looper") "State" "Stop"'
-      #       tiny_transport_track.clip_slots[5].clip.name='[] "INSTRU"/DEV("Looper") "State" "Play"'
-
-        self.canonical_parent.show_message('tiny name %s' % tiny_transport_track.clip_slots[0].clip.name ) 
+    @takes(Arg('page', tinypad_page))
+    def set_tinypad_configuration(self, action_def, args):
+        """as transport buttons are not supported for button binding in clyphx, this function changes the name of xclips with transport button functions depending on argument.
+        arg is the page number in TINYPAD_LAYOUTS, or next / prev. only the names that differ from the page are written"""
+        page, = args
+        if page in ("next", "prev"):
+              page = (self._tinypad_page + (1 if page == "next" else -1)) % len(TINYPAD_PAGES)
+        role_tracks = {}
+        for track in self.song().tracks:
+              for role, track_name in TINYPAD_TRACKS.items():
+                    if track_name in track.name and role not in role_tracks:
+                          role_tracks[role] = track
+        missing = [TINYPAD_TRACKS[role] for role in TINYPAD_TRACKS if role not in role_tracks]
+        if missing:
+              self.canonical_parent.show_message('tiny config : no %s track' % ', '.join(sorted(missing)))
+              return
+        nb_written = 0
+        for role, slots in TINYPAD_PAGES[page]:
+              clip_slots = role_tracks[role].clip_slots
+              for slot, name in slots:
+                    clip = clip_slots[slot].clip
+                    if clip is not None and clip.name != name:
+                          clip.name = name
+                          nb_written += 1
+        self._tinypad_page = page
+        self.canonical_parent.show_message('tiny page %s : %s names changed' % (page, nb_written)) 
     
     def switch_armed_instru(self, action_def, _):
-        """arm the instrument track next to that already armed, disarms all other"""
-        tracks, idx_instru_group, idx_instru_tracks = [self.initialize_variables()[i] for i in (0,7,8)]
-        idx_armed_instru = [idx_instru_tracks[i] for i in range(len(idx_instru_tracks)) if tracks[idx_instru_tracks[i]].arm]
-        self.canonical_parent.show_message('idx instru armed : %s' % idx_armed_instru) 
-        # Disarm current armed instru track and arms the next instru track (or arms the 1st instru track if the current armed track is the last instru)
-        tracks[idx_armed_instru[0]].arm = False
-        if idx_armed_instru[0]+1 <= max(idx_instru_tracks) and tracks[idx_armed_instru[0]+1].name is not "voix": # TO BE CHANGED
-              tracks[idx_armed_instru[0]+1].arm = True
-        else:
-              tracks[idx_instru_tracks[0]].arm = True
+        """arm the instrument track next to that already armed, disarms all other (back to the 1st instru track after the last one)"""
+        if 'instru' not in self._arm_rings:
+              tracks, idx_instru_tracks = [self.initialize_variables()[i] for i in (0,8)]
+              self._arm_ring('instru', [tracks[i] for i in idx_instru_tracks if tracks[i].name != "voix" and tracks[i].can_be_armed])
+        ring = self._arm_rings['instru']
+        if ring.tracks:
+              ring.select(ring.next_position())
+              self.canonical_parent.show_message('armed : %s' % ring.tracks[ring.cursor].name)
 
 
     def reset_instru_tracks(self, action_def, _):
         """deleted all tracks from INSTRU group excepted piano and bass track"""
         tracks, idx_instru_group, idx_instru_tracks = [self.initialize_variables()[i] for i in (0,7,8)]
+        self._journal.record('reset_instru', self.journal_tracks([idx_instru_tracks[-1-i] for i in range(len(idx_instru_tracks)-2)]) + self.journal_arms(('piano', 'basse')))
         for i in range(len(idx_instru_tracks)-2):
               self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/DEL' % int(idx_instru_tracks[-1-i]+1) )
         self.canonical_parent.clyphx_pro_component.trigger_action_list('"piano"/ARM ON')
@@ -1158,20 +3315,26 @@ class ExampleActions(UserActionsBase):
       #   name_muting_clip=list(tracks[0].clip_slots)[-2].clip.name
       #------------------- Conditions for Muting Loopers -------------
       # -------------- initial routing. Muting False -----------------
+        mute = None
+        if not name_routing_clip:
+              self.canonical_parent.show_message('no routing clip on track 1')
+              return
         if name_routing_clip[-1] == "0": 
               self.canonical_parent.show_message('routing 0. no mute') 
-              for i in range(len(idx_loop_tracks)):
-                    tracks[idx_loop_tracks[i]].mute=False 
+              mute = False
       # ----------------- Loopers to rec. Si Clip Rec vide : muting false. Si Clip Rec plein : muting True -----------------
         elif name_routing_clip[-1] == "1":
-              if list(tracks[0].clip_slots)[0].has_clip is False:
+              if tracks[0].clip_slots[0].has_clip is False:
                     self.canonical_parent.show_message('routing 1 empty clip. no mute') 
-                    for i in range(len(idx_loop_tracks)):
-                          tracks[idx_loop_tracks[i]].mute=False 
-              elif list(tracks[0].clip_slots)[0].has_clip is True:
+                    mute = False
+              elif tracks[0].clip_slots[0].has_clip is True:
                     self.canonical_parent.show_message('routing 1 full clip. mute') 
-                    for i in range(len(idx_loop_tracks)):
-                          tracks[idx_loop_tracks[i]].mute=True 
+                    mute = True
+        if mute is not None: # only the looper tracks whose mute differs are written
+              muted = self.looper_states().tracks_with('mute')
+              for t, track in enumerate(self._looper_tracks):
+                    if (t in muted) != mute:
+                          track.mute = mute
       # ---------- Play Rec clip ------------
         self.canonical_parent.clyphx_pro_component.trigger_action_list('1/PLAY 1')
       
@@ -1179,18 +3342,16 @@ class ExampleActions(UserActionsBase):
     def reset_looper_tracks(self, action_def, _):
         """clear loop clips"""
         tracks, idx_loop_tracks, idx_measure_tracks = [self.initialize_variables()[i] for i in (0,1,4)]
+        self._journal.record('reset_loopers', [record for idx in idx_loop_tracks for record in self.journal_slots(idx, [0])])
         for i in range(len(idx_loop_tracks)):
               self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/CLIP(1) DEL' % int(idx_loop_tracks[i]+1) )
-              self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/STOP' % int(idx_measure_tracks[i]+1) )
+              if i < len(idx_measure_tracks): # no measure tracks anymore
+                    self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/STOP' % int(idx_measure_tracks[i]+1) )
 
 
     def reset_session(self, action_def, _):
-        """No loop, no rec, MON in """
-        self.canonical_parent.clyphx_pro_component.trigger_action_list('1/CLIP(1) DEL' )
-        self.canonical_parent.clyphx_pro_component.trigger_action_list('reset_loopers' )
-        self.canonical_parent.clyphx_pro_component.trigger_action_list('reset_instru' )
-        self.canonical_parent.clyphx_pro_component.trigger_action_list('initial_routing' )
-        self.canonical_parent.clyphx_pro_component.trigger_action_list('bind_instru' )
+        """No loop, no rec, MON in. steps in the reset_session macro of set_config.json """
+        self.run_macro('reset_session', action_def)
 
 
     def route_rec_into_loopers(self, action_def, _): # Useless. better to do a Rec2 track, and then rec it back to rec1
@@ -1222,7 +3383,11 @@ class ExampleActions(UserActionsBase):
         self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/OUT "%s"; %s/MON IN; %s/ARM OFF' % (int(idx_loops_out_track+1),rec_track_name,int(idx_loops_out_track+1),int(idx_loops_out_track+1)) )
         tracks[idx_loops_out_track].mute=False 
       # -------------------- modify routing clip name ---------------   
-        list(tracks[0].clip_slots)[-2].clip.name = routing_clip_name[0:-1] + "1"  
+        routing_clip = tracks[0].clip_slots[self.scene_slot('routing')].clip
+        if routing_clip is None:
+              self.canonical_parent.show_message('no routing clip on track 1')
+              return
+        routing_clip.name = routing_clip_name[0:-1] + "1"  
         self.canonical_parent.show_message('%s' % routing_clip_name)             
            
         
@@ -1237,79 +3402,84 @@ class ExampleActions(UserActionsBase):
               self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/MUTE OFF' % (int(idx_loop_tracks[i]+1)) )
 
         # -------------------- modify routing clip name ---------------          
-        list(tracks[0].clip_slots)[-2].clip.name = routing_clip_name[0:-1] + "0"  
+        routing_clip = tracks[0].clip_slots[self.scene_slot('routing')].clip
+        if routing_clip is None:
+              self.canonical_parent.show_message('no routing clip on track 1')
+              return
+        routing_clip.name = routing_clip_name[0:-1] + "0"  
         self.canonical_parent.show_message('%s' % routing_clip_name)     
         
  
 
+    @debounced('queue')
+    @takes(Arg('field', int, bounds=(1,2)))
     def decrease_bpm_from_loop_arg(self, action_def, args):
         """ decreases by 1 the beat numbers of bpm_from_loop argument or the measures number. if args = 1, measure number, if args = 2, beat numbers"""
         tracks=list(self.song().tracks)
-        idx_bpm_ctrl_track = [i for i in range(len(tracks)) if "bpm" in tracks[i].name][0] 
-        init_clip_name = list(tracks[idx_bpm_ctrl_track].clip_slots)[7].clip.name
+        bpm_cmd = self.bpm_cmd_clip()
+        if bpm_cmd is None:
+              return
+        cmd_clip, meas_arg, time_arg = bpm_cmd
       #   base_name="[] SEL/bpm_from_loop_new " # MIGHT CHANGE IF BPM FROM LOOP FUNCTION CHANGES
-        base_name=init_clip_name[0:-3]
-        length_arg=len(init_clip_name)-len(base_name)
-        str_bpm_arg = init_clip_name[-length_arg:]
-        list_bpm_arg=str_bpm_arg.split(' ')
-        meas_arg = int(list_bpm_arg[0])
-        time_arg=int(list_bpm_arg[1])
-        if int(args) == 1: # modify measure numbers
+        base_name = cmd_clip.name.rsplit(' ', 2)[0] + ' '
+        field, = args
+        if field == 1: # modify measure numbers
               if meas_arg > 1:
                     meas_arg = meas_arg - 1
               else:
                     meas_arg=1
               self.canonical_parent.show_message('new meas arg %s' % meas_arg) 
-              list(tracks[idx_bpm_ctrl_track].clip_slots)[7].clip.name = base_name + str(meas_arg) + ' ' + list_bpm_arg[1]
-        elif int(args) == 2: # modify beat numbers
+              cmd_clip.name = base_name + str(meas_arg) + ' ' + str(time_arg)
+        else: # modify beat numbers
               if time_arg > 1:
                     time_arg = time_arg-1
               else:
                     time_arg=1
               self.canonical_parent.show_message('new time arg %s' % time_arg) 
-              list(tracks[idx_bpm_ctrl_track].clip_slots)[7].clip.name = base_name + list_bpm_arg[0] + ' ' + str(time_arg)
-        else:
-              self.canonical_parent.show_message('wrong argument, need 1 or 2' )   
-        bpm_clip = [slot for slot in list(tracks[0].clip_slots) if slot.has_clip and "BPM" in slot.clip.name][0].clip
+              cmd_clip.name = base_name + str(meas_arg) + ' ' + str(time_arg)
+        if self.bpm_slot() is None:
+              self.canonical_parent.show_message('no BPM clip on track 1')
+              return
+        bpm_clip = tracks[0].clip_slots[self.bpm_slot()].clip
         init_bpm_name = bpm_clip.name
         name_splitted = init_bpm_name.split(' ')
         new_bpm_name = str(name_splitted[0]) + ' ' + str(meas_arg) + ' ' + str(time_arg)
         bpm_clip.name = new_bpm_name
 
     
+    @debounced('queue')
+    @takes(Arg('field', int, bounds=(1,2)))
     def increase_bpm_from_loop_arg(self, action_def, args):
         """ increases by 1 the beat numbers of bpm_from_loop argument or the measures number. if args = 1, measure number, if args = 2, beat numbers """ 
         tracks=list(self.song().tracks)
-        idx_bpm_ctrl_track = [i for i in range(len(tracks)) if "bpm" in tracks[i].name][0] 
-        self.canonical_parent.show_message('bpm track idx %s' % idx_bpm_ctrl_track )    
-        init_clip_name = list(tracks[idx_bpm_ctrl_track].clip_slots)[7].clip.name
+        bpm_cmd = self.bpm_cmd_clip()
+        if bpm_cmd is None:
+              return
+        cmd_clip, meas_arg, time_arg = bpm_cmd
       #   base_name="[] SEL/bpm_from_loop_new " # MIGHT CHANGE IF BPM FROM LOOP FUNCTION CHANGES
-        base_name=init_clip_name[0:-3]
+        base_name = cmd_clip.name.rsplit(' ', 2)[0] + ' '
         self.canonical_parent.show_message('base name %s' % base_name )               
 
-        length_arg=len(init_clip_name)-len(base_name)
-        str_bpm_arg = init_clip_name[-length_arg:]
-        list_bpm_arg=str_bpm_arg.split(' ')
-        meas_arg = int(list_bpm_arg[0])
-        time_arg=int(list_bpm_arg[1])
       #   self.canonical_parent.show_message('coucou' )   
-        if int(args) == 1: # modify measure numbers
+        field, = args
+        if field == 1: # modify measure numbers
               if meas_arg < 8:
                     meas_arg = meas_arg+1
               else:
                     meas_arg=8
               self.canonical_parent.show_message('new meas arg %s' % meas_arg) 
-              list(tracks[idx_bpm_ctrl_track].clip_slots)[7].clip.name = base_name + str(meas_arg) + ' ' + list_bpm_arg[1]
-        elif int(args) == 2: # modify beat numbers
+              cmd_clip.name = base_name + str(meas_arg) + ' ' + str(time_arg)
+        else: # modify beat numbers
               if time_arg < 9:
                     time_arg = time_arg+1
               else:
                     time_arg=9
               self.canonical_parent.show_message('new time arg %s' % time_arg) 
-              list(tracks[idx_bpm_ctrl_track].clip_slots)[7].clip.name = base_name + list_bpm_arg[0] + ' ' + str(time_arg)
-        else:
-              self.canonical_parent.show_message('wrong argument, need 1 or 2' )   
-        bpm_clip = [slot for slot in list(tracks[0].clip_slots) if slot.has_clip and "BPM" in slot.clip.name][0].clip
+              cmd_clip.name = base_name + str(meas_arg) + ' ' + str(time_arg)
+        if self.bpm_slot() is None:
+              self.canonical_parent.show_message('no BPM clip on track 1')
+              return
+        bpm_clip = tracks[0].clip_slots[self.bpm_slot()].clip
         init_bpm_name = bpm_clip.name
         name_splitted = init_bpm_name.split(' ')
         new_bpm_name = str(name_splitted[0]) + ' ' + str(meas_arg) + ' ' + str(time_arg)
@@ -1319,8 +3489,9 @@ class ExampleActions(UserActionsBase):
     def delete_all_simpler_tracks(self, action_def, _):
         """ Deletes all Simpler tracks """
         tracks=list(self.song().tracks)
-        string_music_track_names="Slice"
+        string_music_track_names=self.config().simpler_tracks
         idx_simpler_tracks = [i for i in range(len(tracks)) if string_music_track_names in tracks[i].name]
+        self._journal.record('del_simplers', self.journal_tracks(idx_simpler_tracks))
         for i in range(len(idx_simpler_tracks)):
               self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/DEL' % int(idx_simpler_tracks[i]+1)) 
 
@@ -1328,13 +3499,12 @@ class ExampleActions(UserActionsBase):
     def navigate_in_music_clips(self, action_def, _):
         """ selects next clip in selected track if sel track is music track. other wise selects Rec track 1st clip """
         tracks=list(self.song().tracks)
-        string_music_track_names=["test","REC","Beats","Bass"] # strings that will make a track considered as "music track"
+        string_music_track_names=self.config().music_clip_tracks # strings that will make a track considered as "music track"
         idx_music_tracks = []
         sel_track = self.song().view.selected_track
-        idx_sel_track = tracks.index(sel_track)
-        clipslots = list(sel_track.clip_slots)
-        idx_clip_selected = clipslots.index(self.song().view.highlighted_clip_slot)
-        idx_clipslots_full = [i for i in range(len(clipslots)) if clipslots[i].has_clip]
+        idx_sel_track = tracks.index(sel_track) if sel_track in tracks else None
+        sel_index = self.slot_index(sel_track)
+        idx_clip_selected = sel_index.positions.get(self._ptr(self.song().view.highlighted_clip_slot))
         # -------------- get indexes of music tracks ------------------
         for i in range(len(string_music_track_names)):
               idx_goodname = [item for item in range(len(tracks)) if string_music_track_names[i] in tracks[item].name]
@@ -1343,10 +3513,12 @@ class ExampleActions(UserActionsBase):
       #   # -------------- if music trck selected, select next clip. else, go back to Rec track, clip 1 ------------------
         if idx_sel_track in idx_music_tracks:
               # -------------- if last full clipslot selected, or empty slot selected, go back to 1st slot ---------
-              if idx_clip_selected in idx_clipslots_full and idx_clip_selected is not idx_clipslots_full[-1]:
-                    idx_clip_tosel=idx_clipslots_full[idx_clipslots_full.index(idx_clip_selected)+1]
-              else:
-                    idx_clip_tosel=idx_clipslots_full[0]
+              idx_clip_tosel = sel_index.next_filled(idx_clip_selected) if idx_clip_selected in sel_index.names else None
+              if idx_clip_tosel is None and sel_index.filled:
+                    idx_clip_tosel=sel_index.filled[0]
+              if idx_clip_tosel is None:
+                    self.canonical_parent.show_message('no clip in %s' % sel_track.name)
+                    return
               self.canonical_parent.clyphx_pro_component.trigger_action_list('SEL/SEL %s' % int(idx_clip_tosel+1)) 
         else:
               self.canonical_parent.clyphx_pro_component.trigger_action_list('1/SEL 1') 
@@ -1355,10 +3527,10 @@ class ExampleActions(UserActionsBase):
     def navigate_in_music_tracks(self, action_def, _):
         """ selects next track among Simpler tracks, Rec track, Beat track, Bass track, Slice track """
         tracks=list(self.song().tracks)
-        string_music_track_names=["REC","Beats","Slice","Bass","piano","LOOPS_OUT","Loop","INSTRU"] # strings that will make a track considered as "music track"
+        string_music_track_names=self.config().music_tracks # strings that will make a track considered as "music track"
         idx_music_tracks = []
         sel_track = self.song().view.selected_track
-        idx_sel_track = tracks.index(sel_track)
+        idx_sel_track = tracks.index(sel_track) if sel_track in tracks else None
         # -------------- get indexes of music tracks ------------------
         for i in range(len(string_music_track_names)):
               idx_goodname = [item for item in range(len(tracks)) if string_music_track_names[i] in tracks[item].name]
@@ -1374,44 +3546,52 @@ class ExampleActions(UserActionsBase):
       
 
 
+    def _name_bink_clip(self, track_bink, beats):
+        """ shows the beat numbers of binklooper in the name of its clip in 1st track, if the clip is there """
+        clip = track_bink.clip_slots[self.scene_slot('bink')].clip
+        if clip is None:
+              self.canonical_parent.show_message('no Bink clip on track 1')
+        else:
+              clip.name = "Bink %d" % beats
+
     def autoset_binklooper_beats(self, action_def, _):
         """ autosets the beat numbers of binklooper in 1st track according to parameter of bpmfromloop function """
-        tracks=list(self.song().tracks)
         track_bink=list(self.song().tracks)[0]
-        param_bink=list(track_bink.devices)[0].parameters
-        idx_bpm_ctrl_track = [i for i in range(len(tracks)) if "bpm" in tracks[i].name][0] 
-        init_clip_name = list(tracks[idx_bpm_ctrl_track].clip_slots)[7].clip.name
-        list_bpm_arg=init_clip_name.split(' ')
-        beat_arg=int(list_bpm_arg[-2])
-        meas_arg=int(list_bpm_arg[-1])
-        self.canonical_parent.show_message('beats %s' % type(param_bink[5].value)) #param[5] is loop length
-        param_bink[5].value = beat_arg*meas_arg
-        list(track_bink.clip_slots)[-1].clip.name = "Bink %d" % param_bink[5].value
+        bink_length=self.param(list(track_bink.devices)[0], 'bink_length')
+        bpm_cmd = self.bpm_cmd_clip()
+        if bpm_cmd is None:
+              return
+        meas_arg, beat_arg = bpm_cmd[1:]
+        self.canonical_parent.show_message('beats %s' % type(bink_length.value))
+        bink_length.value = beat_arg*meas_arg
+        self._name_bink_clip(track_bink, bink_length.value)
         
 
     def decrease_binklooper_beats(self, action_def, _):
         """ decreases by 1 the beat numbers of binklooper in 1st track, changes its name to display new beat nb """
         track_bink=list(self.song().tracks)[0]
-        param_bink=list(track_bink.devices)[0].parameters
-        self.canonical_parent.show_message('beats %s' % type(param_bink[5].value)) #param[5] is loop length
-        param_bink[5].value = min(1,param_bink[5].value-1)
-        list(track_bink.clip_slots)[-1].clip.name = "Bink %d" % param_bink[5].value
+        bink_length=self.param(list(track_bink.devices)[0], 'bink_length')
+        self.canonical_parent.show_message('beats %s' % type(bink_length.value))
+        bink_length.value = min(1,bink_length.value-1)
+        self._name_bink_clip(track_bink, bink_length.value)
         
     def increase_binklooper_beats(self, action_def, _):
         """ increases by 1 the beat numbers of binklooper in 1st track, changes its name to display new beat nb """
         track_bink=list(self.song().tracks)[0]
-        param_bink=list(track_bink.devices)[0].parameters
-        self.canonical_parent.show_message('beats %s' % type(param_bink[5].value)) #param[5] is loop length
-        param_bink[5].value += 1
-        list(track_bink.clip_slots)[-1].clip.name = "Bink %d" % param_bink[5].value 
+        bink_length=self.param(list(track_bink.devices)[0], 'bink_length')
+        self.canonical_parent.show_message('beats %s' % type(bink_length.value))
+        bink_length.value += 1
+        self._name_bink_clip(track_bink, bink_length.value) 
 
+    @takes(Arg('beats', int, bounds=(1,64)))
     def set_binklooper_beats(self, action_def, args):
         """ sets beat numbers of binklooper in 1st track, changes its name to display new beat nb """
         track_bink=list(self.song().tracks)[0]
-        param_bink=list(track_bink.devices)[0].parameters
-        self.canonical_parent.show_message('beats %s' % type(param_bink[5].value)) #param[5] is loop length
-        param_bink[5].value = int(args)
-        list(track_bink.clip_slots)[-1].clip.name = "Bink %d" % int(args) 
+        bink_length=self.param(list(track_bink.devices)[0], 'bink_length')
+        self.canonical_parent.show_message('beats %s' % type(bink_length.value))
+        beats, = args
+        bink_length.value = beats
+        self._name_bink_clip(track_bink, beats)
 
 
 #     def increment_plugin_preset(self, action_def, args):
@@ -1427,77 +3607,59 @@ class ExampleActions(UserActionsBase):
 
     def set_last_simpler_track(self, action_def, _):
         """use set_simpler_slice on the most recent TOSIMP track"""
-      #   track=action_def['track']
-      #   idx_track = list(self.song().tracks).index(action_def['track'])
-        tracks, idx_instru_group, idx_instru_tracks, idx_sel_track_init = [self.initialize_variables()[i] for i in (0,7,8,10)]
-        self.canonical_parent.show_message('idx instru tracks : %s' % idx_instru_tracks) 
+        tracks, idx_instru_tracks = [self.initialize_variables()[i] for i in (0,8)]
         idx_last_instru = idx_instru_tracks[-1]
         self.canonical_parent.show_message('idx last instru tracks : %s' % idx_last_instru) 
-        self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/set_simpler_slice 4' % int(idx_last_instru+1) )
+        self.set_simpler_slice({'track': tracks[idx_last_instru]}, '4')
 
-    def send_first_clip_to_simpler(self, action_def, _):
-        """new slice track in INSTRU group, settings, naming it properly"""
+    @takes(Arg('division', int, None, bounds=(0,10)))
+    def send_first_clip_to_simpler(self, action_def, args):
+        """new slice track in INSTRU group. the new Simpler is set up (slicing profile, naming) as soon as it appears. beat division can be given in args"""
         idx_track = list(self.song().tracks).index(action_def['track'])
-        tracks, idx_instru_group, idx_instru_tracks, idx_sel_track_init= [self.initialize_variables()[i] for i in (0,7,8,10)]
-        self.canonical_parent.show_message('pouet : ' ) 
-        self.canonical_parent.show_message('idx instru tracks : %s' % idx_instru_tracks) 
+        tracks, idx_instru_tracks, sel_track_init = [self.initialize_variables()[i] for i in (0,8,9)]
         idx_last_instru = idx_instru_tracks[-1]
-        self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/SEL ; %s/CLIP(1) TOSIMP ; WAIT 10 ; %s/SEL' % (int(idx_last_instru+1),int(idx_track+1), int(idx_sel_track_init+1)) )
-      #   self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/set_simpler_slice 4' % int(idx_last_instru+2) )
-      #   self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/SEL' % (int(idx_last_instru+1)),int(idx_track+1) )
+        deadline = time.time() + SIMPLER_REQUEST_TIMEOUT
+        self._pending_simplers.append((frozenset(self._ptr(t) for t in tracks), self._slice_profile(*args), sel_track_init, deadline))
+        self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/SEL ; %s/CLIP(1) TOSIMP' % (int(idx_last_instru+1),int(idx_track+1)) )
    
 
+    @takes(Arg('division', int, None, bounds=(0,10)))
     def set_simpler_slice(self, action_def, args):
         """set simpler in slice mode right after being created, split into 1 beat clip"""
         track = action_def['track']   
-        track_idx = list(self.song().tracks).index(action_def['track']) 
-        tracks, sel_track_init = [self.initialize_variables()[i] for i in (0,9)]
-        self.canonical_parent.show_message('target track name : %s' % track.name)
         if track.name == "piano":
               self.canonical_parent.show_message('error : piano track targeted')
-        else:
-              idx_slice_tracks = [i for i in range(len(tracks)) if "Slice" in tracks[i].name]
-              #   self.canonical_parent.show_message('idx slice tracks : %s' % idx_slice_tracks)
-              slice_track_name = "Slice " + str(len(idx_slice_tracks))
-              self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/SEL' % int(track_idx+1))
-            #   self.canonical_parent.clyphx_pro_component.trigger_action_list('SEL/ARM ON ; SEL/INSUB "Ch. 3"') # TO CHANGE IF NEEDED
-              self.canonical_parent.clyphx_pro_component.trigger_action_list('SEL/INSUB "Ch. 3"') # TO CHANGE IF NEEDED
-              self.canonical_parent.clyphx_pro_component.trigger_action_list('SEL/NAME "%s"' % slice_track_name)
-              self.canonical_parent.clyphx_pro_component.trigger_action_list('SEL/DEV(1) SIMP PLAYMODE 3 ; SEL/DEV(1) SIMP WARP ON ; SEL/DEV(1) SIMP GATE OFF ; SEL/DEV(1) "Fade In" 40') #mode 3 = slice
-              simpler=track.devices[0]
-              simpler.sample.slicing_style = 1 # slice by beat
-              simpler.sample.slicing_beat_division = int(args) # test
-              simpler.sample.gain = 0.6 # => 8 db ?
-              self.canonical_parent.clyphx_pro_component.trigger_action_list('%s/SEL' % int(sel_track_init+1))
+        elif not self.provision_simpler_track(track, self._slice_profile(*args)):
+              self.canonical_parent.show_message('error : no Simpler on %s' % track.name)
      
 
         
+    @takes(Arg('offset', int))
     def play_counting_from_last_clip(self, action_def, args):
         """ plays the clip in position LAST-args of the selected track """
         track = action_def['track']    
-        clipslots=list(track.clip_slots)
-      #   list of indexes of clipslots where a clip is present 
-        list_index_full = [i for i in range(len(clipslots)) if track.clip_slots[i].has_clip == True]
-        idx_final = list_index_full[-1]-int(args)+1
+        last = self.slot_index(track).last()
+        if last is None:
+              self.canonical_parent.show_message('no clip on %s' % track.name)
+              return
+        idx_final = last-args[0]+1
         self.canonical_parent.show_message('idx final %s' % idx_final)
         self.canonical_parent.clyphx_pro_component.trigger_action_list('SEL/PLAY %s' % idx_final)
   
 
+    @takes(Arg('measures', float), Arg('beats', float))
     def set_new_bpm_from_loop_length_newVersion(self, action_def, args): 
           # Small delay if try to relaunch in this function directly ==> this fction only sets new bpm and measure length. need to launch after in other command
         """ sets new bpm from indicated clip length in selected track """
-        args=args.split(' ') # we want args = [nb_measures nb_times_in_measure]
+        nb_measures, nb_times_in_measure = args
         tracks, idx_loop_tracks, nb_loop_tracks, idx_measure_tracks = [self.initialize_variables()[i] for i in (0,1,3,4)]
         sel_track = self.song().view.selected_track
-        idx_sel_track = tracks.index(sel_track)
-        clipslots = list(sel_track.clip_slots)
-        idx_clipslots_full = [i for i in range(len(clipslots)) if clipslots[i].has_clip]
+        idx_clipslots_full = list(self.slot_index(sel_track).filled)
         bool_clipwasplaying=[]
-        if len(idx_clipslots_full) > 0 :
+        if len(idx_clipslots_full) > 0 and "REC" in sel_track.name and sel_track.clip_slots[0].has_clip:
              #  --------------  get current bpm and calculate target bpm -----------------
-              if "REC" in sel_track.name:
-                    length_init = list(sel_track.clip_slots)[0].clip.length
-              length_target = float(args[0])*float(args[1])  
+              length_init = sel_track.clip_slots[0].clip.length
+              length_target = nb_measures*nb_times_in_measure  
               tempo_init = self.song().tempo
             #   odd_measures = [3,5,6,7,9,10,11] #List of args that will take into account time sig change
             #   if length_target in odd_measures:
@@ -1512,6 +3674,7 @@ class ExampleActions(UserActionsBase):
             #  --------------  Change bpm -----------------
               self.canonical_parent.clyphx_pro_component.trigger_action_list('BPM %s' % tempo_target ) 
               self.canonical_parent.clyphx_pro_component.trigger_action_list('1/CLIP(1) START 0 ; 1/CLIP(1) END %s' % length_target ) 
+              self.correct_tempo_from_audio(self._audio_path(sel_track.clip_slots[0].clip), tempo_target)
                  
         else:
             self.canonical_parent.show_message('No clip in Loop track or wrong track selected')
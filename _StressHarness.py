@@ -0,0 +1,698 @@
+"""
+Headless stress harness for ExampleActions : builds synthetic sets on a fake Live Object Model, fires
+randomized action streams at them and measures how the time of each action grows with the number of
+tracks and of scenes.
+
+The name starts with an underscore, so ClyphX_Pro never imports this file as a user actions module.
+Run it outside of Live, from this folder :
+
+    python _StressHarness.py
+    python _StressHarness.py --tracks 50,100,200,300 --scenes 24,48,96,192 --fuzz 2000 --seed 7
+
+For each action of ACTIONS, the time per call is fitted to time ~ size ** k (least squares on log-log).
+An action fails when k is above the bound it declares (plus SLOPE_TOLERANCE), so a lookup that turns
+quadratic shows up here before a 300 tracks set hits it.
+
+The fuzzed stream fires every registered action, on the full layout and on each of LAYOUT_BREAKS (a set
+as a user may leave it : no BPM clip, a Looper track without device...). A share of the calls get
+malformed args. An action must show a message rather than raise, so every exception is reported.
+The exit status is 1 if anything failed.
+"""
+
+from __future__ import print_function
+import argparse
+import collections
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+import types
+
+SLOPE_TOLERANCE = 0.35 # measured exponents are noisy, this much above the bound is still accepted
+MIN_FIT_TIME = 20e-6 # curves whose slowest point is faster than this (seconds per call) are not judged
+REPEATS = 5 # timed calls per point, the median is kept
+MALFORMED_ARGS = ('x', '-1', '0', '999', '1.5', 'a b c d', '"', 'next prev', 'vol vol') # fired in place of valid args
+MALFORMED_SHARE = 0.25
+NOT_FUZZED = ('reload_actions',) # swaps the class of the instance under test
+
+
+# ---------- FAKE LOM : just what ExampleActions reads and writes, listeners fire on attribute writes --------------
+class Observable(object):
+    _next_ptr = [1]
+
+    def __init__(self):
+        object.__setattr__(self, '_listeners', collections.defaultdict(list))
+        object.__setattr__(self, '_live_ptr', Observable._next_ptr[0])
+        Observable._next_ptr[0] += 1
+
+    def __getattr__(self, name):
+        if name.startswith('add_') and name.endswith('_listener'):
+            return self._listeners[name[4:-9]].append
+        if name.startswith('remove_') and name.endswith('_listener'):
+            return self._listeners[name[7:-9]].remove
+        if name.endswith('_has_listener'):
+            return lambda cb: cb in self._listeners[name[:-13]]
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        self.notify(name)
+
+    def notify(self, prop):
+        for cb in list(self._listeners.get(prop, ())):
+            cb()
+
+
+class Parameter(Observable):
+    def __init__(self, name, value=0, min=0, max=127, is_quantized=False):
+        Observable.__init__(self)
+        self.name, self.value, self.min, self.max, self.is_quantized = name, value, min, max, is_quantized
+        self.is_enabled = True
+        self.default_value = value
+
+
+class Sample(Observable):
+    def __init__(self, file_path, length):
+        Observable.__init__(self)
+        self.file_path, self.length, self.sample_rate = file_path, length, 44100
+        self.slicing_style = self.slicing_beat_division = 0
+        self.gain = 0.0
+        self.warping = False
+        self.slices = []
+
+    def insert_slice(self, time):
+        self.slices.append(time)
+
+    def clear_slices(self):
+        self.slices = []
+
+
+class Chain(Observable):
+    def __init__(self, name, devices):
+        Observable.__init__(self)
+        self.name, self.devices = name, list(devices)
+
+
+class Device(Observable):
+    def __init__(self, name, class_name=None, parameters=(), chains=(), sample=None):
+        Observable.__init__(self)
+        self.name, self.class_name = name, class_name or name
+        self.parameters = [Parameter('Device On', 1)] + list(parameters)
+        self.chains = list(chains)
+        self.can_have_chains = bool(chains)
+        self.can_have_drum_pads = class_name == 'DrumGroupDevice'
+        self.sample = sample
+        self.playback_mode = 0
+
+
+class Envelope(object):
+    def __init__(self):
+        self.steps = []
+
+    def insert_step(self, time, duration, value):
+        self.steps.append((time, duration, value))
+
+    def value_at_time(self, time):
+        return 0
+
+
+class Clip(Observable):
+    def __init__(self, name='', length=4.0, is_midi_clip=True):
+        Observable.__init__(self)
+        self.name, self.length = name, length
+        self.is_midi_clip, self.is_audio_clip = is_midi_clip, not is_midi_clip
+        self.file_path = '' if is_midi_clip else '/synthetic/%s.wav' % name
+        self.color_index = 0
+        self.pitch_coarse = 0
+        self.loop_start = self.start_marker = 0.0
+        self.loop_end = self.end_marker = length
+        self.looping = self.warping = True
+        self.muted = False
+        self.notes = []
+        self.envelopes = {}
+
+    def get_notes(self, *a):
+        return tuple(self.notes)
+
+    def set_notes(self, notes):
+        self.notes.extend(notes)
+
+    def select_all_notes(self):
+        pass
+
+    def replace_selected_notes(self, notes):
+        self.notes = list(notes)
+
+    def remove_notes(self, *a):
+        self.notes = []
+
+    def automation_envelope(self, parameter):
+        return self.envelopes.get(id(parameter))
+
+    def create_automation_envelope(self, parameter):
+        self.envelopes[id(parameter)] = Envelope()
+        return self.envelopes[id(parameter)]
+
+    def clear_envelope(self, parameter):
+        self.envelopes.pop(id(parameter), None)
+
+    def fire(self):
+        pass
+
+
+class ClipSlot(Observable):
+    def __init__(self, clip=None):
+        Observable.__init__(self)
+        self.clip, self.has_clip = clip, clip is not None
+
+    def set(self, clip):
+        self.clip, self.has_clip = clip, clip is not None
+
+    def create_clip(self, length):
+        self.set(Clip('', length))
+
+    def delete_clip(self):
+        self.set(None)
+
+    def duplicate_clip_to(self, target):
+        copy = Clip(self.clip.name, self.clip.length, self.clip.is_midi_clip)
+        copy.notes, copy.color_index = list(self.clip.notes), self.clip.color_index
+        target.set(copy)
+
+    def fire(self):
+        pass
+
+
+class RoutingChannel(object):
+    def __init__(self, display_name):
+        self.display_name = display_name
+
+
+class MixerDevice(Observable):
+    def __init__(self):
+        Observable.__init__(self)
+        self.volume = Parameter('Volume', 0.85, 0, 1)
+        self.panning = Parameter('Pan', 0, -1, 1)
+
+
+class Track(Observable):
+    def __init__(self, name, nb_scenes, devices=(), is_grouped=False, midi=True):
+        Observable.__init__(self)
+        self.name = name
+        self.clip_slots = [ClipSlot() for _ in range(nb_scenes)]
+        self.devices = list(devices)
+        self.is_grouped = is_grouped
+        self.arm = self.mute = False
+        self.can_be_armed = True
+        self.current_monitoring_state = 1
+        self.color_index = 0
+        self.has_midi_input, self.has_audio_input = midi, not midi
+        self.available_input_routing_channels = [RoutingChannel('Ch. 1'), RoutingChannel('Ch. 3')]
+        self.input_routing_channel = None
+        self.mixer_device = MixerDevice()
+
+    def stop_all_clips(self):
+        pass
+
+
+class Scene(Observable):
+    def __init__(self, name=''):
+        Observable.__init__(self)
+        self.name = name
+
+
+class SongView(Observable):
+    def __init__(self):
+        Observable.__init__(self)
+        self.selected_track = self.highlighted_clip_slot = self.selected_scene = None
+
+
+class Song(Observable):
+    def __init__(self):
+        Observable.__init__(self)
+        self.tracks, self.scenes = [], []
+        self.view = SongView()
+        self.tempo = 120.0
+        self.current_song_time = 0.0
+        self.signature_numerator = self.signature_denominator = 4
+        self.session_record = False
+        self.clip_trigger_quantization = 4
+        self.is_playing = True
+        self.master_track = Track('Master', 0)
+
+    def delete_track(self, idx):
+        del self.tracks[idx]
+        self.notify('tracks')
+
+    def create_midi_track(self, idx):
+        track = Track('MIDI', len(self.scenes))
+        self.tracks.insert(idx if idx >= 0 else len(self.tracks), track)
+        self.notify('tracks') # returns None like Live's, callers read the track back from tracks
+
+    create_audio_track = create_midi_track
+
+
+class ActionDispatcher(object):
+    """ stands for clyphx_pro_component : built-in action lists are only recorded """
+
+    def __init__(self):
+        self.dispatched = 0
+
+    def trigger_action_list(self, action_list):
+        self.dispatched += 1
+
+
+class ControlSurface(object):
+    """ stands for ClyphX_Pro's control surface : messages are dropped, scheduled callbacks run on tick() """
+
+    def __init__(self, song):
+        self._song = song
+        self.clyphx_pro_component = ActionDispatcher()
+        self._scheduled = []
+
+    def show_message(self, message):
+        pass
+
+    def log_message(self, message):
+        pass
+
+    def schedule_message(self, delay, callback, *args):
+        self._scheduled.append((delay, callback, args))
+
+    def tick(self):
+        due = [s for s in self._scheduled if s[0] <= 1]
+        self._scheduled = [(d - 1, c, a) for d, c, a in self._scheduled if d > 1]
+        for _, callback, args in due:
+            callback(*args)
+
+
+def install_user_actions_base():
+    """ ExampleActions imports UserActionsBase from ClyphX_Pro, which only exists inside Live """
+    class UserActionsBase(object):
+        def __init__(self, control_surface, *a, **k):
+            self.canonical_parent = control_surface
+            self.registry = {}
+            self.create_actions()
+
+        def song(self):
+            return self.canonical_parent._song
+
+        def add_global_action(self, name, method):
+            self.registry[name] = method
+
+        add_track_action = add_device_action = add_clip_action = add_global_action
+
+        def disconnect(self):
+            pass
+
+    for name in ('ClyphX_Pro', 'ClyphX_Pro.clyphx_pro', 'ClyphX_Pro.clyphx_pro.UserActionsBase'):
+        sys.modules.setdefault(name, types.ModuleType(name))
+    sys.modules['ClyphX_Pro.clyphx_pro.UserActionsBase'].UserActionsBase = UserActionsBase
+
+
+# ---------- SYNTHETIC SETS : the layout of the live set, padded with filler tracks and scenes --------------
+def looper_track(name, nb_scenes):
+    chains = [Chain(abc, [Device('Looper', parameters=[Parameter('State', 0, 0, 3, True), Parameter('Speed'), Parameter('Reverse'),
+                                                         Parameter('Feedback'), Parameter('Monitor'), Parameter('Quantization', 1, 0, 13, True)])])
+              for abc in 'ABC']
+    track = Track(name, nb_scenes, [Device('Looper Rack', 'AudioEffectGroupDevice', chains=chains)], midi=False)
+    track.clip_slots[2].set(Clip('recABC'))
+    for idx in range(21, nb_scenes, 3):
+        track.clip_slots[idx].set(Clip('rec %s' % 'ABC'[idx // 3 % 3]))
+    return track
+
+
+def beats_track(name, nb_scenes, banks=('beatardeche', 'FunkyClyphX', 'beatrebou', 'ThugBeat')):
+    """ a beats midi track : a pitch device transposing into a drum rack of 4 Simpler chains per beat bank """
+    chains = [Chain('%s %d' % (bank, k), [Device('%s_%d' % (bank, k), 'OriginalSimpler', sample=Sample('/synthetic/%s%d.wav' % (bank, k), 44100 * 2 * (k + 1)))])
+              for bank in banks for k in range(4)]
+    pitch = Device('Pitch', 'MidiPitcher', [Parameter('Pitch', 0, -128, 128)])
+    track = Track(name, nb_scenes, [pitch, Device('Drum Rack', 'DrumGroupDevice', chains=chains)])
+    for idx in range(4):
+        track.clip_slots[idx].set(Clip('%s %d' % (name, idx)))
+    track.clip_slots[10].set(Clip('CurrentBeat : %s' % banks[0]))
+    return track
+
+
+def synthetic_set(nb_tracks, nb_scenes, nb_devices, rng):
+    """ a Song with the tracks the actions look for by name, then filler tracks up to nb_tracks,
+    each with nb_devices devices and clips in about a third of its slots """
+    assert nb_scenes >= 24, 'the set layout needs at least 24 scenes'
+    song = Song()
+    song.scenes = [Scene() for _ in range(nb_scenes)]
+
+    def add(track):
+        song.tracks.append(track)
+        return track
+
+    bink = Device('BinkLooper', 'MxDeviceAudioEffect', [Parameter(name) for name in ('Rec', 'Play', 'Stop', 'Clear')] + [Parameter('Loop Length', 8, 1, 64, True)])
+    rec = add(Track('REC', nb_scenes, [bink], midi=False))
+    rec.clip_slots[0].set(Clip('rec', 8.0, is_midi_clip=False))
+    rec.clip_slots[18].set(Clip('info rec Sync'))
+    rec.clip_slots[-4].set(Clip('BPM 2 4'))
+    rec.clip_slots[-2].set(Clip('routing 0'))
+    rec.clip_slots[-1].set(Clip('Bink 8'))
+    for i in range(3):
+        add(looper_track('Looper%d' % (i + 1), nb_scenes))
+    add(Track('LOOPS_OUT', nb_scenes, midi=False))
+    bpm = add(Track('bpm', nb_scenes))
+    bpm.clip_slots[3].set(Clip('[] bpm_1bar_clip'))
+    bpm.clip_slots[7].set(Clip('[] SEL/bpm_from_loop_new 2 4'))
+    add(Track('INSTRU', nb_scenes))
+    for name in ('KEYS', 'BASS', 'DRUMS'):
+        add(Track(name, nb_scenes, is_grouped=True))
+    add(Track('RECLOOP', nb_scenes))
+    for i in range(3):
+        cmd = add(Track('CmdLoop%d' % (i + 1), nb_scenes))
+        cmd.clip_slots[0].set(Clip('[Rec] %d/PLAY 2' % (i + 2)))
+        for j in range(1, 4):
+            cmd.clip_slots[j].set(Clip('[P%d] %d/PLAY %d' % (j, i + 2, j + 2)))
+    add(Track('MPD', nb_scenes)).clip_slots[0].set(Clip('recloop_playSync'))
+    for i, label in enumerate(('clear', 'clear_all')):
+        dlo = Device('DLo', 'MxDeviceAudioEffect', [Parameter(name) for name in ('clear', 'clear_all', 'x2', ':2', 'mode', 'undo', 'undo_all')])
+        lp = add(Track('LP%d' % (i + 1), nb_scenes, [dlo], midi=False))
+        lp.clip_slots[0].set(Clip('[%s] "LP1"/DEV("DLo") "%s" ON' % (label, label)))
+    for name in ('TinyTransports', 'TinyNotes'):
+        tiny = add(Track(name, nb_scenes))
+        for idx in range(12):
+            tiny.clip_slots[idx].set(Clip('[] tiny %d' % idx))
+    for name in ('beatsMidi', 'fillsMidi', 'SCMidi'):
+        add(beats_track(name, nb_scenes))
+    dump = add(Track('DUMP', nb_scenes))
+    dump.clip_slots[10].set(Clip('DMPINFO 1'))
+    for i in range(5):
+        add(Track('dump %d' % i, nb_scenes, is_grouped=True))
+    add(Track('GrpBeet', nb_scenes))
+    for i in range(5):
+        add(Track('beet %d' % i, nb_scenes, is_grouped=True))
+    while len(song.tracks) < nb_tracks:
+        n = len(song.tracks)
+        track = add(Track('Audio %d' % n, nb_scenes, [Device('Fx %d' % d, parameters=[Parameter('Amount')]) for d in range(nb_devices)], midi=False))
+        for idx in range(nb_scenes):
+            if rng.random() < 0.3:
+                track.clip_slots[idx].set(Clip('take %d %d' % (n, idx), rng.choice((4.0, 8.0, 16.0)), is_midi_clip=False))
+    song.view.selected_track = song.tracks[1]
+    song.view.highlighted_clip_slot = song.tracks[1].clip_slots[0]
+    return song
+
+
+# ---------- LAYOUT BREAKS : the set as a user may leave it, each one fuzzed on its own --------------
+def looper_tracks(song):
+    return [t for t in song.tracks if 'Looper' in t.name]
+
+
+def no_bpm_clip(song):
+    song.tracks[0].clip_slots[-4].set(None)
+
+
+def no_info_rec_clip(song):
+    song.tracks[0].clip_slots[18].set(None)
+
+
+def looper_without_device(song):
+    looper_tracks(song)[0].devices = []
+
+
+def looper_with_empty_chain(song):
+    looper_tracks(song)[1].devices[0].chains[1].devices = []
+
+
+def looper_without_state(song):
+    looper_tracks(song)[2].devices = [Device('Reverb', parameters=[Parameter('Dry/Wet')])]
+
+
+def no_tinypad_tracks(song):
+    song.tracks[:] = [t for t in song.tracks if not t.name.startswith('Tiny')]
+
+
+def empty_selected_track(song):
+    track = Track('Audio empty', len(song.scenes), midi=False)
+    song.tracks.append(track)
+    song.view.selected_track = track
+    song.view.highlighted_clip_slot = track.clip_slots[0]
+
+
+LAYOUT_BREAKS = collections.OrderedDict([
+    ('full', None),
+    ('no BPM clip', no_bpm_clip),
+    ('no info rec clip', no_info_rec_clip),
+    ('Looper track without device', looper_without_device),
+    ('Looper chain without device', looper_with_empty_chain),
+    ('Looper track without State', looper_without_state),
+    ('no TinyPad tracks', no_tinypad_tracks),
+    ('empty selected track', empty_selected_track),
+])
+
+
+# ---------- ACTIONS : what to fire, with which args and on which track, and the declared scaling bounds --------------
+ActionCase = collections.namedtuple('ActionCase', 'name args target bounds')
+# args : rng -> args string. target : song, rng -> track of a track action, None for a global action.
+# bounds : dimension -> largest accepted exponent of time vs that dimension (1 = linear, 0 = constant)
+
+def looper(song, rng):
+    return rng.choice([t for t in song.tracks if 'Looper' in t.name])
+
+
+def any_track(song, rng):
+    return rng.choice(song.tracks)
+
+
+def track_with_clips(song, rng):
+    return rng.choice([t for t in song.tracks if any(slot.has_clip for slot in t.clip_slots)])
+
+
+def selected_track(song, rng):
+    """ the track of a SEL/ action, a filled one while the master track (no clip slot) is selected """
+    track = song.view.selected_track
+    return track if track.clip_slots else track_with_clips(song, rng)
+
+
+def dump_track(song, rng):
+    return [t for t in song.tracks if t.name == 'DUMP'][0]
+
+
+ACTIONS = [
+    ActionCase('switch_abc', lambda rng: rng.choice('abc'), looper, {'tracks': 1, 'scenes': 1}),
+    ActionCase('adjust_loopersrec', lambda rng: rng.choice('ABC'), looper, {'tracks': 1, 'scenes': 1}),
+    ActionCase('rec_abc_loopers', lambda rng: rng.choice(('A', 'B', 'C vol', 'pan', '')), looper, {'tracks': 1, 'scenes': 1}),
+    ActionCase('rec_sel_looper', lambda rng: '', None, {'tracks': 1, 'scenes': 1}),
+    ActionCase('play_all_loopers', lambda rng: '', None, {'tracks': 1, 'scenes': 1}),
+    ActionCase('stop_all_loopers', lambda rng: '', None, {'tracks': 1, 'scenes': 1}),
+    ActionCase('play_rec_clip', lambda rng: '', None, {'tracks': 1, 'scenes': 1}),
+    ActionCase('qtz_global', lambda rng: str(rng.randint(0, 13)), None, {'tracks': 0, 'scenes': 0}),
+    ActionCase('qtz_unqtz_loopers', lambda rng: rng.choice(('1', '2 on', '4 off')), None, {'tracks': 1, 'scenes': 1}),
+    ActionCase('select_instru', lambda rng: rng.choice(('KEYS', 'BASS', 'DRUMS')), None, {'tracks': 1, 'scenes': 1}),
+    ActionCase('switch_armed_instru', lambda rng: '', None, {'tracks': 1, 'scenes': 1}),
+    ActionCase('color_sel_looper', lambda rng: '', any_track, {'tracks': 1, 'scenes': 0}),
+    ActionCase('navigate_clips', lambda rng: '', None, {'tracks': 1, 'scenes': 1}),
+    ActionCase('navigate_tracks', lambda rng: '', None, {'tracks': 1, 'scenes': 0}),
+    ActionCase('play_from_last', lambda rng: str(rng.randint(0, 2)), selected_track, {'tracks': 1, 'scenes': 1}),
+    ActionCase('inc_bpm_from_loop_arg', lambda rng: rng.choice('12'), None, {'tracks': 1, 'scenes': 1}),
+    ActionCase('dec_bpm_from_loop_arg', lambda rng: rng.choice('12'), None, {'tracks': 1, 'scenes': 1}),
+    ActionCase('looper_auto', lambda rng: rng.choice(('a 0:rec 4:play', 'b 0:play 2:ovd 6:stop')), looper, {'tracks': 1, 'scenes': 1}),
+]
+FUZZ_TARGETS = {'new_beats_fromdump': dump_track} # actions that only make sense on one track
+
+
+SPEC_WORDS = { # args of a kind that is a function : a valid word
+    'section': lambda rng: '%d:%s' % (rng.randint(0, 7), rng.choice(('stop', 'rec', 'play', 'ovd'))),
+    'tinypad_page': lambda rng: rng.choice(('next', 'prev', '0', '1')),
+}
+
+
+def spec_args(spec, rng):
+    """ a valid args string for the Arg spec of a @takes action """
+    words = []
+    for arg in spec:
+        if arg.many:
+            count = rng.randint(0, 3)
+        else:
+            count = 0 if arg.usage().startswith('[') and rng.random() < 0.3 else 1 # [optional]
+        for _ in range(count):
+            if isinstance(arg.kind, tuple):
+                words.append(rng.choice(arg.kind))
+            elif arg.kind in (int, float):
+                low, high = arg.bounds or (0, 8)
+                words.append(str(arg.kind(rng.randint(int(low), int(high)))))
+            elif arg.kind.__name__ in SPEC_WORDS:
+                words.append(SPEC_WORDS[arg.kind.__name__](rng))
+            else:
+                words.append(rng.choice(('KEYS', 'BASS', 'reset_session', 'all_inst', 'x')))
+    return ' '.join(words)
+
+
+def fuzz_cases(registry):
+    """ ACTIONS, and a case for every other registered action : args drawn from its @takes spec, none without one """
+    known = set(case.name for case in ACTIONS)
+    cases = list(ACTIONS)
+    for name in sorted(registry):
+        if name in known or name in NOT_FUZZED:
+            continue
+        spec = getattr(registry[name], 'arg_spec', None)
+        args = (lambda rng, spec=spec: spec_args(spec, rng)) if spec is not None else (lambda rng: '')
+        cases.append(ActionCase(name, args, FUZZ_TARGETS.get(name, any_track), None))
+    return cases
+
+
+class Harness(object):
+    """ one ExampleActions instance on one synthetic set, with its config and registry files in a temp folder """
+
+    def __init__(self, module, song, workdir):
+        self.song = song
+        self.surface = ControlSurface(song)
+        module.PARAM_REGISTRY_FILE = os.path.join(workdir, 'param_registry.json')
+        module.CONFIG_FILE = os.path.join(workdir, 'set_config.json')
+        with open(module.CONFIG_FILE, 'w') as f:
+            f.write('{"debounce_ms": 0}') # every fired call must reach the action
+        self.actions = module.ExampleActions(self.surface)
+
+    def draw(self, case, rng):
+        """ (track, args string) of a random call of case """
+        return (case.target(self.song, rng) if case.target else None), case.args(rng)
+
+    def call(self, case, track, args):
+        action_def = {'xtrigger': None, 'xtrigger_is_xclip': False}
+        if track is not None: # as ClyphX passes it to track, device and clip actions. O(1), it is inside the timed call
+            clip = track.clip_slots[0].clip if track.clip_slots else None
+            action_def.update(track=track, device=track.devices[0] if track.devices else None, clip=clip)
+        self.actions.registry[case.name](action_def, args)
+        self.surface.tick() # runs what the action scheduled for the next tick
+
+    def fire(self, case, rng):
+        self.call(case, *self.draw(case, rng))
+
+    def time_call(self, case, track, args):
+        start = time.time()
+        self.call(case, track, args)
+        return time.time() - start
+
+
+def fitted_exponent(sizes, times):
+    """ k of times ~ sizes ** k, least squares on the logs """
+    xs = [math.log(s) for s in sizes]
+    ys = [math.log(max(t, 1e-9)) for t in times]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    var = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / var if var else 0.0
+
+
+def curves(module, workdir, dimension, sizes, fixed, nb_devices, seed):
+    """ action name -> median seconds per call at each size of dimension ('tracks' or 'scenes') """
+    result = collections.defaultdict(list)
+    for size in sizes:
+        dims = dict(fixed, **{dimension: size})
+        rng = random.Random(seed)
+        harness = Harness(module, synthetic_set(dims['tracks'], dims['scenes'], nb_devices, rng), workdir)
+        for case in ACTIONS:
+            track, action_args = harness.draw(case, rng)
+            harness.call(case, track, action_args) # warm up : indexes and caches are built by the first call
+            times = sorted(harness.time_call(case, track, action_args) for _ in range(REPEATS))
+            result[case.name].append(times[len(times) // 2])
+    return result
+
+
+def report(dimension, sizes, result):
+    """ prints the curves of one dimension, returns the names of the actions above their bound """
+    failed = []
+    print('\ntime per call (ms) vs %s' % dimension)
+    print('%-24s %s   exponent / bound' % ('action', ' '.join('%8d' % s for s in sizes)))
+    for case in ACTIONS:
+        times = result[case.name]
+        k = fitted_exponent(sizes, times)
+        bound = case.bounds[dimension]
+        judged = max(times) >= MIN_FIT_TIME
+        over = judged and k > bound + SLOPE_TOLERANCE
+        if over:
+            failed.append(case.name)
+        print('%-24s %s   %5.2f / %d%s' % (case.name, ' '.join('%8.3f' % (t * 1000) for t in times), k, bound,
+                                           '  FAIL' if over else ('' if judged else '  (too fast to judge)')))
+    return failed
+
+
+def fuzz(module, workdir, nb_calls, nb_tracks, nb_scenes, nb_devices, seed):
+    """ fires nb_calls random actions on each layout of LAYOUT_BREAKS, with random edits of the set in between.
+    returns the distinct errors """
+    errors = collections.OrderedDict() # (layout, action, error line) -> (count, args, traceback)
+    for layout, damage in LAYOUT_BREAKS.items():
+        fuzz_layout(module, workdir, layout, damage, nb_calls, nb_tracks, nb_scenes, nb_devices, seed, errors)
+    return errors
+
+
+def fuzz_layout(module, workdir, layout, damage, nb_calls, nb_tracks, nb_scenes, nb_devices, seed, errors):
+    rng = random.Random(seed)
+    song = synthetic_set(nb_tracks, nb_scenes, nb_devices, rng)
+    if damage is not None:
+        damage(song)
+    harness = Harness(module, song, workdir)
+    cases = fuzz_cases(harness.actions.registry)
+    for _ in range(nb_calls):
+        edit = rng.random()
+        if edit < 0.05: # a clip renamed, added or removed somewhere
+            slot = rng.choice(rng.choice(song.tracks).clip_slots)
+            if slot.has_clip and rng.random() < 0.5:
+                slot.clip.name = 'take %d' % rng.randint(0, 99)
+            else:
+                slot.set(None if slot.has_clip else Clip('take %d' % rng.randint(0, 99)))
+                slot.notify('has_clip')
+        elif edit < 0.07: # a filler track appended or removed
+            if rng.random() < 0.5:
+                song.tracks.append(Track('Audio x', nb_scenes, midi=False))
+            elif len(song.tracks) > 20:
+                song.tracks.pop()
+                if song.view.selected_track not in song.tracks: # live selects the new last track
+                    song.view.selected_track = song.tracks[-1]
+            harness.actions.on_track_list_changed()
+        elif edit < 0.10: # the master track can be selected too, it has no clip slot
+            song.view.selected_track = rng.choice(song.tracks + [song.master_track])
+            song.view.highlighted_clip_slot = rng.choice(song.view.selected_track.clip_slots or [None])
+        case = rng.choice(cases)
+        track, action_args = harness.draw(case, rng)
+        if rng.random() < MALFORMED_SHARE:
+            action_args = rng.choice(MALFORMED_ARGS)
+        try:
+            harness.call(case, track, action_args)
+        except Exception as e:
+            key = (layout, case.name, '%s: %s' % (type(e).__name__, e))
+            count, _, tb = errors.get(key, (0, None, traceback.format_exc()))
+            errors[key] = (count + 1, action_args, tb)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='scaling stress harness for ExampleActions')
+    parser.add_argument('--tracks', default='25,50,100,200,300', help='track counts of the tracks curve')
+    parser.add_argument('--scenes', default='24,48,96,192', help='scene counts of the scenes curve')
+    parser.add_argument('--devices', type=int, default=2, help='devices per filler track')
+    parser.add_argument('--fuzz', type=int, default=1000, help='nb of actions in the fuzzed stream of each layout, 0 to skip it')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--verbose', action='store_true', help='print the tracebacks of the fuzz errors')
+    args = parser.parse_args(argv)
+    track_sizes = [int(n) for n in args.tracks.split(',')]
+    scene_sizes = [int(n) for n in args.scenes.split(',')]
+
+    install_user_actions_base()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import ExampleActions as module
+    workdir = tempfile.mkdtemp(prefix='stress_')
+    try:
+        failed = report('tracks', track_sizes, curves(module, workdir, 'tracks', track_sizes, {'scenes': scene_sizes[0]}, args.devices, args.seed))
+        failed += report('scenes', scene_sizes, curves(module, workdir, 'scenes', scene_sizes, {'tracks': track_sizes[0]}, args.devices, args.seed))
+        errors = fuzz(module, workdir, args.fuzz, track_sizes[-1], scene_sizes[0], args.devices, args.seed) if args.fuzz else {}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if args.fuzz:
+        print('\nfuzz : %d calls on each of %d layouts, %d distinct errors' % (args.fuzz, len(LAYOUT_BREAKS), len(errors)))
+        for (layout, name, error), (count, action_args, tb) in errors.items():
+            print('  [%s] %s %r : %s (x%d)' % (layout, name, action_args, error, count))
+            if args.verbose:
+                print(tb)
+    if failed:
+        print('\nabove their bound : %s' % ', '.join(sorted(set(failed))))
+    return 1 if failed or errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())